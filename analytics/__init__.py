@@ -0,0 +1 @@
+"""Computation helpers for the Vans dashboard (no Streamlit imports here)"""
@@ -0,0 +1,77 @@
+"""Vectorized percentile bootstrap confidence intervals for group means"""
+import numpy as np
+
+DEFAULT_RESAMPLES = 1000
+DEFAULT_CONFIDENCE = 0.95
+# Fixed so the same data and filters always draw the same intervals
+DEFAULT_SEED = 2025
+# Resampled values held at once (resamples x rows); bounds memory to a few tens of MB
+BATCH_CELLS = 2_000_000
+# Total draws per call; very large views use fewer resamples, never below MIN_RESAMPLES
+MAX_DRAWS = 50_000_000
+MIN_RESAMPLES = 200
+
+
+def bootstrap_mean_ci(values, groups, n_groups=None, resamples=DEFAULT_RESAMPLES, confidence=DEFAULT_CONFIDENCE,
+                      seed=DEFAULT_SEED, batch_cells=BATCH_CELLS, max_draws=MAX_DRAWS):
+    """(low, high) arrays: percentile bootstrap interval of the mean of each group
+
+    values are the observations and groups their group ids (0..n_groups-1, -1
+    to skip). Rows are sorted by group once; each batch of groups then draws a
+    (resamples x rows) index matrix in one call, offset into each group's slice,
+    and reduces it to per-group resample means with np.add.reduceat. Groups
+    with a single observation get NaN bounds. Views too large for max_draws
+    use proportionally fewer resamples, down to MIN_RESAMPLES.
+    """
+    values = np.asarray(values, dtype="float64")
+    groups = np.asarray(groups, dtype=np.int64)
+    keep = (groups >= 0) & ~np.isnan(values)
+    values, groups = values[keep], groups[keep]
+    if n_groups is None:
+        n_groups = int(groups.max()) + 1 if len(groups) else 0
+    order = np.argsort(groups, kind="stable")
+    values = values[order]
+    sizes = np.bincount(groups, minlength=n_groups)
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]]) if n_groups else sizes
+    low = np.full(n_groups, np.nan)
+    high = np.full(n_groups, np.nan)
+    tail = (1 - confidence) / 2 * 100
+    rng = np.random.default_rng(seed)
+
+    eligible = np.flatnonzero(sizes > 1)
+    cumulative = np.cumsum(sizes[eligible])
+    if len(cumulative):
+        resamples = min(resamples, max(MIN_RESAMPLES, max_draws // int(cumulative[-1])))
+    batch_start = 0
+    while batch_start < len(eligible):
+        # As many groups as fit one resample's worth of rows into the batch budget
+        done = cumulative[batch_start - 1] if batch_start else 0
+        batch_end = max(batch_start + 1, int(np.searchsorted(cumulative, done + batch_cells, side="right")))
+        batch = eligible[batch_start:batch_end]
+        batch_sizes = sizes[batch]
+        batch_rows = int(batch_sizes.sum())
+        row_size = np.repeat(batch_sizes, batch_sizes)
+        row_start = np.repeat(starts[batch], batch_sizes)
+        offsets = np.concatenate([[0], np.cumsum(batch_sizes)[:-1]])
+        means = np.empty((resamples, len(batch)))
+        # Split the resamples too when a single group is larger than the budget
+        chunk = max(1, batch_cells // batch_rows)
+        for first in range(0, resamples, chunk):
+            count = min(chunk, resamples - first)
+            draws = row_start + rng.integers(0, row_size, size=(count, batch_rows))
+            means[first:first + count] = np.add.reduceat(values[draws], offsets, axis=1) / batch_sizes
+        low[batch], high[batch] = np.percentile(means, [tail, 100 - tail], axis=0)
+        batch_start = batch_end
+    return low, high
+
+
+def group_mean_ci(df, value_col, group_cols, **kwargs):
+    """Group keys with "CI Low" / "CI High" bootstrap bounds of value_col's mean, in groupby order"""
+    group_cols = [group_cols] if isinstance(group_cols, str) else list(group_cols)
+    grouped = df.groupby(group_cols, observed=True, sort=True)
+    keys = grouped.size().reset_index()[group_cols]
+    low, high = bootstrap_mean_ci(df[value_col].to_numpy(dtype="float64", na_value=np.nan),
+                                  grouped.ngroup().to_numpy(), len(keys), **kwargs)
+    keys["CI Low"] = low
+    keys["CI High"] = high
+    return keys
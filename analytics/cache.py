@@ -0,0 +1,31 @@
+"""Process-wide LRU cache for analysis results keyed by dataset version and filter state"""
+import threading
+from collections import OrderedDict
+
+
+class ResultCache:
+    """Thread-safe LRU mapping of hashable keys to computed results"""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute, *args, **kwargs):
+        """Cached value for key, computing and storing compute(*args, **kwargs) on a miss"""
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                return self._results[key]
+        # Computed outside the lock so other keys are not blocked meanwhile
+        result = compute(*args, **kwargs)
+        with self._lock:
+            self._results[key] = result
+            self._results.move_to_end(key)
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
@@ -0,0 +1,64 @@
+"""Chart data access: column projections and row masks instead of full-frame copies"""
+import numpy as np
+import pandas as pd
+
+from analytics.columnar import text_isin
+
+# Object columns whose values are mostly numbers are converted once at load
+NUMERIC_SHARE_THRESHOLD = 0.5
+
+
+def coerce_numeric_columns(df, threshold=NUMERIC_SHARE_THRESHOLD):
+    """Convert mostly-numeric object columns to float so charts never re-coerce them"""
+    converted = {}
+    for col in df.columns:
+        if df[col].dtype != 'object':
+            continue
+        numeric_version = pd.to_numeric(df[col], errors='coerce')
+        if numeric_version.count() > len(df) * threshold:
+            converted[col] = numeric_version
+    if not converted:
+        return df
+    return df.assign(**converted)
+
+
+class ChartData:
+    """Read-only view of a dataframe restricted by a row mask
+
+    Consumers ask for the columns they need; only those columns are sliced,
+    and the base frame is never copied or modified.
+    """
+
+    def __init__(self, df, mask=None):
+        self.df = df
+        self.mask = np.ones(len(df), dtype=bool) if mask is None else np.asarray(mask, dtype=bool)
+
+    def __len__(self):
+        return int(self.mask.sum())
+
+    def where(self, mask):
+        """Narrow the view with another boolean mask (aligned to the base frame)"""
+        return ChartData(self.df, self.mask & np.asarray(mask, dtype=bool))
+
+    def isin(self, col, values):
+        """Mask of rows whose column, as text, is one of values"""
+        return text_isin(self.df[col], values)
+
+    def between(self, col, low, high):
+        """Mask of rows whose numeric column lies in [low, high]"""
+        values = self.df[col]
+        return ((values >= low) & (values <= high)).to_numpy()
+
+    def page(self, columns, start, stop, sort_by=None):
+        """One page of rows in view, optionally sorted, with only the requested columns"""
+        positions = np.flatnonzero(self.mask)
+        if sort_by is not None:
+            sort_key = self.df[sort_by].iloc[positions].reset_index(drop=True)
+            positions = positions[sort_key.sort_values(kind="stable").index.to_numpy()]
+        return self.df.iloc[positions[start:stop]][list(columns)]
+
+    def rows(self):
+        """All columns for the rows in view (used for full-row exports)"""
+        if self.mask.all():
+            return self.df
+        return self.df[self.mask]
@@ -0,0 +1,148 @@
+"""Memory-mapped columnar storage for cleaned survey datasets
+
+Each dataset is a directory with one .npy file per column and a manifest.
+Numeric columns are stored as-is; text columns as integer category codes plus
+their labels. Opening a directory maps the files read-only, so every process
+reading the same dataset shares the OS page cache instead of its own copy.
+"""
+import datetime
+import json
+import os
+import shutil
+import uuid
+
+import numpy as np
+import pandas as pd
+
+MANIFEST = "manifest.json"
+
+
+def is_text_dtype(dtype):
+    """True for object columns and the categoricals that stand in for them when mapped"""
+    return dtype == object or isinstance(dtype, pd.CategoricalDtype)
+
+
+def text_isin(series, values):
+    """Boolean array of rows whose value, as text, is one of values
+
+    Categoricals are matched on their labels once and then looked up by code,
+    so the column is never expanded to one string per row.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        label_match = np.append(series.cat.categories.astype(str).isin(values), False)
+        return label_match[series.cat.codes.to_numpy()]
+    return series.astype(str).isin(values).to_numpy()
+
+
+def _column_file(position):
+    return f"col_{position:05d}.npy"
+
+
+def _code_dtype(n_labels):
+    """Narrowest code type, the same one pandas picks, so categoricals can wrap the map without a copy"""
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_labels < np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def write_columnar(df, directory, name=None, version=None, pipeline=None, replace=False):
+    """Write df as a columnar directory (atomically, so concurrent writers are safe)
+
+    pipeline records which preparation code produced df, so readers can tell
+    a stale copy apart. With replace, an existing directory is swapped out.
+    """
+    staging = f"{directory}.{uuid.uuid4().hex}.tmp"
+    os.makedirs(staging)
+    columns = []
+    for position, col in enumerate(df.columns):
+        series = df[col]
+        entry = {"name": str(col), "file": _column_file(position)}
+        if pd.api.types.is_bool_dtype(series.dtype) and not series.hasnans:
+            values = series.to_numpy(dtype=bool)
+            entry["kind"] = "numeric"
+        elif pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+            # Nullable extension integers become float64 with NaN, like the rest of the pipeline
+            plain = not series.hasnans and not isinstance(series.dtype, pd.api.extensions.ExtensionDtype)
+            values = series.to_numpy() if plain else series.to_numpy(dtype="float64", na_value=np.nan)
+            entry["kind"] = "numeric"
+        else:
+            text = series.astype(object).where(series.notna(), None)
+            codes, labels = pd.factorize(text.map(lambda v: v if v is None or isinstance(v, str) else str(v)), sort=True)
+            values = codes.astype(_code_dtype(len(labels)))
+            entry["kind"] = "text"
+            entry["labels"] = [str(label) for label in labels]
+        np.save(os.path.join(staging, entry["file"]), values, allow_pickle=False)
+        columns.append(entry)
+    manifest = {
+        "name": name or os.path.basename(directory),
+        "version": version,
+        "pipeline": pipeline,
+        "rows": len(df),
+        "saved": datetime.datetime.now().isoformat(timespec="seconds"),
+        "columns": columns,
+    }
+    with open(os.path.join(staging, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    try:
+        os.replace(staging, directory)
+        return directory
+    except OSError:
+        if not replace:
+            # Another process stored the same dataset first; keep theirs
+            shutil.rmtree(staging, ignore_errors=True)
+            return directory
+    # Move the old copy aside under a .tmp name (skipped by list_columnar), then swap in the new one.
+    # Open maps of the old files stay valid until their readers drop them.
+    retired = f"{directory}.{uuid.uuid4().hex}.tmp"
+    try:
+        os.replace(directory, retired)
+    except OSError:
+        pass
+    try:
+        os.replace(staging, directory)
+    except OSError:
+        shutil.rmtree(staging, ignore_errors=True)
+    shutil.rmtree(retired, ignore_errors=True)
+    return directory
+
+
+def read_manifest(directory):
+    with open(os.path.join(directory, MANIFEST), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def open_columnar(directory):
+    """Dataframe whose columns are read-only memory maps of the stored files
+
+    Text columns come back as categoricals over the mapped codes. The manifest's
+    name and version are kept in df.attrs.
+    """
+    manifest = read_manifest(directory)
+    data = {}
+    for entry in manifest["columns"]:
+        values = np.load(os.path.join(directory, entry["file"]), mmap_mode="r", allow_pickle=False)
+        if entry["kind"] == "text":
+            values = pd.Categorical.from_codes(values, categories=pd.Index(entry["labels"], dtype=object), validate=False)
+        data[entry["name"]] = values
+    # copy=False keeps one block per column, each backed by its own map
+    df = pd.DataFrame(data, copy=False)
+    df.attrs["columnar_name"] = manifest["name"]
+    df.attrs["columnar_version"] = manifest["version"]
+    df.attrs["columnar_pipeline"] = manifest.get("pipeline")
+    return df
+
+
+def list_columnar(root):
+    """Manifests (plus their directory) of every dataset stored under root, newest first"""
+    if not os.path.isdir(root):
+        return []
+    stored = []
+    for entry in os.listdir(root):
+        directory = os.path.join(root, entry)
+        if entry.endswith(".tmp") or not os.path.isfile(os.path.join(directory, MANIFEST)):
+            continue
+        manifest = read_manifest(directory)
+        manifest["directory"] = directory
+        stored.append(manifest)
+    return sorted(stored, key=lambda m: m["saved"], reverse=True)
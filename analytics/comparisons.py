@@ -0,0 +1,94 @@
+"""Aggregated inputs for the Comparison Charts tab, computed apart from figure building"""
+import pandas as pd
+
+from analytics.bootstrap import group_mean_ci
+
+
+def _numeric_pair(df, value_col, group_col):
+    """Two-column frame with the value coerced to numeric and incomplete rows dropped"""
+    if value_col is None or group_col is None:
+        return None
+    pair = pd.DataFrame({
+        group_col: df[group_col],
+        value_col: pd.to_numeric(df[value_col], errors='coerce'),
+    })
+    return pair.dropna(subset=[value_col, group_col])
+
+
+def _group_mean(df, value_col, group_col):
+    """Mean per group with its bootstrap confidence interval (CI Low / CI High)"""
+    pair = _numeric_pair(df, value_col, group_col)
+    if pair is None or len(pair) == 0:
+        return pair
+    means = pair.groupby(group_col, observed=True)[value_col].mean().reset_index()
+    # Both tables are in groupby order
+    ci = group_mean_ci(pair, value_col, group_col)
+    means["CI Low"] = ci["CI Low"].to_numpy()
+    means["CI High"] = ci["CI High"].to_numpy()
+    return means
+
+
+def deliveries_by_company(df, roles):
+    """Per-driver daily deliveries with company, for a box plot"""
+    return _numeric_pair(df, roles["deliveries_per_day"], roles["company"])
+
+
+def hours_by_employment(df, roles):
+    """Per-driver working hours with employment status, for a violin plot"""
+    return _numeric_pair(df, roles["hours_per_day"], roles["employment"])
+
+
+def fuel_by_company(df, roles):
+    """Average monthly fuel cost per company"""
+    return _group_mean(df, roles["fuel_cost"], roles["company"])
+
+
+def vehicle_mix(df, roles):
+    """Respondent count per vehicle type"""
+    vehicle_col = roles["vehicle_type"]
+    if vehicle_col is None:
+        return None
+    counts = df[vehicle_col].dropna().value_counts()
+    # Categorical columns also count categories that no row in view has
+    return counts[counts > 0].rename_axis(vehicle_col).reset_index(name="Count")
+
+
+def success_by_company(df, roles):
+    """Average delivery success rate per company"""
+    return _group_mean(df, roles["success_rate"], roles["company"])
+
+
+def age_by_company(df, roles):
+    """Per-driver age with company, for a box plot"""
+    return _numeric_pair(df, roles["age"], roles["company"])
+
+
+COMPARISON_CHARTS = {
+    "deliveries_by_company": deliveries_by_company,
+    "hours_by_employment": hours_by_employment,
+    "fuel_by_company": fuel_by_company,
+    "vehicle_mix": vehicle_mix,
+    "success_by_company": success_by_company,
+    "age_by_company": age_by_company,
+}
+
+# Schema roles each chart reads; workers receive only these columns
+COMPARISON_CHART_ROLES = {
+    "deliveries_by_company": ["deliveries_per_day", "company"],
+    "hours_by_employment": ["hours_per_day", "employment"],
+    "fuel_by_company": ["fuel_cost", "company"],
+    "vehicle_mix": ["vehicle_type"],
+    "success_by_company": ["success_rate", "company"],
+    "age_by_company": ["age", "company"],
+}
+
+
+def comparison_projection(df, name, roles):
+    """Read-only column projection a chart needs, small enough to ship to a worker process"""
+    columns = [roles[role] for role in COMPARISON_CHART_ROLES[name] if roles[role] is not None]
+    return df[list(dict.fromkeys(columns))]
+
+
+def build_comparison_chart(name, df, roles):
+    """Chart input for one comparison; top-level so process pools can pickle it"""
+    return COMPARISON_CHARTS[name](df, roles)
@@ -0,0 +1,143 @@
+"""Pairwise-complete correlation matrices built from a few BLAS matrix products"""
+import numpy as np
+import pandas as pd
+
+from analytics.stats import correlation_p_value
+
+MIN_PAIRS = 3
+
+
+def _standardized(values):
+    """Center and scale each column once (NaN kept) for numerically stable products"""
+    mean = np.nanmean(values, axis=0)
+    std = np.nanstd(values, axis=0)
+    return (values - mean) / np.where(std > 0, std, 1.0)
+
+
+def _pairwise_correlation(values):
+    """Correlation and pair counts over rows where both columns are present
+
+    With M the presence mask and X the standardized data (NaN -> 0):
+    n = M'M, sx = X'M (sum of column i over rows where j is present),
+    sxx = (X*X)'M and sxy = X'X. Every pairwise-complete moment follows.
+    """
+    present = ~np.isnan(values)
+    mask = present.astype(np.float64)
+    x = np.where(present, values, 0.0)
+    n = mask.T @ mask
+    sx = x.T @ mask
+    sxx = (x * x).T @ mask
+    sxy = x.T @ x
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = sxy - sx * sx.T / n
+        var_i = sxx - sx * sx / n
+        var_j = var_i.T
+        r = cov / np.sqrt(var_i * var_j)
+    r[(n < MIN_PAIRS) | ~(var_i > 1e-12) | ~(var_j > 1e-12)] = np.nan
+    np.fill_diagonal(r, 1.0)
+    return np.clip(r, -1.0, 1.0), n.astype(np.int64)
+
+
+def correlation_matrix(df, method="pearson", exclude=()):
+    """Pearson or Spearman correlations with pair counts and p-values
+
+    Numeric columns listed in exclude are skipped. Columns that are constant or have fewer than MIN_PAIRS answers are dropped
+    first. Spearman ranks each column once over all its answers, then runs the
+    same pairwise-complete Pearson computation on the ranks.
+    """
+    measures = [col for col in df.columns if col not in exclude and pd.api.types.is_numeric_dtype(df[col])]
+    numeric = df[measures]
+    counts = numeric.count()
+    spread = numeric.max() - numeric.min()
+    keep = (counts >= MIN_PAIRS) & (spread > 0)
+    dropped = [col for col in numeric.columns if not keep[col]]
+    numeric = numeric.loc[:, keep]
+    if numeric.shape[1] < 2:
+        return {"r": None, "n": None, "p": None, "dropped": dropped}
+
+    if method == "spearman":
+        numeric = numeric.rank()
+    values = _standardized(numeric.to_numpy(dtype=np.float64, na_value=np.nan))
+    r, n = _pairwise_correlation(values)
+    p = correlation_p_value(r, n)
+    np.fill_diagonal(p, 0.0)
+
+    columns = numeric.columns
+    return {
+        "r": pd.DataFrame(r, index=columns, columns=columns),
+        "n": pd.DataFrame(n, index=columns, columns=columns),
+        "p": pd.DataFrame(p, index=columns, columns=columns),
+        "dropped": dropped,
+    }
+
+
+def significant_only(result, alpha):
+    """Correlation matrix with pairs whose p-value is at or above alpha blanked out"""
+    return result["r"].where(result["p"] < alpha)
+
+
+def top_pairs(result, k=20, alpha=None):
+    """The k strongest correlations (by |r|) as a tidy table, optionally only significant ones"""
+    r = result["r"].to_numpy()
+    rows, cols = np.triu_indices_from(r, k=1)
+    strength = np.abs(r[rows, cols])
+    valid = ~np.isnan(strength)
+    if alpha is not None:
+        valid &= result["p"].to_numpy()[rows, cols] < alpha
+    rows, cols, strength = rows[valid], cols[valid], strength[valid]
+    if len(strength) > k:
+        # Partial selection first, then sort only the k survivors
+        chosen = np.argpartition(-strength, k - 1)[:k]
+        rows, cols, strength = rows[chosen], cols[chosen], strength[chosen]
+    order = np.argsort(-strength, kind="stable")
+    rows, cols = rows[order], cols[order]
+    names = result["r"].columns
+    return pd.DataFrame({
+        "Column A": names[rows],
+        "Column B": names[cols],
+        "Correlation": r[rows, cols],
+        "Pairs": result["n"].to_numpy()[rows, cols],
+        "p-value": result["p"].to_numpy()[rows, cols],
+    })
+
+
+def cluster_order(r):
+    """Leaf order of an average-linkage clustering on 1 - |r| (similar columns end up adjacent)"""
+    size = r.shape[0]
+    distance = 1.0 - np.abs(np.nan_to_num(np.asarray(r, dtype=np.float64), nan=0.0))
+    np.fill_diagonal(distance, np.inf)
+    members = {i: [i] for i in range(size)}
+    weights = np.ones(size)
+    for _ in range(size - 1):
+        a, b = np.unravel_index(np.argmin(distance), distance.shape)
+        a, b = min(a, b), max(a, b)
+        # Lance-Williams update for average linkage: merged cluster lives at index a
+        merged = (distance[a] * weights[a] + distance[b] * weights[b]) / (weights[a] + weights[b])
+        distance[a, :] = merged
+        distance[:, a] = merged
+        distance[a, a] = np.inf
+        distance[b, :] = np.inf
+        distance[:, b] = np.inf
+        weights[a] += weights[b]
+        members[a] = members[a] + members.pop(b)
+    return next(iter(members.values())) if members else []
+
+
+def clustered_matrix(result, max_columns=25):
+    """Small heatmap matrix: the most strongly correlated columns, reordered by clustering"""
+    r = result["r"]
+    off_diagonal = r.abs().to_numpy(copy=True)
+    np.fill_diagonal(off_diagonal, np.nan)
+    strongest = np.where(np.isnan(off_diagonal), 0.0, off_diagonal).max(axis=1)
+    keep = np.sort(np.argsort(-strongest, kind="stable")[:max_columns])
+    sub = r.iloc[keep, keep]
+    order = cluster_order(sub.to_numpy())
+    return sub.iloc[order, order]
+
+
+def downsample_pair(df, column_a, column_b, max_points=2000, seed=0):
+    """Complete (a, b) observations, randomly thinned to at most max_points for plotting"""
+    pair = df[[column_a, column_b]].dropna()
+    if len(pair) > max_points:
+        pair = pair.sample(n=max_points, random_state=seed)
+    return pair
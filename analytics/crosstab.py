@@ -0,0 +1,76 @@
+"""Crosstabs over integer category codes using a single bincount histogram"""
+import numpy as np
+import pandas as pd
+
+
+def category_codes(values):
+    """Integer codes (-1 for missing) and the labels they index, for any dimension"""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy(dtype="int64"), values.cat.categories
+    codes, labels = pd.factorize(values, sort=True)
+    return codes.astype("int64"), labels
+
+
+def crosstab_counts(rows, cols, strata=None):
+    """Count array of shape (strata, rows, cols) plus the labels of each axis"""
+    dims = [rows, cols] if strata is None else [strata, rows, cols]
+    coded = [category_codes(dim) for dim in dims]
+    shape = tuple(len(labels) for _, labels in coded)
+    valid = np.ones(len(rows), dtype=bool)
+    for codes, _ in coded:
+        valid &= codes >= 0
+    flat = np.ravel_multi_index(tuple(codes[valid] for codes, _ in coded), shape) if all(shape) else np.empty(0, dtype="int64")
+    counts = np.bincount(flat, minlength=int(np.prod(shape))).reshape(shape)
+    labels = [labels for _, labels in coded]
+    if strata is None:
+        counts = counts[np.newaxis]
+        labels = [pd.Index([None])] + labels
+    return counts, labels
+
+
+def _with_margins(counts):
+    """Append total rows/columns (and a total stratum) to a (strata, rows, cols) array"""
+    strata, rows, cols = counts.shape
+    out = np.zeros((strata + 1, rows + 1, cols + 1), dtype=counts.dtype)
+    out[:strata, :rows, :cols] = counts
+    out[:strata, rows, :] = out[:strata, :rows, :].sum(axis=1)
+    out[:strata, :, cols] = out[:strata, :, :cols].sum(axis=2)
+    out[strata] = out[:strata].sum(axis=0)
+    return out
+
+
+def _percent(numerator, denominator):
+    out = np.full(numerator.shape, np.nan)
+    np.divide(numerator * 100.0, denominator, out=out, where=denominator > 0)
+    return out
+
+
+def crosstab(rows, cols, strata=None, margins_name="All"):
+    """Counts with margins plus row and column percentages, computed from one histogram
+
+    With strata, each table has a (stratum, row) index and a final stratum
+    named margins_name that holds the pooled table.
+    """
+    counts, (strata_labels, row_labels, col_labels) = crosstab_counts(rows, cols, strata)
+
+    # Drop labels never observed (e.g. empty bins from pd.cut), as pd.crosstab does
+    keep_rows = counts.sum(axis=(0, 2)) > 0
+    keep_cols = counts.sum(axis=(0, 1)) > 0
+    keep_strata = counts.sum(axis=(1, 2)) > 0 if strata is not None else np.ones(1, dtype=bool)
+    counts = counts[keep_strata][:, keep_rows][:, :, keep_cols]
+
+    totals = _with_margins(counts)
+    row_pct = _percent(totals, totals[:, :, -1:])
+    col_pct = _percent(totals, totals[:, -1:, :])
+
+    row_index = list(row_labels[keep_rows]) + [margins_name]
+    col_index = pd.Index(list(col_labels[keep_cols]) + [margins_name], name=cols.name)
+
+    def frame(values):
+        if strata is None:
+            return pd.DataFrame(values[-1], index=pd.Index(row_index, name=rows.name), columns=col_index)
+        strata_index = list(strata_labels[keep_strata]) + [margins_name]
+        index = pd.MultiIndex.from_product([strata_index, row_index], names=[strata.name, rows.name])
+        return pd.DataFrame(values.reshape(-1, values.shape[-1]), index=index, columns=col_index)
+
+    return {"Counts": frame(totals), "Row %": frame(row_pct).round(1), "Column %": frame(col_pct).round(1)}
@@ -0,0 +1,12 @@
+"""Dataset identity helpers shared by the cached computation stages"""
+import hashlib
+
+import pandas as pd
+
+
+def dataset_version(df):
+    """Stable content hash of a dataframe, used as the cache key for derived data"""
+    digest = hashlib.sha1()
+    digest.update("|".join(map(str, df.columns)).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return digest.hexdigest()
@@ -0,0 +1,77 @@
+"""Sidebar filter definitions shared by the dashboard and background workers"""
+import numpy as np
+import pandas as pd
+
+from analytics.columnar import is_text_dtype, text_isin
+
+FILTER_KEYWORDS = ['company', 'employment', 'area', 'insurance', 'status']
+AGE_COLUMN = "Age (Years)"
+
+
+def sidebar_filter_columns(df, limit=4):
+    """Categorical columns offered as sidebar filters"""
+    potential_filter_cols = []
+    for col in df.columns:
+        col_lower = col.lower()
+        if any(keyword in col_lower for keyword in FILTER_KEYWORDS):
+            try:
+                if is_text_dtype(df[col].dtype) and df[col].nunique() < 20:  # Only categorical with reasonable unique values
+                    potential_filter_cols.append(col)
+            except Exception:
+                continue
+    return potential_filter_cols[:limit]
+
+
+def filter_options(df, col):
+    """Sorted string values a sidebar multiselect offers for a column"""
+    return sorted([str(v) for v in df[col].dropna().unique() if pd.notna(v)])
+
+
+def age_bounds(df):
+    """(min, max) integer ages for the sidebar slider, or None if not applicable"""
+    if AGE_COLUMN not in df.columns or not pd.api.types.is_numeric_dtype(df[AGE_COLUMN]):
+        return None
+    min_age, max_age = int(df[AGE_COLUMN].min()), int(df[AGE_COLUMN].max())
+    return (min_age, max_age) if min_age < max_age else None
+
+
+def default_filter_state(df):
+    """Filter state of an untouched sidebar: every value selected, full age range"""
+    filter_state = {col: filter_options(df, col) for col in sidebar_filter_columns(df)}
+    filter_state = {col: values for col, values in filter_state.items() if values}
+    bounds = age_bounds(df)
+    if bounds is not None:
+        filter_state[AGE_COLUMN] = bounds
+    return filter_state
+
+
+def common_filter_states(df):
+    """Default state plus every single-value selection of each sidebar filter"""
+    default_state = default_filter_state(df)
+    filter_states = [default_state]
+    for col in sidebar_filter_columns(df):
+        for value in default_state.get(col, []):
+            filter_states.append({**default_state, col: [value]})
+    return filter_states
+
+
+def apply_filter_state(df, filter_state):
+    """Rows of df matching the sidebar selections (lists select values, tuples are ranges)"""
+    mask = np.ones(len(df), dtype=bool)
+    for col, selection in filter_state.items():
+        if isinstance(selection, tuple):
+            mask &= ((df[col] >= selection[0]) & (df[col] <= selection[1])).to_numpy()
+        else:
+            mask &= text_isin(df[col], selection)
+    if mask.all():
+        # Nothing filtered out: hand back the frame itself rather than a copy
+        return df
+    return df[mask]
+
+
+def filter_state_key(filter_state):
+    """Hashable key for a dict of sidebar filter selections"""
+    return tuple(sorted(
+        (str(col), tuple(value) if isinstance(value, (list, tuple)) else (value,))
+        for col, value in filter_state.items()
+    ))
@@ -0,0 +1,27 @@
+"""Deferred imports for heavy modules, with load timings for startup profiling"""
+import importlib
+import time
+
+# Module name -> seconds spent importing it (filled as modules are loaded)
+IMPORT_TIMINGS = {}
+
+
+def timed_import(name):
+    """Import a module and record how long it took"""
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    IMPORT_TIMINGS.setdefault(name, time.perf_counter() - start)
+    return module
+
+
+class LazyModule:
+    """Stand-in that imports the real module on first attribute access"""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = timed_import(self._name)
+        return getattr(self._module, attr)
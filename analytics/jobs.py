@@ -0,0 +1,135 @@
+"""Background job execution so heavy sections render after the rest of the page"""
+import multiprocessing
+import os
+import sys
+import threading
+import types
+import weakref
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
+# Below this many rows, worker start-up and pickling cost more than the work itself
+PROCESS_POOL_MIN_ROWS = 200_000
+
+
+def make_executor(max_workers=None):
+    """Thread pool shared by all sessions for dashboard computations"""
+    if max_workers is None:
+        max_workers = min(8, (os.cpu_count() or 1) + 2)
+    return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dashboard-job")
+
+
+_NEUTRAL_MAIN = types.ModuleType("__main__")
+# Serializes the __main__ swap: concurrent submits would otherwise restore each other's module
+_spawn_lock = threading.Lock()
+
+
+class WorkerProcessPool(ProcessPoolExecutor):
+    """Process pool whose workers never re-run the dashboard script
+
+    Streamlit executes the script as __main__, and spawn/forkserver children
+    re-import __main__ when they start. Workers are launched from submit(),
+    so __main__ is swapped for an empty module for the duration of the call.
+
+    The swap is process-wide, but Streamlit script threads only write
+    sys.modules["__main__"]: each run installs a fresh module there and
+    executes in that module's own namespace, and the dashboard code lives in
+    the dashboard module, so pickling never resolves names through __main__.
+    A run that starts during the swap installs its module; the original is
+    then only restored if the neutral module is still in place.
+    """
+
+    def submit(self, fn, /, *args, **kwargs):
+        with _spawn_lock:
+            main_module = sys.modules.get("__main__")
+            sys.modules["__main__"] = _NEUTRAL_MAIN
+            try:
+                return super().submit(fn, *args, **kwargs)
+            finally:
+                if sys.modules.get("__main__") is _NEUTRAL_MAIN:
+                    sys.modules["__main__"] = main_module
+
+
+def make_process_pool(max_workers=None):
+    """Process pool for CPU-bound jobs; forkserver avoids forking the threaded Streamlit server"""
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+    return WorkerProcessPool(max_workers=max_workers or os.cpu_count() or 1, mp_context=context)
+
+
+def completed_future(result):
+    """Future that is already done, for results that need no computation"""
+    future = Future()
+    future.set_result(result)
+    return future
+
+
+class JobBoard:
+    """Per-session set of named jobs; resubmitting a name with new inputs cancels the stale job
+
+    A job whose inputs (key) are unchanged since the last rerun is reused, so a
+    widget that does not affect it never triggers a recomputation. Jobs that
+    already started cannot be interrupted; their results are simply dropped.
+    With a MemoryGovernor, finished results are handed to it under this
+    session's id, so they count against the process budget and may be evicted.
+    The session's artifacts are released by cancel_all, or when the board is
+    garbage collected after its session ends.
+    """
+
+    def __init__(self, executor, governor=None, session_id=None):
+        self._executor = executor
+        self._governor = governor
+        self.session_id = session_id
+        self._jobs = {}
+        self._lock = threading.Lock()
+        if governor is not None:
+            # Holds only the governor and the id, so it does not keep the board alive
+            weakref.finalize(self, governor.drop_session, session_id)
+
+    def submit(self, name, key, fn, *args, executor=None, cached=False, **kwargs):
+        """Run fn(*args, **kwargs) on the default executor, or on the one given
+
+        cached marks fn as reading through a shared cache that already holds its
+        result; the governor would only count (and spill) a second reference to
+        it, so such results stay with the job instead.
+        """
+        executor = executor or self._executor
+        governed = self._governor is not None and not cached
+        with self._lock:
+            current = self._jobs.get(name)
+            if current is not None:
+                current_key, current_future = current
+                if current_key == key and not current_future.cancelled():
+                    return current_future
+                current_future.cancel()
+                del self._jobs[name]
+            if governed:
+                found, result = self._governor.get(self.session_id, name, key)
+                if found:
+                    return completed_future(result)
+            future = executor.submit(fn, *args, **kwargs)
+            self._jobs[name] = (key, future)
+        if governed:
+            # Outside the lock: the callback runs right away if the job already finished
+            future.add_done_callback(partial(self._store, name, key))
+        return future
+
+    def _store(self, name, key, future):
+        """Move a finished job's result to the governor"""
+        if future.cancelled() or future.exception() is not None:
+            return
+        with self._lock:
+            current = self._jobs.get(name)
+            if current is None or current[1] is not future:
+                return
+            del self._jobs[name]
+            self._governor.put(self.session_id, name, key, future.result())
+
+    def cancel_all(self):
+        """Cancel pending jobs and release every artifact of the session"""
+        with self._lock:
+            for _, future in self._jobs.values():
+                future.cancel()
+            self._jobs.clear()
+        if self._governor is not None:
+            self._governor.drop_session(self.session_id)
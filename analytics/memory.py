@@ -0,0 +1,148 @@
+"""Per-process memory governor for the artifacts each session keeps between reruns"""
+import atexit
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import threading
+import uuid
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# Artifacts at least this large are written to disk under pressure instead of being dropped
+SPILL_MIN_BYTES = 1024 * 1024
+
+
+def estimate_size(value):
+    """Approximate in-memory footprint of a job result in bytes"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, (pd.Series, pd.Index)):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class MemoryGovernor:
+    """Thread-safe LRU store of per-session artifacts with a process-wide memory budget
+
+    Every artifact is stored under (session id, name) together with the key of
+    the inputs it was computed from. When the total exceeds the budget, the least
+    recently used artifacts go first: large ones are pickled to the spill
+    directory, small ones are dropped and simply recomputed when asked for again.
+    """
+
+    def __init__(self, budget_bytes, spill_dir=None, spill_min_bytes=SPILL_MIN_BYTES, max_spill_bytes=None):
+        self.budget_bytes = budget_bytes
+        self.spill_min_bytes = spill_min_bytes
+        self.max_spill_bytes = 4 * budget_bytes if max_spill_bytes is None else max_spill_bytes
+        self.memory_bytes = 0
+        self.spilled_bytes = 0
+        self._spill_dir = spill_dir
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, session_id, name, key, value):
+        """Store value as the session's artifact for name, replacing any older one"""
+        entry = {"key": key, "value": value, "size": estimate_size(value), "path": None}
+        with self._lock:
+            self._discard((session_id, name))
+            self._entries[(session_id, name)] = entry
+            self.memory_bytes += entry["size"]
+            self._enforce_budget()
+
+    def get(self, session_id, name, key):
+        """(True, value) if the session holds name computed from key, else (False, None)"""
+        with self._lock:
+            entry = self._entries.get((session_id, name))
+            if entry is None or entry["key"] != key:
+                return False, None
+            self._entries.move_to_end((session_id, name))
+            if entry["path"] is None:
+                return True, entry["value"]
+            try:
+                # Spilled artifacts stay on disk; the caller holds the loaded copy for one run
+                with open(entry["path"], "rb") as f:
+                    return True, pickle.load(f)
+            except (OSError, pickle.UnpicklingError, EOFError):
+                self._discard((session_id, name))
+                return False, None
+
+    def drop_session(self, session_id):
+        with self._lock:
+            for entry_key in [k for k in self._entries if k[0] == session_id]:
+                self._discard(entry_key)
+
+    def usage(self, session_id=None):
+        """Totals for the process, plus the given session's share"""
+        with self._lock:
+            sessions = {k[0] for k in self._entries}
+            session_bytes = sum(e["size"] for k, e in self._entries.items() if k[0] == session_id)
+            return {
+                "memory_bytes": self.memory_bytes,
+                "spilled_bytes": self.spilled_bytes,
+                "budget_bytes": self.budget_bytes,
+                "artifacts": len(self._entries),
+                "sessions": len(sessions),
+                "session_bytes": session_bytes,
+            }
+
+    def _enforce_budget(self):
+        for entry_key in list(self._entries):
+            if self.memory_bytes <= self.budget_bytes:
+                break
+            entry = self._entries[entry_key]
+            if entry["path"] is not None:
+                continue
+            if entry["size"] < self.spill_min_bytes or not self._spill(entry):
+                self._discard(entry_key)
+        for entry_key in list(self._entries):
+            if self.spilled_bytes <= self.max_spill_bytes:
+                break
+            if self._entries[entry_key]["path"] is not None:
+                self._discard(entry_key)
+
+    def _spill(self, entry):
+        path = os.path.join(self._spill_directory(), f"{uuid.uuid4().hex}.pkl")
+        try:
+            with open(path, "wb") as f:
+                pickle.dump(entry["value"], f, protocol=pickle.HIGHEST_PROTOCOL)
+        except (OSError, pickle.PicklingError, TypeError, AttributeError):
+            if os.path.exists(path):
+                os.remove(path)
+            return False
+        entry["path"] = path
+        entry["value"] = None
+        self.memory_bytes -= entry["size"]
+        self.spilled_bytes += entry["size"]
+        return True
+
+    def _spill_directory(self):
+        if self._spill_dir is None:
+            # Private to this process and removed when it exits
+            self._spill_dir = tempfile.mkdtemp(prefix="vans-dashboard-spill-")
+            atexit.register(shutil.rmtree, self._spill_dir, ignore_errors=True)
+        else:
+            os.makedirs(self._spill_dir, exist_ok=True)
+        return self._spill_dir
+
+    def _discard(self, entry_key):
+        entry = self._entries.pop(entry_key, None)
+        if entry is None:
+            return
+        if entry["path"] is None:
+            self.memory_bytes -= entry["size"]
+            return
+        self.spilled_bytes -= entry["size"]
+        try:
+            os.remove(entry["path"])
+        except OSError:
+            pass
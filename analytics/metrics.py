@@ -0,0 +1,73 @@
+"""Per-respondent driver unit economics derived from the survey answers"""
+import numpy as np
+import pandas as pd
+
+from analytics.schema import resolve_roles
+
+WEEKS_PER_MONTH = 52 / 12
+
+MONTHLY_DELIVERIES = "Monthly Deliveries"
+TOTAL_EXPENSES = "Total Monthly Expenses (EGP)"
+COST_PER_DELIVERY = "Cost per Delivery (EGP)"
+NET_INCOME_PER_HOUR = "Net Income per Hour (EGP)"
+DELIVERIES_PER_HOUR = "Deliveries per Hour"
+EXPENSE_RATIO = "Expense Ratio (%)"
+
+DERIVED_COLUMNS = [
+    MONTHLY_DELIVERIES,
+    TOTAL_EXPENSES,
+    COST_PER_DELIVERY,
+    NET_INCOME_PER_HOUR,
+    DELIVERIES_PER_HOUR,
+    EXPENSE_RATIO,
+]
+
+EXPENSE_ROLES = ["fuel_cost", "maintenance_cost", "financing_cost", "other_expenses"]
+
+
+def numeric_column(df, col):
+    """Column as a float64 array, NaN where the column is missing or non-numeric"""
+    if col is None:
+        return np.full(len(df), np.nan)
+    return pd.to_numeric(df[col], errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+
+
+def safe_ratio(numerator, denominator):
+    """Elementwise division that yields NaN instead of inf for zero denominators"""
+    out = np.full(numerator.shape, np.nan)
+    np.divide(numerator, denominator, out=out, where=np.isfinite(denominator) & (denominator > 0))
+    return out
+
+
+def compute_derived_metrics(df):
+    """Compute the derived unit-economics columns as a float64 dataframe"""
+    roles = resolve_roles(df.columns)
+
+    deliveries_per_day = numeric_column(df, roles["deliveries_per_day"])
+    hours_per_day = numeric_column(df, roles["hours_per_day"])
+    days_per_week = numeric_column(df, roles["days_per_week"])
+    gross_income = numeric_column(df, roles["gross_income"])
+    net_income = numeric_column(df, roles["net_income"])
+
+    # Expenses are summed over the columns that exist; a respondent counts as
+    # having expense data if any of them was answered.
+    expense_matrix = np.column_stack([numeric_column(df, roles[role]) for role in EXPENSE_ROLES])
+    answered = ~np.isnan(expense_matrix).all(axis=1)
+    total_expenses = np.where(answered, np.nansum(expense_matrix, axis=1), np.nan)
+
+    working_days = days_per_week * WEEKS_PER_MONTH
+    monthly_deliveries = deliveries_per_day * working_days
+    monthly_hours = hours_per_day * working_days
+
+    derived = pd.DataFrame(
+        {
+            MONTHLY_DELIVERIES: monthly_deliveries,
+            TOTAL_EXPENSES: total_expenses,
+            COST_PER_DELIVERY: safe_ratio(total_expenses, monthly_deliveries),
+            NET_INCOME_PER_HOUR: safe_ratio(net_income, monthly_hours),
+            DELIVERIES_PER_HOUR: safe_ratio(deliveries_per_day, hours_per_day),
+            EXPENSE_RATIO: safe_ratio(total_expenses, gross_income) * 100,
+        },
+        index=df.index,
+    )
+    return derived.astype("float64")
@@ -0,0 +1,201 @@
+"""Monte Carlo driver-earnings risk: per-segment distributions fitted from the survey, sampled in batches
+
+Each simulated driver is a respondent drawn from the segment (keeping their
+fixed pay, other expenses and pay per delivery) facing a fresh month:
+
+    deliveries/day ~ LogNormal fitted to the segment's answers
+    fuel           ~ 0 with the segment's share of zero answers, else LogNormal
+    net income     = reported net + reported fuel - fuel
+                     + per-stop pay * (deliveries / reported deliveries)
+
+so drawing a respondent's own answers reproduces their reported net income.
+Outcomes are binned into a fixed histogram per segment, which makes shards
+cheap to merge; quantiles are read back from the merged histogram.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+
+from analytics.crosstab import category_codes
+from analytics.metrics import numeric_column, safe_ratio
+from analytics.scenarios import NET_INCOME
+
+SEGMENT_ROLES = ["employment", "company", "vehicle_type"]
+DEFAULT_SEED = 2025
+# Draws generated at once inside a shard; bounds memory to a few tens of MB
+BATCH_DRAWS = 1_000_000
+# Draws per shard; fixed so results do not depend on the number of workers
+SHARD_DRAWS = 2_000_000
+# Below this many draws in total the process pool costs more than it saves
+POOL_MIN_DRAWS = 4_000_000
+# Draws per segment used to fix the histogram range before the real run
+PILOT_DRAWS = 20_000
+HISTOGRAM_BINS = 4000
+DENSITY_BINS = 100
+QUANTILES = {"P5": 0.05, "P10": 0.10, "Median": 0.50, "P90": 0.90, "P95": 0.95}
+
+BELOW_THRESHOLD = "P(Net < Threshold) (%)"
+
+
+def _segment_log_stats(values, codes, n_segments):
+    """Per-segment mean and standard deviation of log(values) over positive values"""
+    positive = np.isfinite(values) & (values > 0)
+    logs = np.log(values[positive])
+    counts = np.bincount(codes[positive], minlength=n_segments)
+    sums = np.bincount(codes[positive], weights=logs, minlength=n_segments)
+    squares = np.bincount(codes[positive], weights=logs ** 2, minlength=n_segments)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mu = sums / counts
+        sigma = np.sqrt(np.maximum(squares / counts - mu ** 2, 0.0))
+    # Segments without positive answers never use the draw (their pay per delivery is 0)
+    return np.nan_to_num(mu), np.nan_to_num(sigma), counts
+
+
+def fit_earnings_model(df, roles, segment_role=None):
+    """Respondent pool sorted by segment plus the fitted delivery and fuel distributions, or None"""
+    if roles.get("net_income") is None:
+        return None
+    net = numeric_column(df, roles["net_income"])
+    fuel = numeric_column(df, roles["fuel_cost"])
+    deliveries = numeric_column(df, roles["deliveries_per_day"])
+    variable = np.nan_to_num(numeric_column(df, roles["variable_pay"]))
+    per_stop = np.nan_to_num(numeric_column(df, roles["per_stop_pay"])) > 0
+    # Per-stop pay scales with deliveries; other variable pay stays part of the fixed income
+    pay_per_delivery = np.where(per_stop, safe_ratio(variable, deliveries), np.nan)
+    scales = np.isfinite(pay_per_delivery)
+    fixed = net + np.nan_to_num(fuel) - np.where(scales, variable, 0.0)
+
+    segment_col = roles.get(segment_role) if segment_role else None
+    if segment_col is None:
+        codes, labels = np.zeros(len(df), dtype=np.int64), np.array(["All respondents"])
+    else:
+        codes, labels = category_codes(df[segment_col])
+    keep = ~np.isnan(net) & (codes >= 0)
+    if not keep.any():
+        return None
+    present, codes = np.unique(codes[keep], return_inverse=True)
+    n_segments = len(present)
+    order = np.argsort(codes, kind="stable")
+    sizes = np.bincount(codes, minlength=n_segments)
+
+    delivery_mu, delivery_sigma, delivery_answers = _segment_log_stats(deliveries[keep], codes, n_segments)
+    fuel_mu, fuel_sigma, fuel_positive = _segment_log_stats(fuel[keep], codes, n_segments)
+    fuel_answers = np.bincount(codes[~np.isnan(fuel[keep])], minlength=n_segments)
+    return {
+        "labels": np.asarray(labels, dtype=object)[present],
+        "sizes": sizes,
+        "starts": np.concatenate([[0], np.cumsum(sizes)[:-1]]),
+        "fixed": fixed[keep][order],
+        "pay_per_delivery": np.nan_to_num(pay_per_delivery[keep])[order],
+        "delivery_mu": delivery_mu,
+        "delivery_sigma": delivery_sigma,
+        "delivery_answers": delivery_answers,
+        "fuel_share": safe_ratio(fuel_positive.astype("float64"), fuel_answers.astype("float64")),
+        "fuel_mu": fuel_mu,
+        "fuel_sigma": fuel_sigma,
+    }
+
+
+def draw_net_income(model, segments, rng):
+    """One simulated net income per entry of segments (segment ids), fully vectorized"""
+    segments = np.asarray(segments, dtype=np.int64)
+    picks = model["starts"][segments] + rng.integers(0, model["sizes"][segments])
+    deliveries = rng.lognormal(model["delivery_mu"][segments], model["delivery_sigma"][segments])
+    uses_fuel = rng.random(len(segments)) < np.nan_to_num(model["fuel_share"])[segments]
+    fuel = np.where(uses_fuel, rng.lognormal(model["fuel_mu"][segments], model["fuel_sigma"][segments]), 0.0)
+    return model["fixed"][picks] + model["pay_per_delivery"][picks] * deliveries - fuel
+
+
+def simulate_shard(model, first, count, draws_per_segment, threshold, low, width, seed):
+    """Histogram, below-threshold count and sum of net income per segment for draws [first, first + count)"""
+    n_segments = len(model["sizes"])
+    columns = HISTOGRAM_BINS + 2
+    rng = np.random.default_rng(seed)
+    histogram = np.zeros(n_segments * columns, dtype=np.int64)
+    below = np.zeros(n_segments)
+    sums = np.zeros(n_segments)
+    for start in range(first, first + count, BATCH_DRAWS):
+        stop = min(start + BATCH_DRAWS, first + count)
+        segments = np.arange(start, stop) // draws_per_segment
+        net = draw_net_income(model, segments, rng)
+        # Bin 0 and the last bin collect draws outside the pilot range
+        bins = np.clip(np.floor((net - low) / width).astype(np.int64) + 1, 0, columns - 1)
+        histogram += np.bincount(segments * columns + bins, minlength=n_segments * columns)
+        below += np.bincount(segments, weights=net < threshold, minlength=n_segments)
+        sums += np.bincount(segments, weights=net, minlength=n_segments)
+    return {"histogram": histogram.reshape(n_segments, columns), "below": below, "sums": sums}
+
+
+def histogram_quantiles(histogram, low, width, quantiles):
+    """Linearly interpolated quantiles (rows x quantiles) from histograms with under/overflow bins"""
+    cumulative = np.cumsum(histogram, axis=1)
+    targets = cumulative[:, -1:] * np.asarray(quantiles)[None, :]
+    bins = (cumulative[:, None, :] >= targets[:, :, None]).argmax(axis=2)
+    rows = np.arange(len(histogram))[:, None]
+    previous = np.where(bins > 0, cumulative[rows, np.maximum(bins - 1, 0)], 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fraction = np.nan_to_num((targets - previous) / histogram[rows, bins])
+    values = low + (bins - 1 + fraction) * width
+    # Underflow and overflow bins clamp to the edges of the range
+    return np.clip(values, low, low + HISTOGRAM_BINS * width)
+
+
+def simulate_earnings(model, draws_per_segment, threshold, seed=DEFAULT_SEED, executor=None):
+    """Per-segment risk table, density curves and fitted parameters from draws_per_segment draws each
+
+    Draws are split into fixed-size shards with independent seeds spawned
+    from seed, so the result is the same whether the shards run in-process or
+    on executor (a process pool, used from POOL_MIN_DRAWS draws in total).
+    """
+    n_segments = len(model["sizes"])
+    total = draws_per_segment * n_segments
+    pilot = draw_net_income(model, np.repeat(np.arange(n_segments), PILOT_DRAWS), np.random.default_rng(seed))
+    low, high = np.percentile(pilot, [0.01, 99.99])
+    padding = max((high - low) * 0.05, 1.0)
+    low, high = low - padding, high + padding
+    width = (high - low) / HISTOGRAM_BINS
+
+    n_shards = math.ceil(total / SHARD_DRAWS)
+    seeds = np.random.SeedSequence(seed).spawn(n_shards)
+    shard_args = [
+        (model, shard * SHARD_DRAWS, min(SHARD_DRAWS, total - shard * SHARD_DRAWS), draws_per_segment, threshold, low, width, seeds[shard])
+        for shard in range(n_shards)
+    ]
+    if executor is None or total < POOL_MIN_DRAWS:
+        shards = [simulate_shard(*args) for args in shard_args]
+    else:
+        futures = [executor.submit(simulate_shard, *args) for args in shard_args]
+        shards = [future.result() for future in futures]
+    histogram = sum(shard["histogram"] for shard in shards)
+    below = sum(shard["below"] for shard in shards)
+    sums = sum(shard["sums"] for shard in shards)
+
+    # The overall row weights each segment by its respondents, not by its equal share of draws
+    weights = model["sizes"] / model["sizes"].sum()
+    mass = np.vstack([histogram / draws_per_segment, weights @ (histogram / draws_per_segment)])
+    quantiles = histogram_quantiles(mass, low, width, list(QUANTILES.values()))
+    table = pd.DataFrame(quantiles, columns=list(QUANTILES), index=pd.Index(list(model["labels"]) + ["All respondents"], name="Segment"))
+    table.insert(0, "Mean", np.r_[sums / draws_per_segment, weights @ (sums / draws_per_segment)])
+    table.insert(0, BELOW_THRESHOLD, np.r_[below / draws_per_segment, weights @ (below / draws_per_segment)] * 100)
+    table.insert(0, "Respondents", np.r_[model["sizes"], model["sizes"].sum()])
+    if n_segments == 1:
+        table = table.iloc[:1]
+
+    coarse = histogram[:, 1:-1].reshape(n_segments, DENSITY_BINS, HISTOGRAM_BINS // DENSITY_BINS).sum(axis=2)
+    centers = low + (np.arange(DENSITY_BINS) + 0.5) * width * (HISTOGRAM_BINS // DENSITY_BINS)
+    density = pd.DataFrame({
+        "Segment": np.repeat(model["labels"], DENSITY_BINS),
+        NET_INCOME: np.tile(centers, n_segments),
+        "Share (%)": (coarse / draws_per_segment * 100).ravel(),
+    })
+    fits = pd.DataFrame({
+        "Segment": model["labels"],
+        "Respondents": model["sizes"],
+        "Median Deliveries/Day": np.where(model["delivery_answers"] > 0, np.exp(model["delivery_mu"]), np.nan),
+        "Deliveries Log-SD": model["delivery_sigma"],
+        "Fuel Spend Share (%)": model["fuel_share"] * 100,
+        "Median Fuel When Spent (EGP)": np.where(model["fuel_share"] > 0, np.exp(model["fuel_mu"]), np.nan),
+        "Fuel Log-SD": model["fuel_sigma"],
+    })
+    return {"table": table, "density": density, "fits": fits, "draws": total, "threshold": threshold}
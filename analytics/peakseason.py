@@ -0,0 +1,113 @@
+"""Peak-season incentives: White Friday, Eid/Ramadan and public-holiday overtime per company"""
+import numpy as np
+import pandas as pd
+
+from analytics.crosstab import category_codes, crosstab
+from analytics.metrics import WEEKS_PER_MONTH, numeric_column, safe_ratio
+
+WF_INCENTIVE_SHARE = "Got White Friday Incentive (%)"
+WF_DAYS = "White Friday Days Worked"
+WF_EARNINGS = "White Friday Extra Earnings (EGP)"
+WF_PER_DAY = "White Friday Incentive per Day (EGP)"
+NORMAL_PAY_PER_DAY = "Normal Pay per Day (EGP)"
+WF_DAILY_UPLIFT = "White Friday Daily Uplift (%)"
+WF_PER_PACKAGE_SHARE = "Paid per Package (%)"
+EID_INCENTIVE = "Eid/Ramadan Incentive (EGP)"
+EID_UPLIFT = "Eid/Ramadan Uplift over Monthly Pay (%)"
+PEAK_UPLIFT = "Peak Uplift over Monthly Pay (%)"
+HOLIDAY_SHARE = "Worked Public Holidays (%)"
+HOLIDAY_SHIFTS = "Public Holiday Shifts"
+
+# Roles the module reads; the job ships only these columns
+PEAK_SEASON_ROLES = [
+    "company", "gross_income", "days_per_week", "white_friday_incentive", "white_friday_days",
+    "white_friday_earnings", "white_friday_per_package", "eid_incentive", "eid_criteria",
+    "holiday_work", "overtime_method", "holiday_shifts",
+]
+
+
+def _yes(df, col):
+    """1.0 for answers starting with "Yes", 0.0 for other answers, NaN when unanswered"""
+    if col is None:
+        return np.full(len(df), np.nan)
+    answers = df[col].astype(object)
+    flags = answers.astype(str).str.strip().str.lower().str.startswith("yes").to_numpy(dtype="float64")
+    return np.where(answers.notna().to_numpy(), flags, np.nan)
+
+
+def peak_season_projection(df, roles):
+    """Columns the peak-season summary needs"""
+    columns = [roles[role] for role in PEAK_SEASON_ROLES if roles.get(role) is not None]
+    return df[list(dict.fromkeys(columns))]
+
+
+def peak_season_metrics(df, roles):
+    """Per-respondent peak-season measures as a float64 dataframe (share columns are 0/100 flags)"""
+    gross = numeric_column(df, roles["gross_income"])
+    days = numeric_column(df, roles["white_friday_days"])
+    earnings = numeric_column(df, roles["white_friday_earnings"])
+    eid = numeric_column(df, roles["eid_incentive"])
+    per_day = safe_ratio(earnings, days)
+    normal_per_day = safe_ratio(gross, numeric_column(df, roles["days_per_week"]) * WEEKS_PER_MONTH)
+    return pd.DataFrame(
+        {
+            WF_INCENTIVE_SHARE: _yes(df, roles["white_friday_incentive"]) * 100,
+            WF_DAYS: days,
+            WF_EARNINGS: earnings,
+            WF_PER_DAY: per_day,
+            NORMAL_PAY_PER_DAY: normal_per_day,
+            WF_DAILY_UPLIFT: safe_ratio(per_day, normal_per_day) * 100,
+            WF_PER_PACKAGE_SHARE: _yes(df, roles["white_friday_per_package"]) * 100,
+            EID_INCENTIVE: eid,
+            EID_UPLIFT: safe_ratio(eid, gross) * 100,
+            # Either incentive may be missing; the uplift counts what was answered
+            PEAK_UPLIFT: safe_ratio(np.where(np.isnan(earnings) & np.isnan(eid), np.nan, np.nan_to_num(earnings) + np.nan_to_num(eid)), gross) * 100,
+            HOLIDAY_SHARE: _yes(df, roles["holiday_work"]) * 100,
+            HOLIDAY_SHIFTS: numeric_column(df, roles["holiday_shifts"]),
+        },
+        index=df.index,
+    )
+
+
+def _group_means(metrics, groups):
+    """Mean of every metric column per group, NaN-aware, from one sorted reduceat pass"""
+    codes, labels = category_codes(groups)
+    keep = codes >= 0
+    values = metrics.to_numpy(dtype="float64")[keep]
+    codes = codes[keep]
+    order = np.argsort(codes, kind="stable")
+    present = ~np.isnan(values[order])
+    starts = np.flatnonzero(np.r_[True, np.diff(codes[order]) != 0]) if len(codes) else np.empty(0, dtype=int)
+    if not len(starts):
+        return pd.DataFrame(columns=["Respondents"] + list(metrics.columns))
+    sums = np.add.reduceat(np.where(present, values[order], 0.0), starts, axis=0)
+    counts = np.add.reduceat(present.astype(np.int64), starts, axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        means = np.where(counts > 0, sums / counts, np.nan)
+    table = pd.DataFrame(means, columns=metrics.columns, index=pd.Index(np.asarray(labels)[codes[order][starts]], name=groups.name))
+    table.insert(0, "Respondents", np.diff(np.r_[starts, len(codes)]))
+    return table
+
+
+def peak_season_summary(df, roles):
+    """Per-company incentive table, overall averages and overtime / Eid criteria mixes, or None without the columns"""
+    if roles.get("company") is None or all(
+        roles.get(role) is None for role in ("white_friday_earnings", "eid_incentive", "overtime_method")
+    ):
+        return None
+    metrics = peak_season_metrics(df, roles)
+    summary = {
+        "by_company": _group_means(metrics, df[roles["company"]]),
+        "overall": metrics.mean(),
+        "respondents": len(df),
+        "overtime": None,
+        "eid_criteria": None,
+    }
+    overtime_col = roles.get("overtime_method")
+    if overtime_col is not None and df[overtime_col].notna().any():
+        summary["overtime"] = crosstab(df[roles["company"]], df[overtime_col])["Row %"]
+    criteria_col = roles.get("eid_criteria")
+    if criteria_col is not None and df[criteria_col].notna().any():
+        counts = df[criteria_col].dropna().astype(str).value_counts()
+        summary["eid_criteria"] = counts.rename_axis(criteria_col).reset_index(name="Respondents")
+    return summary
@@ -0,0 +1,78 @@
+"""Process-wide preset result cache, warmed by a background worker thread"""
+import threading
+from collections import Counter, OrderedDict
+
+from analytics.filters import apply_filter_state, filter_state_key
+from analytics.presets import PRESETS, run_preset
+
+# Filter combinations requested this many times get all presets warmed for them
+WARM_AFTER_REQUESTS = 2
+
+
+class PresetCache:
+    """Thread-safe LRU store of preset results keyed by preset, dataset version and filter state"""
+
+    def __init__(self, max_entries=5000):
+        self.max_entries = max_entries
+        self._results = OrderedDict()
+        self._requests = Counter()
+        self._warming = set()
+        self._lock = threading.Lock()
+
+    def get(self, preset, version, filter_state):
+        """Cached result, or None on a miss (a cached 'not available' is returned as False)"""
+        key = (preset, version, filter_state_key(filter_state))
+        with self._lock:
+            if key not in self._results:
+                return None
+            self._results.move_to_end(key)
+            result = self._results[key]
+        return False if result is None else result
+
+    def put(self, preset, version, filter_state, result):
+        key = (preset, version, filter_state_key(filter_state))
+        with self._lock:
+            self._results[key] = result
+            self._results.move_to_end(key)
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+
+    def record_request(self, version, filter_state):
+        """Count a lookup for a filter combination; returns how often it was requested"""
+        with self._lock:
+            key = (version, filter_state_key(filter_state))
+            self._requests[key] += 1
+            return self._requests[key]
+
+    def warm(self, df, version, filter_states):
+        """Precompute every preset for each filter state in a daemon thread"""
+        with self._lock:
+            pending = [state for state in filter_states if (version, filter_state_key(state)) not in self._warming]
+            self._warming.update((version, filter_state_key(state)) for state in pending)
+        if not pending:
+            return None
+        worker = threading.Thread(
+            target=self._warm_worker, args=(df, version, pending), name="preset-precompute", daemon=True
+        )
+        worker.start()
+        return worker
+
+    def _warm_worker(self, df, version, filter_states):
+        for filter_state in filter_states:
+            df_filtered = apply_filter_state(df, filter_state)
+            for preset in PRESETS:
+                if self.get(preset, version, filter_state) is not None:
+                    continue
+                try:
+                    self.put(preset, version, filter_state, run_preset(df_filtered, preset))
+                except Exception:
+                    # Leave it for the interactive path, which reports the error
+                    continue
+
+    def lookup(self, df_view, preset, version, filter_state):
+        """Cached result if available, otherwise compute it now and store it"""
+        result = self.get(preset, version, filter_state)
+        if result is None:
+            result = run_preset(df_view, preset)
+            self.put(preset, version, filter_state, result)
+        return result or None
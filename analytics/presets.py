@@ -0,0 +1,149 @@
+"""Quick Presets: declarative analyses bound to schema roles and one shared query engine"""
+import pandas as pd
+
+from analytics.crosstab import crosstab
+from analytics.metrics import COST_PER_DELIVERY, DELIVERIES_PER_HOUR, NET_INCOME_PER_HOUR
+from analytics.schema import COLUMN_ROLES, resolve_role
+
+AGE_GROUPS = {"role": "age", "bins": [0, 25, 35, 45, 55, 100], "labels": ["18-25", "26-35", "36-45", "46-55", "55+"], "name": "Age Group"}
+EXPERIENCE_GROUPS = {"role": "experience_years", "bins": [0, 2, 5, 10, 100], "labels": ["0-2 yrs", "3-5 yrs", "6-10 yrs", "10+ yrs"], "name": "Experience Group"}
+
+AGG_LABELS = {"mean": "Average", "sum": "Total", "count": "Count", "min": "Minimum", "max": "Maximum", "median": "Median", "std": "Std Dev"}
+
+# Each preset is a query: "dimensions" (schema roles or binned roles) to group
+# by, "measures" (schema roles or derived metric columns) to aggregate with
+# "aggregations", and a "chart" type. kind="crosstab" counts two dimensions
+# against each other with margins (a third dimension stratifies the table);
+# kind="distribution" counts one dimension.
+PRESET_GROUPS = {
+    "Employment & Demographics": {
+        "Employment Status × Medical Insurance": {"kind": "crosstab", "dimensions": ["employment", "insurance"]},
+        "Company × Employment Status": {"kind": "crosstab", "dimensions": ["company", "employment"]},
+        "Age Groups × Employment Status": {"kind": "crosstab", "dimensions": [AGE_GROUPS, "employment"]},
+        "Education Level × Employment Status": {"kind": "crosstab", "dimensions": ["education", "employment"]},
+        "Experience × Employment Status": {"kind": "crosstab", "dimensions": [EXPERIENCE_GROUPS, "employment"]},
+        "Age Groups × Employment Status by Company": {"kind": "crosstab", "dimensions": [AGE_GROUPS, "employment", "company"]},
+    },
+    "Financial & Compensation": {
+        "Company × Average Income/Salary": {"dimensions": ["company"], "measures": ["net_income", "gross_income"], "chart": "bar"},
+        "Employment Status × Average Income": {"dimensions": ["employment"], "measures": ["net_income", "gross_income"], "chart": "bar"},
+        "Areas Covered × Average Income": {"dimensions": ["area"], "measures": ["net_income"], "chart": "bar"},
+        "Experience × Income Analysis": {"dimensions": [EXPERIENCE_GROUPS], "measures": ["net_income"], "aggregations": ["mean", "count"], "chart": "bar"},
+        "Fuel Costs by Company": {"dimensions": ["company"], "measures": ["fuel_cost"], "aggregations": ["mean", "sum", "count"], "chart": "bar"},
+        "Maintenance Costs by Vehicle Type": {"dimensions": ["vehicle_type"], "measures": ["maintenance_cost"], "aggregations": ["mean", "count"], "chart": "bar"},
+        "Insurance Costs Analysis": {"dimensions": ["company"], "measures": ["insurance_cost"], "chart": "bar"},
+    },
+    "Operations & Delivery": {
+        "Company × Average Deliveries": {"dimensions": ["company"], "measures": ["deliveries_per_day"], "chart": "bar"},
+        "Employment Status × Deliveries per Day": {"dimensions": ["employment"], "measures": ["deliveries_per_day"], "chart": "bar"},
+        "Areas Coverage × Delivery Performance": {"dimensions": ["area"], "measures": ["success_rate", "deliveries_per_day"], "chart": "bar"},
+        "Vehicle Type × Delivery Efficiency": {"dimensions": ["vehicle_type"], "measures": [DELIVERIES_PER_HOUR, COST_PER_DELIVERY], "chart": "bar"},
+        "Working Hours × Delivery Count": {"dimensions": ["hours_per_day"], "measures": ["deliveries_per_day"], "aggregations": ["mean", "count"], "chart": "bar"},
+        "Route Analysis by Region": {"kind": "crosstab", "dimensions": ["area", "route_priority"]},
+    },
+    "Benefits & Support": {
+        "Benefits Package by Company": {"kind": "crosstab", "dimensions": ["company", "benefits"]},
+        "Medical Insurance Coverage Analysis": {"kind": "distribution", "dimensions": ["insurance"], "chart": "pie"},
+        "Training Support by Employment Status": {"kind": "crosstab", "dimensions": ["training", "employment"]},
+        "Overtime Policies × Companies": {"kind": "crosstab", "dimensions": ["overtime_method", "company"]},
+        "Holiday/Leave Benefits Analysis": {"kind": "crosstab", "dimensions": ["company", "paid_leave"]},
+        "Safety Equipment Provision": {"kind": "distribution", "dimensions": ["safety"], "chart": "pie"},
+    },
+    "Satisfaction & Performance": {
+        "Job Satisfaction by Company": {"kind": "crosstab", "dimensions": ["company", "satisfaction"]},
+        "Performance Ratings Analysis": {"kind": "crosstab", "dimensions": ["company", "performance_incentive"]},
+        "Work-Life Balance Assessment": {"dimensions": ["employment"], "measures": ["hours_per_day", "commute_time"], "chart": "bar"},
+        "Support Systems Effectiveness": {"kind": "crosstab", "dimensions": ["company", "peak_support"]},
+        "Communication Quality Analysis": {"kind": "crosstab", "dimensions": ["company", "communication"]},
+    },
+    "Costs & Expenses": {
+        "Fuel Expenses by Company": {"dimensions": ["company"], "measures": ["fuel_cost"], "chart": "bar"},
+        "Maintenance Costs Breakdown": {"dimensions": ["company"], "measures": ["maintenance_cost"], "aggregations": ["mean", "sum", "count"], "chart": "bar"},
+        "Operating Expenses Analysis": {"dimensions": ["company"], "measures": ["fuel_cost", "maintenance_cost", "financing_cost", "other_expenses"], "chart": "stacked_bar"},
+        "Cost per Delivery Analysis": {"dimensions": ["company"], "measures": [COST_PER_DELIVERY, NET_INCOME_PER_HOUR], "chart": "bar"},
+        "Expense Categories Comparison": {"dimensions": [], "measures": ["fuel_cost", "maintenance_cost", "financing_cost", "other_expenses"], "chart": "measures_bar"},
+    },
+}
+
+PRESETS = {name: spec for group in PRESET_GROUPS.values() for name, spec in group.items()}
+
+
+def _resolve_field(columns, field):
+    """Column for a role name or a literal column name, None if unavailable"""
+    if isinstance(field, dict):
+        field = field["role"]
+    if field in COLUMN_ROLES:
+        return resolve_role(columns, field)
+    return field if field in columns else None
+
+
+def bind_preset(columns, preset):
+    """Bind a preset's roles to actual columns; returns None if any are missing"""
+    columns = list(columns)
+    spec = PRESETS[preset]
+    dimensions = []
+    for field in spec.get("dimensions", []):
+        col = _resolve_field(columns, field)
+        if col is None:
+            return None
+        dimensions.append((col, field if isinstance(field, dict) else None))
+    measures = []
+    for field in spec.get("measures", []):
+        col = _resolve_field(columns, field)
+        if col is None:
+            return None
+        measures.append(col)
+    return {"dimensions": dimensions, "measures": measures}
+
+
+def available_presets(columns):
+    """Preset names whose roles all resolve against the given columns"""
+    columns = list(columns)
+    return [name for name in PRESETS if bind_preset(columns, name) is not None]
+
+
+def _dimension_series(df, col, binning):
+    """Dimension values, binned when the preset asks for it"""
+    if binning is None:
+        return df[col].rename(col)
+    values = pd.to_numeric(df[col], errors="coerce")
+    return pd.cut(values, bins=binning["bins"], labels=binning["labels"]).rename(binning["name"])
+
+
+def run_preset(df, preset):
+    """Execute a preset query against df; returns None if its columns are missing"""
+    binding = bind_preset(df.columns, preset)
+    if binding is None:
+        return None
+    spec = PRESETS[preset]
+    kind = spec.get("kind", "aggregate")
+    keys = [_dimension_series(df, col, binning) for col, binning in binding["dimensions"]]
+    key_names = [key.name for key in keys]
+
+    if kind == "crosstab":
+        tables = crosstab(keys[0], keys[1], strata=keys[2] if len(keys) > 2 else None)
+        return {"kind": kind, "table": tables["Counts"], "tables": tables, "chart": None, "dimensions": key_names, "values": []}
+
+    if kind == "distribution":
+        counts = keys[0].value_counts().rename_axis(key_names[0]).reset_index(name="Count")
+        return {"kind": kind, "table": counts, "chart": spec.get("chart"), "dimensions": key_names, "values": ["Count"]}
+
+    aggregations = spec.get("aggregations", ["mean"])
+    measures = pd.DataFrame(
+        {col: pd.to_numeric(df[col], errors="coerce") for col in binding["measures"]},
+        index=df.index,
+    )
+    if keys:
+        grouped = measures.groupby(keys, observed=True).agg(aggregations)
+        grouped.columns = [f"{AGG_LABELS[agg]} {col}" for col, agg in grouped.columns]
+        table = grouped.reset_index()
+    else:
+        table = measures.agg(aggregations).T
+        table.columns = [AGG_LABELS[agg] for agg in table.columns]
+        table = table.rename_axis("Measure").reset_index()
+        key_names = ["Measure"]
+    values = [col for col in table.columns if col not in key_names]
+    if table[values].isna().all().all():
+        table = table.iloc[0:0]
+    return {"kind": kind, "table": table, "chart": spec.get("chart"), "dimensions": key_names, "values": values}
+
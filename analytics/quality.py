@@ -0,0 +1,218 @@
+"""Data quality at ingestion: answer normalization, declarative plausibility rules and per-segment outlier flags
+
+Every failed check sets one bit of an int64 per-row bitmap (bit i is
+QUALITY_CHECKS[i]), so "no issues" is the range (0, 0) and a single check is
+one bitwise test. Rules pass when any of their answers is missing.
+"""
+import numpy as np
+import pandas as pd
+
+from analytics.crosstab import category_codes
+from analytics.metrics import EXPENSE_ROLES, numeric_column
+from analytics.schema import resolve_roles
+
+QUALITY_FLAGS = "Data Quality Flags"
+
+# Rule name: (description, kind, roles, bounds); "range" fails outside [low, high]
+# for any of the roles, "not_above" fails when the first role exceeds the second
+QUALITY_RULES = {
+    "deliveries_range": ("Deliveries per day outside 1-150", "range", ("deliveries_per_day",), (1, 150)),
+    "hours_range": ("Working hours per day outside 1-18", "range", ("hours_per_day",), (1, 18)),
+    "days_range": ("Working days per week outside 1-7", "range", ("days_per_week",), (1, 7)),
+    "age_range": ("Age outside 16-80", "range", ("age",), (16, 80)),
+    "success_range": ("Delivery success rate outside 0-100%", "range", ("success_rate",), (0, 100)),
+    "negative_expense": ("Negative fuel, maintenance, financing or other expense", "range", tuple(EXPENSE_ROLES), (0, np.inf)),
+    "net_above_gross": ("Net income above gross income", "not_above", ("net_income", "gross_income"), None),
+    "fixed_above_gross": ("Fixed pay above gross income", "not_above", ("fixed_pay", "gross_income"), None),
+    "tenure_above_experience": ("Tenure with the company longer than delivery experience", "not_above", ("tenure", "experience_years"), None),
+}
+
+# Answers screened for outliers within each company
+OUTLIER_ROLES = ["deliveries_per_day", "hours_per_day", "gross_income", "net_income", "fuel_cost", "maintenance_cost"]
+OUTLIER_SEGMENT_ROLE = "company"
+# Segments smaller than this are too small to call anything an outlier
+MIN_SEGMENT_SIZE = 5
+# |0.6745 * (x - median) / MAD| above this is an outlier (Iglewicz and Hoaglin)
+ROBUST_Z_LIMIT = 3.5
+IQR_FACTOR = 1.5
+
+QUALITY_CHECKS = (
+    list(QUALITY_RULES)
+    + [f"{role}_robust_z" for role in OUTLIER_ROLES]
+    + [f"{role}_iqr" for role in OUTLIER_ROLES]
+)
+
+# Questions answered as free-text durations ("14 months", "2 yrs", "1.5")
+DURATION_ROLES = ["experience_years", "tenure"]
+_DURATION_PATTERN = r"(?P<number>\d+(?:\.\d+)?)\s*(?P<unit>[A-Za-z]*)"
+
+
+def normalize_categories(series):
+    """Text answers with whitespace trimmed and collapsed, and case variants mapped to their most common spelling"""
+    counts = series.dropna().value_counts()
+    text = counts.index.to_series()[[isinstance(value, str) for value in counts.index]]
+    if text.empty:
+        return series
+    cleaned = text.str.strip().str.replace(r"\s+", " ", regex=True)
+    # value_counts is sorted by frequency, so the first spelling of each case-folded key wins
+    canonical = cleaned.groupby(cleaned.str.casefold(), sort=False).transform("first")
+    mapping = canonical[canonical != text.index]
+    if mapping.empty:
+        return series
+    return series.where(~series.isin(mapping.index), series.map(mapping))
+
+
+def parse_durations(series):
+    """Durations in years: plain numbers are years, answers in months are divided by 12"""
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        return series.astype("float64")
+    uniques = pd.Series(series.dropna().astype(str).unique())
+    parts = uniques.str.extract(_DURATION_PATTERN)
+    years = pd.to_numeric(parts["number"], errors="coerce")
+    years = years.where(~parts["unit"].str.lower().str.startswith("m", na=False), years / 12)
+    lookup = pd.Series(years.to_numpy(), index=uniques.to_numpy())
+    return pd.Series(lookup.reindex(series.astype(str)).to_numpy(dtype="float64"), index=series.index, name=series.name)
+
+
+def normalize_answers(df):
+    """Normalized text answers and durations in years, in one pass over the object columns"""
+    roles = resolve_roles(df.columns)
+    durations = {roles[role] for role in DURATION_ROLES if roles[role] is not None}
+    changed = {}
+    for col in df.columns:
+        if col in durations:
+            changed[col] = parse_durations(df[col])
+        elif df[col].dtype == object:
+            normalized = normalize_categories(df[col])
+            if normalized is not df[col]:
+                changed[col] = normalized
+    if not changed:
+        return df
+    return df.assign(**changed)
+
+
+def _sorted_quantile(values, starts, counts, q):
+    """Linear-interpolated quantile of each segment of values (sorted within segments)"""
+    position = starts + q * np.maximum(counts - 1, 0)
+    low = np.floor(position).astype(np.int64)
+    high = np.ceil(position).astype(np.int64)
+    low, high = np.minimum(low, len(values) - 1), np.minimum(high, len(values) - 1)
+    return values[low] + (position - low) * (values[high] - values[low])
+
+
+def segment_outliers(values, codes, n_segments):
+    """(robust z, IQR) outlier masks of values within each segment, from two sorted passes"""
+    robust = np.zeros(len(values), dtype=bool)
+    iqr_flags = np.zeros(len(values), dtype=bool)
+    valid = np.flatnonzero(~np.isnan(values) & (codes >= 0))
+    if not len(valid):
+        return robust, iqr_flags
+    v, c = values[valid], codes[valid]
+    counts = np.bincount(c, minlength=n_segments)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    ordered = v[np.lexsort((v, c))]
+    median = _sorted_quantile(ordered, starts, counts, 0.5)
+    q1 = _sorted_quantile(ordered, starts, counts, 0.25)
+    q3 = _sorted_quantile(ordered, starts, counts, 0.75)
+    deviation = np.abs(v - median[c])
+    mad = _sorted_quantile(deviation[np.lexsort((deviation, c))], starts, counts, 0.5)
+
+    # Segments without spread would flag every answer that differs from the mode
+    large = counts >= MIN_SEGMENT_SIZE
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = 0.6745 * deviation / mad[c]
+    robust[valid] = (large & (mad > 0))[c] & (z > ROBUST_Z_LIMIT)
+    spread = q3 - q1
+    outside = (v < (q1 - IQR_FACTOR * spread)[c]) | (v > (q3 + IQR_FACTOR * spread)[c])
+    iqr_flags[valid] = (large & (spread > 0))[c] & outside
+    return robust, iqr_flags
+
+
+def _rule_failures(df, roles, kind, rule_roles, bounds):
+    """Mask of rows failing one declarative rule"""
+    if any(roles[role] is None for role in rule_roles):
+        return np.zeros(len(df), dtype=bool)
+    values = [numeric_column(df, roles[role]) for role in rule_roles]
+    if kind == "range":
+        low, high = bounds
+        # NaN compares False both ways, so missing answers pass
+        return np.any([(v < low) | (v > high) for v in values], axis=0)
+    if kind == "not_above":
+        return values[0] > values[1]
+    raise ValueError(f"Unknown rule kind {kind!r}")
+
+
+def quality_flags(df):
+    """int64 bitmap per row of the QUALITY_CHECKS each row fails"""
+    roles = resolve_roles(df.columns)
+    flags = np.zeros(len(df), dtype=np.int64)
+    for bit, (kind, rule_roles, bounds) in enumerate(rule[1:] for rule in QUALITY_RULES.values()):
+        flags |= _rule_failures(df, roles, kind, rule_roles, bounds).astype(np.int64) << bit
+
+    segment_col = roles.get(OUTLIER_SEGMENT_ROLE)
+    if segment_col is None:
+        codes, n_segments = np.zeros(len(df), dtype=np.int64), 1
+    else:
+        codes, labels = category_codes(df[segment_col])
+        n_segments = len(labels)
+    robust_bit = QUALITY_CHECKS.index(f"{OUTLIER_ROLES[0]}_robust_z")
+    iqr_bit = QUALITY_CHECKS.index(f"{OUTLIER_ROLES[0]}_iqr")
+    for offset, role in enumerate(OUTLIER_ROLES):
+        if roles[role] is None:
+            continue
+        robust, iqr_flags = segment_outliers(numeric_column(df, roles[role]), codes, n_segments)
+        flags |= robust.astype(np.int64) << (robust_bit + offset)
+        flags |= iqr_flags.astype(np.int64) << (iqr_bit + offset)
+    return flags
+
+
+def check_mask(flags, check):
+    """Rows failing one check, from the bitmap column"""
+    return (np.asarray(flags, dtype=np.int64) >> QUALITY_CHECKS.index(check)) & 1 == 1
+
+
+def _outlier_check(check):
+    """(role, method) of an outlier check name"""
+    if check.endswith("_iqr"):
+        return check[:-len("_iqr")], "iqr"
+    return check[:-len("_robust_z")], "robust_z"
+
+
+def check_columns(check, roles):
+    """Columns one check reads (None where a role is missing)"""
+    if check in QUALITY_RULES:
+        return [roles[role] for role in QUALITY_RULES[check][2]]
+    return [roles[_outlier_check(check)[0]]]
+
+
+def _check_description(check, roles):
+    """Type and description of one check"""
+    if check in QUALITY_RULES:
+        return "Rule", QUALITY_RULES[check][0]
+    within = f"within each {OUTLIER_SEGMENT_ROLE}" if roles.get(OUTLIER_SEGMENT_ROLE) else "overall"
+    if _outlier_check(check)[1] == "iqr":
+        return "IQR outlier", f"Outside {IQR_FACTOR:g} IQR of the quartiles {within}"
+    return "Robust z outlier", f"Robust z-score above {ROBUST_Z_LIMIT:g} (median/MAD) {within}"
+
+
+def quality_report(df):
+    """One row per applicable check with how many rows it flags, from the bitmap column"""
+    roles = resolve_roles(df.columns)
+    # Few distinct bitmaps occur, so bits are counted per distinct value rather than per row
+    values, counts = np.unique(df[QUALITY_FLAGS].to_numpy(dtype=np.int64), return_counts=True)
+    flagged = ((values[:, None] >> np.arange(len(QUALITY_CHECKS))) & 1).T @ counts
+    rows = []
+    for check, count in zip(QUALITY_CHECKS, flagged):
+        columns = check_columns(check, roles)
+        if any(col is None for col in columns):
+            continue
+        kind, description = _check_description(check, roles)
+        rows.append({
+            "Check": check,
+            "Type": kind,
+            "Description": description,
+            "Columns": ", ".join(columns),
+            "Flagged Rows": int(count),
+            "Flagged (%)": count / len(df) * 100 if len(df) else 0.0,
+        })
+    return pd.DataFrame(rows)
@@ -0,0 +1,342 @@
+"""Aggregation queries planned into a single masked pass over a dataset's columns
+
+A query is a plain dict:
+
+    {"filters": [("in", "Company", ["Noon"]), ("between", "Age (Years)", (25, 40))],
+     "group_by": ["Company", "Area"], "measure": "Fuel Expenses (EGP)", "agg": "mean",
+     "select": ("top", 5)}
+
+plan_query() fuses the filters with the missing-value handling the grouping
+and measure need into one ordered list of predicates. build_cube() ANDs
+their bitmaps (cached per dataset in a DatasetIndex), gathers only the rows
+left, and groups them into a SparseCube over the cached category codes that
+serves every aggregation with bincount. An optional result selection
+(top/bottom N, above/below the average or a percentile) runs on the
+per-group value array before any labels are built.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from analytics.crosstab import category_codes
+
+AGGREGATIONS = ["mean", "sum", "count", "min", "max", "std"]
+
+# Result selections: top/bottom take a group count, above/below take "mean" or a percentile
+SELECTIONS = ["top", "bottom", "above", "below"]
+
+# Category lookups are cheapest and usually most selective, presence checks last
+_PREDICATE_ORDER = {"in": 0, "between": 1, "notna": 2}
+
+
+class DatasetIndex:
+    """Column indexes for one dataset, shared by every query against it
+
+    Category codes per dimension (the cube axes), float arrays per measure and
+    predicate bitmaps are built on first use and kept, so sidebar filters that
+    every tab applies are evaluated once per dataset rather than once per tab.
+    """
+
+    def __init__(self, df, max_bitmaps=256):
+        self.df = df
+        self.max_bitmaps = max_bitmaps
+        self._codes = {}
+        self._values = {}
+        self._bitmaps = OrderedDict()
+        self._lock = threading.Lock()
+
+    def codes(self, col):
+        """(codes, labels) of a dimension; code -1 marks a missing value"""
+        with self._lock:
+            if col in self._codes:
+                return self._codes[col]
+        coded = category_codes(self.df[col])
+        with self._lock:
+            self._codes[col] = coded
+        return coded
+
+    def values(self, col):
+        """Float array of a measure column with NaN for missing or non-numeric values"""
+        with self._lock:
+            if col in self._values:
+                return self._values[col]
+        values = pd.to_numeric(self.df[col], errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+        with self._lock:
+            self._values[col] = values
+        return values
+
+    def bitmap(self, predicate):
+        """Boolean row mask of one predicate"""
+        with self._lock:
+            if predicate in self._bitmaps:
+                self._bitmaps.move_to_end(predicate)
+                return self._bitmaps[predicate]
+        mask = self._evaluate(predicate)
+        with self._lock:
+            self._bitmaps[predicate] = mask
+            while len(self._bitmaps) > self.max_bitmaps:
+                self._bitmaps.popitem(last=False)
+        return mask
+
+    def _evaluate(self, predicate):
+        op, col = predicate[0], predicate[1]
+        if op == "in":
+            # Match the labels once, then look every row up by its code (-1 lands on False)
+            codes, labels = self.codes(col)
+            label_match = np.append(pd.Index(labels).astype(str).isin(predicate[2]), False)
+            return label_match[codes]
+        if op == "between":
+            values = self.values(col)
+            low, high = predicate[2]
+            return (values >= low) & (values <= high)
+        if op == "notna":
+            if pd.api.types.is_numeric_dtype(self.df[col].dtype):
+                return ~np.isnan(self.values(col))
+            return self.codes(col)[0] >= 0
+        raise ValueError(f"Unknown predicate {op!r}")
+
+
+def filter_predicates(filter_state):
+    """Sidebar filter state as query predicates (lists select values, tuples are ranges)"""
+    predicates = []
+    for col, selection in filter_state.items():
+        if isinstance(selection, tuple):
+            predicates.append(("between", col, tuple(selection)))
+        else:
+            predicates.append(("in", col, tuple(selection)))
+    return predicates
+
+
+def plan_query(query):
+    """Hashable execution plan: deduplicated, ordered predicates plus grouping and measure
+
+    Grouping keys and the measure get a presence check unless a value or range
+    filter on the same column already excludes missing values.
+    """
+    predicates = list(dict.fromkeys(tuple(p) for p in query.get("filters", [])))
+    constrained = {p[1] for p in predicates if p[0] in ("in", "between")}
+    group_by = tuple(dict.fromkeys(query["group_by"]))
+    for col in group_by + (query["measure"],):
+        if col not in constrained and ("notna", col) not in predicates:
+            predicates.append(("notna", col))
+    predicates.sort(key=lambda p: _PREDICATE_ORDER[p[0]])
+    agg = query.get("agg", "mean")
+    if agg not in AGGREGATIONS:
+        raise ValueError(f"Unknown aggregation {agg!r}")
+    select = query.get("select")
+    if select is not None and select[0] not in SELECTIONS:
+        raise ValueError(f"Unknown result selection {select[0]!r}")
+    return {
+        "predicates": tuple(predicates),
+        "group_by": group_by,
+        "measure": query["measure"],
+        "agg": agg,
+        "name": query.get("name") or f"{agg.title()} of {query['measure']}",
+        "select": tuple(select) if select is not None else None,
+    }
+
+
+def query_positions(index, plan):
+    """Positions of the rows that pass every predicate of the plan"""
+    mask = np.ones(len(index.df), dtype=bool)
+    for predicate in plan["predicates"]:
+        mask &= index.bitmap(predicate)
+    return np.flatnonzero(mask)
+
+
+def _cell_ids(codes, shape, n_rows):
+    """Dense, sorted cell id per row plus each cell's coordinate codes, never forming the dense cross product"""
+    if not codes:
+        return np.zeros(n_rows, dtype=np.int64), ()
+    if np.prod(shape, dtype=float) < 2 ** 62:
+        keys, inverse = np.unique(np.ravel_multi_index(codes, shape), return_inverse=True)
+        coords = np.unravel_index(keys, shape)
+    else:
+        keys, inverse = np.unique(np.stack(codes), axis=1, return_inverse=True)
+        coords = tuple(keys)
+    return inverse.reshape(-1), tuple(np.asarray(c, dtype=np.int64) for c in coords)
+
+
+def _reduce_sorted(values, ids, n_cells, reducer):
+    order = np.argsort(ids, kind="stable")
+    starts = np.flatnonzero(np.r_[True, np.diff(ids[order]) != 0])
+    return reducer.reduceat(values[order], starts) if n_cells else np.empty(0)
+
+
+class SparseCube:
+    """One measure aggregated over the occupied cells of an N-dimensional group-by
+
+    Cells are stored as coordinates (one code array per dimension, sorted like
+    DataFrame.groupby) with each cell's sufficient statistics: count, sum, sum
+    of squared deviations, min and max. Every aggregation, slice, rollup and
+    pivot is derived from the cells without going back to the rows, and memory
+    grows with the combinations that occur rather than with their product.
+    """
+
+    def __init__(self, dims, labels, coords, stats, rows):
+        self.dims = list(dims)
+        self.labels = list(labels)
+        self.coords = tuple(coords)
+        self.stats = stats
+        self.rows = rows
+
+    @classmethod
+    def from_rows(cls, dims, labels, codes, values):
+        """Cube of values grouped by the given per-row dimension codes (no missing codes)"""
+        shape = tuple(len(l) for l in labels)
+        ids, coords = _cell_ids(list(codes), shape, len(values))
+        n_cells = int(ids.max()) + 1 if len(ids) else 0
+        counts = np.bincount(ids, minlength=n_cells)
+        sums = np.bincount(ids, weights=values, minlength=n_cells)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            means = sums / counts
+        stats = {
+            "count": counts,
+            "sum": sums,
+            # Centered (two-pass) so std stays exact for large incomes
+            "m2": np.bincount(ids, weights=(values - means[ids]) ** 2, minlength=n_cells),
+            "min": _reduce_sorted(values, ids, n_cells, np.minimum),
+            "max": _reduce_sorted(values, ids, n_cells, np.maximum),
+        }
+        return cls(dims, labels, coords, stats, len(values))
+
+    @property
+    def n_cells(self):
+        return len(self.stats["count"])
+
+    def occupied_labels(self, dim):
+        """Labels of one dimension that occur in at least one cell"""
+        axis = self.dims.index(dim)
+        return [str(label) for label in np.asarray(self.labels[axis])[np.unique(self.coords[axis])]]
+
+    def aggregate(self, agg):
+        """Per-cell values of one aggregation"""
+        counts = self.stats["count"]
+        if agg == "count":
+            return counts
+        if agg in ("sum", "min", "max"):
+            return self.stats[agg]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if agg == "mean":
+                return self.stats["sum"] / counts
+            if agg == "std":
+                return np.where(counts > 1, np.sqrt(self.stats["m2"] / (counts - 1)), np.nan)
+        raise ValueError(f"Unknown aggregation {agg!r}")
+
+    def take(self, cells):
+        """Cube of the given cells only, in the given order"""
+        stats = {name: values[cells] for name, values in self.stats.items()}
+        return SparseCube(self.dims, self.labels, tuple(c[cells] for c in self.coords), stats, int(stats["count"].sum()))
+
+    def select(self, agg, select):
+        """Cells a result selection (see select_groups) keeps"""
+        if select is None:
+            return self
+        return self.take(select_groups(self.aggregate(agg).astype("float64"), select))
+
+    def slice(self, selections):
+        """Cells whose label in each given dimension is one of the selected labels"""
+        keep = np.ones(self.n_cells, dtype=bool)
+        for dim, chosen in selections.items():
+            axis = self.dims.index(dim)
+            label_match = pd.Index(self.labels[axis]).astype(str).isin([str(v) for v in chosen])
+            keep &= label_match[self.coords[axis]]
+        return self.take(np.flatnonzero(keep))
+
+    def rollup(self, dims):
+        """Cube over a subset of the dimensions, combining the statistics of merged cells"""
+        axes = [self.dims.index(dim) for dim in dims]
+        labels = [self.labels[axis] for axis in axes]
+        ids, coords = _cell_ids([self.coords[axis] for axis in axes], tuple(len(l) for l in labels), self.n_cells)
+        n_cells = int(ids.max()) + 1 if len(ids) else 0
+        counts = np.bincount(ids, weights=self.stats["count"], minlength=n_cells).astype(np.int64)
+        sums = np.bincount(ids, weights=self.stats["sum"], minlength=n_cells)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cell_means = self.stats["sum"] / self.stats["count"]
+            means = sums / counts
+        # Parallel variance combination: within-cell deviations plus the spread of the cell means
+        m2 = np.bincount(ids, weights=self.stats["m2"] + self.stats["count"] * (cell_means - means[ids]) ** 2,
+                         minlength=n_cells)
+        stats = {
+            "count": counts,
+            "sum": sums,
+            "m2": m2,
+            "min": _reduce_sorted(self.stats["min"], ids, n_cells, np.minimum),
+            "max": _reduce_sorted(self.stats["max"], ids, n_cells, np.maximum),
+        }
+        return SparseCube(dims, labels, coords, stats, self.rows)
+
+    def table(self, agg, name):
+        """Long result table: one row per cell with its labels and the aggregated value"""
+        table = pd.DataFrame({
+            dim: np.asarray(self.labels[axis])[self.coords[axis]] for axis, dim in enumerate(self.dims)
+        })
+        table[name] = self.aggregate(agg)
+        return table
+
+    def pivot(self, index, columns, agg):
+        """Two-dimensional table over the occupied labels of index x columns (other dimensions rolled up)"""
+        cube = self.rollup([index, columns])
+        row_codes, row_labels = np.unique(cube.coords[0], return_inverse=True)
+        col_codes, col_labels = np.unique(cube.coords[1], return_inverse=True)
+        grid = np.full((len(row_codes), len(col_codes)), np.nan)
+        grid[row_labels.reshape(-1), col_labels.reshape(-1)] = cube.aggregate(agg)
+        return pd.DataFrame(
+            grid,
+            index=pd.Index(np.asarray(cube.labels[0])[row_codes], name=index),
+            columns=pd.Index(np.asarray(cube.labels[1])[col_codes], name=columns),
+        )
+
+
+def cube_key(plan):
+    """Part of a plan that decides its cube; aggregations and selections reuse the same cube"""
+    return (plan["predicates"], plan["group_by"], plan["measure"])
+
+
+def cell_observations(index, plan):
+    """Measure values of the rows a plan selects, with the number of the cube cell each falls in"""
+    positions = query_positions(index, plan)
+    coded = [index.codes(col) for col in plan["group_by"]]
+    cells, _ = _cell_ids([codes[positions] for codes, _ in coded], tuple(len(labels) for _, labels in coded), len(positions))
+    return index.values(plan["measure"])[positions], cells
+
+
+def build_cube(index, plan):
+    """Filter rows with the plan's predicates and group the measure into a SparseCube"""
+    positions = query_positions(index, plan)
+    group_by = list(plan["group_by"])
+    coded = [index.codes(col) for col in group_by]
+    codes = [c[positions] for c, _ in coded]
+    values = index.values(plan["measure"])[positions]
+    return SparseCube.from_rows(group_by, [labels for _, labels in coded], codes, values)
+
+
+def select_groups(values, select):
+    """Positions of the groups a result selection keeps
+
+    Top/bottom N use a partial sort (argpartition) so only the N kept groups
+    are ordered, largest (or smallest) first, with ties resolved like
+    nlargest/nsmallest. Thresholds keep groups strictly above or below the
+    mean or the given percentile of the group values, in group order. Groups
+    whose value is NaN never pass.
+    """
+    if select is None:
+        return np.arange(len(values))
+    valid = np.flatnonzero(~np.isnan(values))
+    kind, arg = select
+    if kind in ("top", "bottom"):
+        n = min(int(arg), len(valid))
+        if n <= 0:
+            return valid[:0]
+        ranked = values[valid] if kind == "bottom" else -values[valid]
+        # Only the n-th best value is located; ties at that boundary go to the earliest groups
+        kth = ranked[np.argpartition(ranked, n - 1)[n - 1]]
+        better = np.flatnonzero(ranked < kth)
+        chosen = np.concatenate([better, np.flatnonzero(ranked == kth)[:n - len(better)]])
+        return valid[chosen[np.lexsort((chosen, ranked[chosen]))]]
+    if not len(valid):
+        return valid
+    threshold = values[valid].mean() if arg == "mean" else np.percentile(values[valid], float(arg))
+    return valid[values[valid] > threshold] if kind == "above" else valid[values[valid] < threshold]
@@ -0,0 +1,110 @@
+"""What-if scenarios: fuel, maintenance, pay and volume changes applied to every respondent
+
+Adjustments are applied as deltas to the reported figures, so a scenario with
+no changes reproduces the survey exactly:
+
+    fuel'        = fuel * (1 + fuel %)
+    maintenance' = maintenance * (1 + maintenance %)
+    per-stop pay = (rate + rate change) * stops * (1 + deliveries %), stops implied by variable pay / rate
+    bonus pay    = variable pay * (1 + bonus %), for respondents without a per-stop rate
+    net income'  = net income + change in pay - change in expenses
+    cost per delivery' = total expenses' / (monthly deliveries * (1 + deliveries %))
+"""
+import numpy as np
+import pandas as pd
+
+from analytics.crosstab import category_codes
+from analytics.metrics import COST_PER_DELIVERY, EXPENSE_ROLES, WEEKS_PER_MONTH, numeric_column, safe_ratio
+
+# Parameter name: (label, min, max, step, unit)
+SCENARIO_PARAMETERS = {
+    "fuel_pct": ("⛽ Fuel cost change", -50.0, 100.0, 5.0, "%"),
+    "maintenance_pct": ("🔧 Maintenance cost change", -50.0, 100.0, 5.0, "%"),
+    "per_stop_delta": ("📦 Per-stop pay change", -10.0, 10.0, 0.5, "EGP"),
+    "bonus_pct": ("🎁 Bonus pay change", -50.0, 50.0, 5.0, "%"),
+    "deliveries_pct": ("🚚 Deliveries per day change", -30.0, 30.0, 5.0, "%"),
+}
+BASELINE = {name: 0.0 for name in SCENARIO_PARAMETERS}
+
+NET_INCOME = "Net Income (EGP)"
+PERCENTILES = np.arange(1, 100)
+
+# Roles the scenario inputs read
+SCENARIO_ROLES = ["company", "net_income", "gross_income", "variable_pay", "per_stop_pay",
+                  "deliveries_per_day", "days_per_week"] + EXPENSE_ROLES
+
+
+def scenario_key(params):
+    """Hashable key of a parameter set, for memoizing its results"""
+    return tuple(sorted((name, float(value)) for name, value in params.items()))
+
+
+def scenario_inputs(df, roles):
+    """Float arrays of the figures every scenario starts from, plus company codes"""
+    expenses = np.column_stack([numeric_column(df, roles[role]) for role in EXPENSE_ROLES])
+    answered = ~np.isnan(expenses).all(axis=1)
+    variable = numeric_column(df, roles["variable_pay"])
+    rate = numeric_column(df, roles["per_stop_pay"])
+    monthly_deliveries = numeric_column(df, roles["deliveries_per_day"]) * numeric_column(df, roles["days_per_week"]) * WEEKS_PER_MONTH
+    per_stop = np.nan_to_num(rate) > 0
+    companies = df[roles["company"]] if roles.get("company") is not None else pd.Series(np.full(len(df), "All"))
+    codes, labels = category_codes(companies)
+    return {
+        "net": numeric_column(df, roles["net_income"]),
+        "fuel": np.nan_to_num(numeric_column(df, roles["fuel_cost"])),
+        "maintenance": np.nan_to_num(numeric_column(df, roles["maintenance_cost"])),
+        "expenses": np.where(answered, np.nansum(expenses, axis=1), np.nan),
+        "variable": np.nan_to_num(variable),
+        "rate": np.where(per_stop, rate, 0.0),
+        # Stops paid per month as the reported variable pay implies, so rate x stops reproduces it
+        "stops": np.where(per_stop, safe_ratio(np.nan_to_num(variable), np.where(per_stop, rate, np.nan)), 0.0),
+        "per_stop": per_stop,
+        "monthly_deliveries": monthly_deliveries,
+        "company_codes": codes,
+        "company_labels": np.asarray(labels),
+    }
+
+
+def apply_scenario(inputs, params):
+    """Per-respondent net income and cost per delivery under one parameter set"""
+    fuel_change = inputs["fuel"] * params["fuel_pct"] / 100
+    maintenance_change = inputs["maintenance"] * params["maintenance_pct"] / 100
+    volume = 1 + params["deliveries_pct"] / 100
+    variable = np.where(
+        inputs["per_stop"],
+        (inputs["rate"] + params["per_stop_delta"]) * inputs["stops"] * volume,
+        inputs["variable"] * (1 + params["bonus_pct"] / 100),
+    )
+    expenses = inputs["expenses"] + fuel_change + maintenance_change
+    return {
+        NET_INCOME: inputs["net"] + (variable - inputs["variable"]) - fuel_change - maintenance_change,
+        COST_PER_DELIVERY: safe_ratio(expenses, inputs["monthly_deliveries"] * volume),
+    }
+
+
+def scenario_summary(inputs, params):
+    """Headline statistics, percentile curves and per-company mean net income of one scenario"""
+    outcome = apply_scenario(inputs, params)
+    stats = {}
+    curves = {}
+    for measure, values in outcome.items():
+        values = values[~np.isnan(values)]
+        if not len(values):
+            continue
+        p10, median, p90 = np.percentile(values, [10, 50, 90])
+        stats[measure] = {"Mean": values.mean(), "Median": median, "P10": p10, "P90": p90}
+        curves[measure] = np.percentile(values, PERCENTILES)
+    net = outcome[NET_INCOME]
+    valid = ~np.isnan(net) & (inputs["company_codes"] >= 0)
+    if NET_INCOME in stats:
+        stats[NET_INCOME]["Below Zero (%)"] = (net[~np.isnan(net)] < 0).mean() * 100
+    n_companies = len(inputs["company_labels"])
+    counts = np.bincount(inputs["company_codes"][valid], minlength=n_companies)
+    sums = np.bincount(inputs["company_codes"][valid], weights=net[valid], minlength=n_companies)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        by_company = pd.Series(sums / counts, index=inputs["company_labels"], name=NET_INCOME)
+    return {
+        "stats": pd.DataFrame(stats),
+        "curves": curves,
+        "by_company": by_company[counts > 0],
+    }
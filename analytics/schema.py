@@ -0,0 +1,71 @@
+"""Schema roles: map survey questions to the columns that answer them"""
+
+# Each role lists the exact column name used by the cleaned CSV first, then
+# keyword groups used to find the same question in uploaded files whose
+# headers were shortened differently (see load_excel_file).
+COLUMN_ROLES = {
+    "respondent": ("Respondent", [["respondent"]]),
+    "age": ("Age (Years)", [["age"]]),
+    "area": ("Areas Covered", [["area"]]),
+    "company": ("Company", [["company"]]),
+    "employment": ("Employment Status", [["employment", "status"], ["employment"]]),
+    "insurance": (None, [["insurance", "medical"], ["insurance"]]),
+    "insurance_cost": (None, [["insurance", "egp"], ["insurance", "cost"]]),
+    "benefits": (None, [["benefit", "receiv"], ["benefit"]]),
+    "paid_leave": ("Paid Leave", [["paid leave"], ["leave"]]),
+    "education": (None, [["education"]]),
+    "training": (None, [["training"]]),
+    "safety": (None, [["safety", "equipment"]]),
+    "satisfaction": (None, [["satisfaction"]]),
+    "communication": (None, [["communication"]]),
+    "route_priority": ("Route Prioritization", [["route"]]),
+    "performance_incentive": ("Do you receive performance-based incentives?", [["performance", "incentive"]]),
+    "peak_support": ("Do you receive any support or incentives during...", [["support", "incentive"]]),
+    "overtime_method": ("How was your overtime paid during public holida...", [["overtime", "paid"]]),
+    "white_friday_incentive": ("Did you receive any incentive during White Frid...", [["incentive", "white frid"]]),
+    "white_friday_days": ("How many days did you work during white Friday/...", [["days", "white frid"]]),
+    "white_friday_earnings": ("How much extra did you earn during white Friday...", [["extra", "white frid"]]),
+    "white_friday_per_package": ("Was the incentive paid per package delivered du...", [["was the incentive", "per package"]]),
+    "eid_incentive": ("How much incentive did you receive during Eid/R...", [["how much", "eid"]]),
+    "eid_criteria": ("During Eid/Ramadan peak period, was incentives ...", [["eid", "peak period"]]),
+    "holiday_work": ("Did you work during public holidays (Eid or nat...", [["work during public holiday"]]),
+    "holiday_flat_bonus": ("For overtime paid give flat bonus per shift dur...", [["flat bonus per shift"]]),
+    "holiday_shifts": ("Please mention number of public holiday shifts ...", [["public holiday shifts"], ["holiday", "shifts"]]),
+    "commute_time": ("Average commute time to starting point (one way...", [["commute"]]),
+    "vehicle_type": ("Vehicle type:", [["vehicle", "type"]]),
+    "fuel_cost": ("Fuel Expenses (EGP)", [["fuel", "expense"], ["fuel", "cost"], ["fuel", "egp"]]),
+    "maintenance_cost": ("Maintenance Costs (EGP)", [["maintenance", "cost"]]),
+    "financing_cost": ("Financing/Lease (EGP)", [["financing", "lease"], ["financing", "monthly"]]),
+    "other_expenses": ("Other Expenses (licenses, permits, fines, etc.)...", [["other", "expenses"]]),
+    "gross_income": ("What is your total gross monthly income (before...", [["gross", "income"]]),
+    "net_income": ("Net Income (Gross - All Expenses) (EGP)", [["net", "income"]]),
+    "fixed_pay": ("Please mention your Fixed Monthly Pay (if any):...", [["fixed", "pay"]]),
+    "variable_pay": ("Variable Pay (Monthly bonuses): ______ EGP", [["variable", "pay"]]),
+    "per_stop_pay": ("Varaiable Per Stops/Order (As applicable)", [["per", "stop"]]),
+    "deliveries_per_day": ("Average number of deliveries per day: ______", [["deliveries", "per day"], ["deliveries", "average"]]),
+    "hours_per_day": ("Average working hours per day: ______", [["working", "hours"], ["hours", "per day"]]),
+    "days_per_week": ("Average working days per week: ______", [["days", "per week"]]),
+    "success_rate": ("Approximate delivery success rate (orders deliv...", [["success", "rate"], ["delivery", "success"]]),
+    "experience_years": ("How many years of experience do you have in del...", [["years", "experience"]]),
+    "tenure": ("How long have you been working with your curren...", [["working with your current"], ["how long"]]),
+}
+
+
+def resolve_role(columns, role):
+    """Return the column that plays a schema role, or None if it is missing"""
+    exact, keyword_groups = COLUMN_ROLES[role]
+    columns = list(columns)
+    if exact is not None and exact in columns:
+        return exact
+    for keywords in keyword_groups:
+        for col in columns:
+            col_lower = col.lower()
+            if all(keyword in col_lower for keyword in keywords):
+                return col
+    return None
+
+
+def resolve_roles(columns):
+    """Resolve every known role against a column list in one pass"""
+    columns = list(columns)
+    return {role: resolve_role(columns, role) for role in COLUMN_ROLES}
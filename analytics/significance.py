@@ -0,0 +1,138 @@
+"""Pairwise group significance tests for one measure, vectorized over every pair of groups"""
+import numpy as np
+import pandas as pd
+
+from analytics.stats import normal_p_value, t_test_p_value
+
+# Schema roles whose groups are compared
+SIGNIFICANCE_ROLES = ["company", "area", "employment", "vehicle_type"]
+TESTS = ["welch", "mann_whitney"]
+CORRECTIONS = ["holm", "fdr_bh", "bonferroni", "none"]
+# Distinct values processed per block when accumulating Mann-Whitney counts
+_VALUE_BLOCK = 4096
+
+
+def welch_pairs(counts, means, variances):
+    """(t, p) matrices of Welch's t-test between every pair of groups, from per-group n, mean and variance"""
+    counts = np.asarray(counts, float)
+    se2 = np.asarray(variances, float) / counts
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pooled = se2[:, None] + se2[None, :]
+        t = (means[:, None] - means[None, :]) / np.sqrt(pooled)
+        # Welch-Satterthwaite degrees of freedom
+        dof = pooled ** 2 / (se2[:, None] ** 2 / (counts[:, None] - 1) + se2[None, :] ** 2 / (counts[None, :] - 1))
+    small = (counts < 2)[:, None] | (counts < 2)[None, :]
+    t[small] = np.nan
+    dof[small] = np.nan
+    return t, t_test_p_value(t, dof)
+
+
+def mann_whitney_pairs(values, groups, n_groups):
+    """(U, p) matrices of the Mann-Whitney U test between every pair of groups
+
+    With C the (distinct value x group) count table, the U statistic of every
+    pair is C' (L + C/2), where L holds the counts strictly below each value:
+    one matrix product per block of distinct values instead of one sort per
+    pair. p uses the tie-corrected normal approximation with continuity
+    correction, as scipy does for large samples.
+    """
+    uniques, value_codes = np.unique(values, return_inverse=True)
+    value_codes = value_codes.reshape(-1)
+    n = np.bincount(groups, minlength=n_groups).astype(float)
+    u = np.zeros((n_groups, n_groups))
+    ties = np.zeros((n_groups, n_groups))
+    cubes = np.zeros(n_groups)
+    below = np.zeros(n_groups)
+    order = np.argsort(value_codes, kind="stable")
+    sorted_codes = value_codes[order]
+    sorted_groups = groups[order]
+    for first in range(0, len(uniques), _VALUE_BLOCK):
+        last = min(first + _VALUE_BLOCK, len(uniques))
+        lo, hi = np.searchsorted(sorted_codes, [first, last])
+        cells = (sorted_codes[lo:hi] - first) * n_groups + sorted_groups[lo:hi]
+        block = np.bincount(cells, minlength=(last - first) * n_groups).reshape(last - first, n_groups).astype(float)
+        strictly_below = below + np.cumsum(block, axis=0) - block
+        u += block.T @ (strictly_below + block / 2)
+        below += block.sum(axis=0)
+        if hi - lo == last - first:
+            # Every value in the block occurs once: no cross terms, and each value's cube is 1
+            cubes += block.sum(axis=0)
+            continue
+        # Pairwise tie term: sum over values of (a+b)^3 - (a+b), expanded into products
+        squares = block ** 2
+        ties += 3 * (squares.T @ block + block.T @ squares)
+        cubes += (squares * block).sum(axis=0)
+    ties += cubes[:, None] + cubes[None, :] - n[:, None] - n[None, :]
+    total = n[:, None] + n[None, :]
+    mean_u = n[:, None] * n[None, :] / 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        var_u = n[:, None] * n[None, :] / 12 * ((total + 1) - ties / (total * (total - 1)))
+        z = (u - mean_u - 0.5 * np.sign(u - mean_u)) / np.sqrt(var_u)
+    z[(n < 1)[:, None] | (n < 1)[None, :] | ~(var_u > 0)] = np.nan
+    np.fill_diagonal(z, np.nan)
+    return u, normal_p_value(z)
+
+
+def adjust_p_values(p, method):
+    """Multiple-comparison adjusted p-values (Holm, Benjamini-Hochberg, Bonferroni) of a flat array"""
+    p = np.asarray(p, float)
+    adjusted = np.full(p.shape, np.nan)
+    valid = np.flatnonzero(~np.isnan(p))
+    m = len(valid)
+    if m == 0 or method == "none":
+        adjusted[valid] = p[valid]
+        return adjusted
+    if method == "bonferroni":
+        adjusted[valid] = np.minimum(p[valid] * m, 1.0)
+        return adjusted
+    order = valid[np.argsort(p[valid], kind="stable")]
+    ranked = p[order]
+    if method == "holm":
+        stepped = np.maximum.accumulate(ranked * (m - np.arange(m)))
+    elif method == "fdr_bh":
+        stepped = np.minimum.accumulate((ranked * m / np.arange(1, m + 1))[::-1])[::-1]
+    else:
+        raise ValueError(f"Unknown correction {method!r}")
+    adjusted[order] = np.minimum(stepped, 1.0)
+    return adjusted
+
+
+def pairwise_significance(cube, test="welch", correction="holm", values=None, groups=None):
+    """Adjusted p-value matrix and pair table for the groups of a one-dimensional SparseCube
+
+    Welch's test reads the cube's cached sufficient statistics; Mann-Whitney
+    also needs the observations (values, with their cell number in groups).
+    """
+    if test not in TESTS:
+        raise ValueError(f"Unknown test {test!r}")
+    dim = cube.dims[0]
+    labels = [str(label) for label in np.asarray(cube.labels[0])[cube.coords[0]]]
+    counts = cube.stats["count"]
+    means = cube.aggregate("mean")
+    k = len(labels)
+    if test == "welch":
+        with np.errstate(divide="ignore", invalid="ignore"):
+            variances = cube.stats["m2"] / (counts - 1)
+        statistic, p = welch_pairs(counts, means, variances)
+    else:
+        statistic, p = mann_whitney_pairs(values, groups, k)
+    upper = np.triu_indices(k, 1)
+    adjusted = np.full((k, k), np.nan)
+    adjusted[upper] = adjust_p_values(p[upper], correction)
+    adjusted[(upper[1], upper[0])] = adjusted[upper]
+    pairs = pd.DataFrame({
+        f"{dim} A": np.asarray(labels, dtype=object)[upper[0]],
+        f"{dim} B": np.asarray(labels, dtype=object)[upper[1]],
+        "n A": counts[upper[0]],
+        "n B": counts[upper[1]],
+        "Mean A": means[upper[0]],
+        "Mean B": means[upper[1]],
+        "Difference": means[upper[0]] - means[upper[1]],
+        "Statistic": statistic[upper],
+        "p": p[upper],
+        "Adjusted p": adjusted[upper],
+    })
+    return {
+        "matrix": pd.DataFrame(adjusted, index=labels, columns=labels),
+        "pairs": pairs.sort_values("Adjusted p", kind="stable").reset_index(drop=True),
+    }
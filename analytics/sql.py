@@ -0,0 +1,132 @@
+"""Read-only SQL over the survey dataset using an in-process SQLite database"""
+import re
+import sqlite3
+import time
+import uuid
+
+import pandas as pd
+
+from analytics.metrics import DERIVED_COLUMNS
+from analytics.schema import resolve_roles
+
+DEFAULT_ROW_LIMIT = 1000
+MAX_ROW_LIMIT = 100_000
+DEFAULT_TIMEOUT = 5.0
+# VM instructions between timeout checks
+_PROGRESS_STEPS = 10_000
+
+# Roles whose columns get an index, since ad-hoc queries mostly filter and group by them
+INDEXED_ROLES = ["company", "employment", "area", "vehicle_type", "age"]
+
+_ALLOWED_ACTIONS = {
+    sqlite3.SQLITE_SELECT,
+    sqlite3.SQLITE_READ,
+    sqlite3.SQLITE_FUNCTION,
+    sqlite3.SQLITE_RECURSIVE,
+}
+
+_TOKEN = re.compile(r"""('(?:[^']|'')*'|"(?:[^"]|"")*"|`[^`]*`|\[[^\]]*\])|(--[^\n]*|/\*.*?\*/)|(\s+)""", re.S)
+
+
+class QueryError(Exception):
+    """A query that was rejected, failed or ran past its time limit"""
+
+
+def normalize_query(sql):
+    """Query text with comments removed and whitespace collapsed outside quoted strings"""
+    def replace(match):
+        quoted = match.group(1)
+        return quoted if quoted is not None else " "
+    # Second pass merges the spaces left where a comment sat next to whitespace
+    return _TOKEN.sub(replace, _TOKEN.sub(replace, sql)).strip().rstrip(";").strip()
+
+
+def sql_identifier(name):
+    """snake_case alias for a column name, e.g. 'Cost per Delivery (EGP)' -> cost_per_delivery_egp"""
+    return re.sub(r"[^0-9a-z]+", "_", str(name).lower()).strip("_")
+
+
+def _quote(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _authorize(action, *args):
+    return sqlite3.SQLITE_OK if action in _ALLOWED_ACTIONS else sqlite3.SQLITE_DENY
+
+
+class SqlEngine:
+    """In-memory SQLite copy of a dataset: table `survey` plus a `drivers` view with short names
+
+    The loading connection stays open for the engine's lifetime; every query runs
+    on its own connection to the shared-cache database, restricted to reads by an
+    authorizer, with a row limit and a time limit.
+    """
+
+    def __init__(self, df):
+        self._uri = f"file:vans-{uuid.uuid4().hex}?mode=memory&cache=shared"
+        self._owner = sqlite3.connect(self._uri, uri=True, check_same_thread=False)
+        self.columns = self._load(df)
+        self.views = self._create_views(df)
+
+    def _load(self, df):
+        data = {}
+        names = {}
+        for col in df.columns:
+            # SQLite column names are case-insensitive
+            name = str(col)
+            while name.lower() in names:
+                name = f"{name} (2)"
+            names[name.lower()] = name
+            values = df[col]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                values = values.astype(object)
+            data[name] = values.to_numpy()
+        pd.DataFrame(data).to_sql("survey", self._owner, index=False)
+        return list(data)
+
+    def _create_views(self, df):
+        roles = resolve_roles(df.columns)
+        aliases = {role: col for role, col in roles.items() if col is not None}
+        for col in DERIVED_COLUMNS:
+            if col in df.columns:
+                aliases[sql_identifier(col)] = col
+        for role in INDEXED_ROLES:
+            if role in aliases:
+                self._owner.execute(f"CREATE INDEX {_quote('idx_' + role)} ON survey ({_quote(aliases[role])})")
+        if aliases:
+            select = ", ".join(f"{_quote(col)} AS {_quote(alias)}" for alias, col in aliases.items())
+            self._owner.execute(f"CREATE VIEW drivers AS SELECT {select} FROM survey")
+        self._owner.commit()
+        return {"drivers": list(aliases)} if aliases else {}
+
+    def query(self, sql, limit=DEFAULT_ROW_LIMIT, timeout=DEFAULT_TIMEOUT):
+        """Run one read-only statement; returns the rows (at most limit), a truncation flag and the run time"""
+        sql = normalize_query(sql)
+        if not sql:
+            raise QueryError("Empty query")
+        limit = max(1, min(int(limit), MAX_ROW_LIMIT))
+        started = time.perf_counter()
+        deadline = started + timeout
+        conn = sqlite3.connect(self._uri, uri=True, check_same_thread=False)
+        try:
+            conn.execute("PRAGMA query_only = ON")
+            conn.set_authorizer(_authorize)
+            conn.set_progress_handler(lambda: time.perf_counter() > deadline, _PROGRESS_STEPS)
+            cursor = conn.execute(sql)
+            if cursor.description is None:
+                raise QueryError("Only SELECT queries are supported")
+            rows = cursor.fetchmany(limit + 1)
+        except sqlite3.OperationalError as e:
+            if time.perf_counter() > deadline:
+                raise QueryError(f"Query stopped after the {timeout:g} s time limit") from e
+            raise QueryError(str(e)) from e
+        except (sqlite3.DatabaseError, sqlite3.Warning) as e:
+            raise QueryError(str(e)) from e
+        finally:
+            conn.close()
+        columns = [d[0] for d in cursor.description]
+        return {
+            "table": pd.DataFrame(rows[:limit], columns=columns),
+            "truncated": len(rows) > limit,
+            "seconds": time.perf_counter() - started,
+        }
@@ -0,0 +1,2379 @@
+"""Vans delivery dashboard, shared by every entry script (main.py, streamlit_app.py, app.py, app_backup.py)"""
+import os
+import io
+import atexit
+import re
+import time
+import uuid
+import tempfile
+import datetime
+from concurrent.futures import as_completed
+
+
+from analytics.imports import IMPORT_TIMINGS, LazyModule, timed_import
+
+import streamlit as st
+
+# Timed so the startup profile (STREAMLIT_DASH_PROFILE=1) can show cold-start import cost
+pd = timed_import("pandas")
+np = timed_import("numpy")
+
+from analytics.bootstrap import group_mean_ci
+from analytics.cache import ResultCache
+from analytics.chartdata import ChartData, coerce_numeric_columns
+from analytics.columnar import is_text_dtype, list_columnar, open_columnar, read_manifest, write_columnar
+from analytics.comparisons import COMPARISON_CHARTS, build_comparison_chart, comparison_projection
+from analytics.correlation import clustered_matrix, correlation_matrix, downsample_pair, significant_only, top_pairs
+from analytics.dataset import dataset_version
+from analytics.filters import AGE_COLUMN, age_bounds, apply_filter_state, common_filter_states, filter_options, filter_state_key, sidebar_filter_columns
+from analytics.jobs import PROCESS_POOL_MIN_ROWS, JobBoard, make_executor, make_process_pool
+from analytics.memory import MemoryGovernor
+from analytics.metrics import COST_PER_DELIVERY, DERIVED_COLUMNS, compute_derived_metrics
+from analytics.montecarlo import BELOW_THRESHOLD, SEGMENT_ROLES, fit_earnings_model, simulate_earnings
+from analytics.peakseason import EID_INCENTIVE, EID_UPLIFT, HOLIDAY_SHARE, PEAK_UPLIFT, WF_DAILY_UPLIFT, WF_PER_DAY, peak_season_projection, peak_season_summary
+from analytics.precompute import WARM_AFTER_REQUESTS, PresetCache
+from analytics.presets import PRESET_GROUPS, PRESETS, available_presets
+from analytics.quality import QUALITY_FLAGS, check_columns, check_mask, normalize_answers, quality_flags, quality_report
+from analytics.query import DatasetIndex, build_cube, cell_observations, cube_key, filter_predicates, plan_query, query_positions
+from analytics.scenarios import BASELINE, NET_INCOME, SCENARIO_PARAMETERS, scenario_inputs, scenario_key, scenario_summary
+from analytics.schema import resolve_roles
+from analytics.significance import SIGNIFICANCE_ROLES, pairwise_significance
+from analytics.sql import DEFAULT_ROW_LIMIT, DEFAULT_TIMEOUT, MAX_ROW_LIMIT, SqlEngine, normalize_query
+
+# plotly.express is the slowest import here; load it when the first chart is built
+px = LazyModule("plotly.express")
+
+# Disable PyArrow conversion to prevent conversion errors
+os.environ['STREAMLIT_DISABLE_DATAFRAME_ARROW_CONVERSION'] = '1'
+
+# Static styling: theme colours live in .streamlit/config.toml, the rest in assets/style.css
+CSS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "style.css")
+
+# Password used when STREAMLIT_DASH_PASSWORD is not set; an empty string disables the login
+DEFAULT_PASSWORD = "vans2025"
+
+# Job results all sessions may keep in memory between reruns; pm2 restarts the app at 1 GB
+SESSION_MEMORY_MB = float(os.getenv("STREAMLIT_DASH_SESSION_MEMORY_MB", "256"))
+# Where large evicted results are written; a private temporary directory when unset
+SPILL_DIR = os.getenv("STREAMLIT_DASH_SPILL_DIR") or None
+
+# "mmap" keeps the cleaned dataset in memory-mapped column files shared by all sessions and processes
+STORAGE_MODE = os.getenv("STREAMLIT_DASH_STORAGE", "memory")
+COLUMNAR_DIR = os.getenv("STREAMLIT_DASH_COLUMNAR_DIR") or os.path.join(tempfile.gettempdir(), "vans-dashboard-columnar")
+
+DEFAULT_CSV_PATH = "Vans_data_ultra_clean.csv"  # Use the ultra-clean CSV file
+DEFAULT_XLSX_PATH = "Vans_data_raw_new.xlsx"  # Use the corrected file
+FALLBACK_XLSX_PATH = "Vans data for dashboard.xlsx"  # Keep as fallback
+
+
+@st.cache_resource
+def load_css(path):
+    """Read and minify the stylesheet once per process"""
+    with open(path, encoding="utf-8") as f:
+        css = f.read()
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css).strip()
+    return f"<style>{css}</style>"
+
+# ---------- Helper Functions ----------
+def _flatten_columns(columns):
+    """Flatten multi-level column names"""
+    flattened = []
+    for col in columns:
+        if isinstance(col, tuple) or isinstance(col, list):
+            parts = [str(x) for x in col if str(x) != "nan" and str(x).strip()]
+            flattened.append(" - ".join(parts).strip())
+        else:
+            flattened.append(str(col).strip())
+    return flattened
+
+# Simple data loading without caching to avoid PyArrow issues
+def load_excel_file(path_or_bytes):
+    """Load Excel file with proper survey data structure support"""
+    try:
+        # Load raw data to examine structure
+        df_raw = pd.read_excel(path_or_bytes, header=None)
+        
+        # Based on analysis: Row 0 = main headers, Row 2 = sub-headers, Row 3+ = data
+        if len(df_raw) < 4:
+            st.error("Excel file doesn't have enough rows for survey data")
+            return pd.DataFrame()
+        
+        # Get header rows (0-indexed, so Row 1 = index 0, Row 3 = index 2)
+        main_headers = df_raw.iloc[0].fillna('')  # Row 1
+        sub_headers = df_raw.iloc[2].fillna('')   # Row 3
+        
+        # Create intelligent column names
+        smart_cols = []
+        for i, (main_header, sub_header) in enumerate(zip(main_headers, sub_headers)):
+            main_header = str(main_header).strip()
+            sub_header = str(sub_header).strip()
+            
+            # Skip completely empty columns
+            if main_header in ['nan', 'NULL', ''] and sub_header in ['nan', 'NULL', '']:
+                if i == 0:
+                    col_name = "Respondent"  # First column is always respondent
+                else:
+                    col_name = f"Empty_Col_{i}"
+            else:
+                # Create meaningful column names based on headers
+                if i == 0:
+                    col_name = "Respondent"
+                elif i == 1 and "age" in main_header.lower():
+                    col_name = "Age (Years)"
+                elif i == 2 and "area" in main_header.lower():
+                    col_name = "Areas Covered"
+                elif i == 3 and "company" in main_header.lower():
+                    col_name = "Company"
+                elif i == 4 and "employment" in main_header.lower():
+                    col_name = "Employment Status"
+                else:
+                    # Use main header as base
+                    if main_header and main_header != 'nan':
+                        col_name = main_header
+                        
+                        # Add sub-header if it provides additional context
+                        if sub_header and sub_header != 'nan' and sub_header != main_header:
+                            # Special cases for benefit details
+                            if "days per month" in sub_header.lower():
+                                col_name = f"{main_header} (Days)"
+                            elif "egp/month" in sub_header.lower() or "egp" in sub_header.lower():
+                                col_name = f"{main_header} (EGP)"
+                            elif len(sub_header) < 30:  # Only add short, meaningful sub-headers
+                                col_name = f"{main_header} ({sub_header})"
+                    elif sub_header and sub_header != 'nan':
+                        col_name = sub_header
+                    else:
+                        col_name = f"Question_{i+1}"
+                
+                # Clean and shorten long names
+                col_name = col_name.replace('\n', ' ').replace('\r', ' ')
+                if len(col_name) > 50:
+                    # Apply smart shortening
+                    if "benefit" in col_name.lower() and "direct employee" in col_name.lower():
+                        col_name = "Benefits (Direct Employee)"
+                    elif "deliveries" in col_name.lower() and "day" in col_name.lower():
+                        col_name = "Deliveries per Day"
+                    elif "income" in col_name.lower() or "salary" in col_name.lower():
+                        col_name = "Net Income (EGP)"
+                    elif "vehicle" in col_name.lower() and "type" in col_name.lower():
+                        col_name = "Vehicle Type"
+                    elif "working" in col_name.lower() and "hours" in col_name.lower():
+                        col_name = "Working Hours per Day"
+                    else:
+                        col_name = col_name[:47] + "..."
+            
+            smart_cols.append(col_name)
+        
+        # Extract data starting from row 4 (index 3)
+        data_df = df_raw.iloc[3:].copy()
+        
+        # Ensure we have the right number of columns
+        if len(smart_cols) != len(data_df.columns):
+            # Adjust if mismatch
+            smart_cols = smart_cols[:len(data_df.columns)]
+            if len(smart_cols) < len(data_df.columns):
+                for i in range(len(smart_cols), len(data_df.columns)):
+                    smart_cols.append(f"Extra_Col_{i}")
+        
+        # Ensure all column names are unique
+        seen_names = set()
+        unique_cols = []
+        for col_name in smart_cols:
+            original_name = col_name
+            counter = 1
+            while col_name in seen_names:
+                col_name = f"{original_name}_{counter}"
+                counter += 1
+            seen_names.add(col_name)
+            unique_cols.append(col_name)
+        
+        # Apply column names and clean up
+        data_df.columns = unique_cols
+        data_df = data_df.reset_index(drop=True)
+        data_df = data_df.dropna(how='all')
+        
+        # Convert obvious numeric columns with better handling of mixed data
+        numeric_indicators = ['age', 'year', 'egp', 'days', 'hours', 'deliveries', 'income', 'salary', 'allowance']
+        for col in data_df.columns:
+            col_lower = col.lower()
+            if any(indicator in col_lower for indicator in numeric_indicators):
+                try:
+                    # Try to convert to numeric, keeping original if it fails
+                    numeric_series = pd.to_numeric(data_df[col], errors='coerce')
+                    # Only convert if more than 50% of values are valid numbers
+                    if numeric_series.count() > len(data_df) * 0.5:
+                        data_df[col] = numeric_series
+                except:
+                    pass
+        
+        # Handle problematic mixed columns that cause PyArrow issues
+        # Keep the tenure column as text and stringify other mixed columns
+        for col in data_df.columns:
+            try:
+                if 'working with your current' in col.lower() or 'how long' in col.lower():
+                    # Keep the answers as text; prepare_dataset reads "14 months" or "2 yrs" as years
+                    data_df[col] = data_df[col].astype(str).str.strip().replace({'nan': None, 'None': None, '': None})
+                
+                # Also check for other mixed columns
+                elif data_df[col].dtype == 'object':
+                    sample_values = data_df[col].dropna().head(10)
+                    has_mixed_types = False
+                    
+                    for val in sample_values:
+                        val_str = str(val)
+                        if any(pattern in val_str.lower() for pattern in ['months', 'years', 'days']) and any(char.isdigit() for char in val_str):
+                            has_mixed_types = True
+                            break
+                    
+                    if has_mixed_types:
+                        # Convert to string consistently
+                        data_df[col] = data_df[col].astype(str)
+                        data_df[col] = data_df[col].replace('nan', None)
+            except Exception as e:
+                continue
+        
+        return data_df
+        
+    except Exception as e:
+        st.error(f"Error loading Excel file: {str(e)}")
+        return pd.DataFrame()
+
+# ---------- Cached Resources ----------
+# Bump whenever prepare_dataset changes its output, so stored columnar copies get rebuilt
+PREPARE_VERSION = 1
+
+def prepare_dataset(df):
+    """Normalized answers, numeric coercion, derived unit-economics columns and data-quality flags"""
+    df = coerce_numeric_columns(normalize_answers(df))
+    df = pd.concat([df, compute_derived_metrics(df)], axis=1)
+    return df.assign(**{QUALITY_FLAGS: quality_flags(df)})
+
+@st.cache_data(show_spinner=False)
+def load_prepared_dataset(version, _df):
+    """Prepared dataset, done once per dataset version"""
+    return prepare_dataset(_df)
+
+@st.cache_resource(show_spinner=False)
+def load_mapped_dataset(version, _df, name):
+    """Prepared dataset stored as memory-mapped columns (written once per dataset and pipeline version)"""
+    directory = os.path.join(COLUMNAR_DIR, version)
+    stale = os.path.isdir(directory) and read_manifest(directory).get("pipeline") != PREPARE_VERSION
+    if stale or not os.path.isdir(directory):
+        os.makedirs(COLUMNAR_DIR, exist_ok=True)
+        write_columnar(prepare_dataset(_df), directory, name=name, version=version, pipeline=PREPARE_VERSION, replace=stale)
+    return open_columnar(directory)
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def get_sql_engine(version, _df):
+    """SQLite copy of the prepared dataset for the SQL Query tab, built once per dataset version"""
+    return SqlEngine(_df)
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def get_dataset_index(version, _df):
+    """Column codes and filter bitmaps of the prepared dataset, shared by every query planned against it"""
+    return DatasetIndex(_df)
+
+@st.cache_resource(show_spinner=False)
+def open_stored_wave(directory):
+    """A previously stored survey wave, mapped once per process"""
+    return open_columnar(directory)
+
+@st.cache_resource
+def get_preset_cache():
+    """Preset results shared by all sessions and warmed in the background"""
+    return PresetCache()
+
+# Create a display-safe version for st.dataframe (all strings to avoid PyArrow issues)
+def make_display_safe(df):
+    """Convert dataframe to display-safe format (all strings) to avoid PyArrow conversion errors"""
+    display_df = df.copy()
+    for col in display_df.columns:
+        try:
+            # Convert everything to string for display, but preserve NaN as empty string
+            display_df[col] = display_df[col].astype(str).replace('nan', '').replace('<NA>', '')
+        except:
+            pass
+    return display_df
+
+@st.cache_resource
+def get_job_executor():
+    """Thread pool shared by every session for the heavy dashboard sections"""
+    return make_executor()
+
+@st.cache_resource
+def get_process_pool():
+    """Worker processes for the comparison charts on large datasets and big risk simulations"""
+    pool = make_process_pool()
+    # Stop the workers with the server so their semaphores are released too
+    atexit.register(pool.shutdown, cancel_futures=True)
+    return pool
+
+@st.cache_resource
+def get_result_cache():
+    """Analysis results shared across sessions, keyed by dataset version and filter state"""
+    return ResultCache()
+
+@st.cache_resource
+def get_memory_governor():
+    """Process-wide budget for the job results every session keeps between reruns"""
+    return MemoryGovernor(int(SESSION_MEMORY_MB * 1024 * 1024), spill_dir=SPILL_DIR)
+
+def compute_group_ci(df, index, plan):
+    """Bootstrap intervals of the plan's group means, over the rows its filters select"""
+    rows = df.iloc[query_positions(index, plan)]
+    return group_mean_ci(rows, plan["measure"], list(plan["group_by"]))
+
+def compute_significance(index, plan, cube, test, correction):
+    """Pairwise tests between the plan's groups; only Mann-Whitney goes back to the rows"""
+    values, groups = cell_observations(index, plan) if test == "mann_whitney" else (None, None)
+    return pairwise_significance(cube, test, correction, values, groups)
+
+def compute_earnings_risk(df, roles, segment_role, draws, threshold, seed, executor):
+    """Fit the per-segment earnings model and simulate it; None without net income data"""
+    model = fit_earnings_model(df, roles, segment_role)
+    if model is None:
+        return None
+    return simulate_earnings(model, draws, threshold, seed, executor)
+
+def compute_summary(df):
+    """Display-safe describe() table"""
+    return make_display_safe(df.describe().drop(columns=[QUALITY_FLAGS], errors="ignore"))
+
+
+# HARDCODED KPI CALCULATIONS - Reliable and accurate
+def calculate_kpis(df):
+    """Calculate KPIs directly from known column names"""
+    kpis = {}
+    
+    # Age KPI - Use exact column name
+    age_col = "Age (Years)"
+    if age_col in df.columns:
+        valid_ages = df[age_col].dropna()
+        if len(valid_ages) > 0:
+            kpis['avg_age'] = valid_ages.mean()
+            kpis['age_count'] = len(valid_ages)
+    
+    # Deliveries KPI - Use exact column name
+    delivery_col = "Average number of deliveries per day: ______"
+    if delivery_col in df.columns:
+        valid_deliveries = df[delivery_col].dropna()
+        if len(valid_deliveries) > 0:
+            kpis['avg_deliveries'] = valid_deliveries.mean()
+            kpis['delivery_count'] = len(valid_deliveries)
+    
+    # Success Rate KPI
+    success_col = "Approximate delivery success rate (orders deliv..."
+    if success_col in df.columns:
+        valid_success = df[success_col].dropna()
+        if len(valid_success) > 0:
+            kpis['success_rate'] = valid_success.mean()
+            kpis['success_count'] = len(valid_success)
+    
+    # Income KPI - Fixed pay
+    income_col = "Please mention your Fixed Monthly Pay (if any):..."
+    if income_col in df.columns:
+        valid_income = df[income_col].dropna()
+        if len(valid_income) > 0:
+            kpis['avg_income'] = valid_income.mean()
+            kpis['income_count'] = len(valid_income)
+    
+    # Company distribution
+    company_col = "Company"
+    if company_col in df.columns:
+        companies = df[company_col].dropna().nunique()
+        kpis['unique_companies'] = companies
+        kpis['top_company'] = df[company_col].mode().iloc[0] if len(df[company_col].mode()) > 0 else "N/A"
+    
+    return kpis
+
+# Calculate reliable KPIs
+
+def render_preset_result(result):
+    """Show a preset's result table and the chart its spec asks for"""
+    table = result["table"]
+    dimensions = result["dimensions"]
+    values = result["values"]
+    if "tables" in result:
+        # Crosstabs carry counts, row % and column % from the same pass
+        table_view = st.radio("Show:", list(result["tables"]), horizontal=True, key="preset_table_view")
+        table = result["tables"][table_view]
+    # Convert to display-safe format to avoid PyArrow issues
+    display_table = make_display_safe(table)
+    st.dataframe(display_table, use_container_width=True)
+    
+    chart = result["chart"]
+    if chart == "bar":
+        fig = px.bar(table, x=dimensions[0], y=values[0], title=f"{values[0]} by {dimensions[0]}")
+    elif chart == "stacked_bar":
+        long_table = table.melt(id_vars=dimensions, value_vars=values, var_name="Measure", value_name="Value")
+        fig = px.bar(long_table, x=dimensions[0], y="Value", color="Measure", title=f"Breakdown by {dimensions[0]}")
+    elif chart == "measures_bar":
+        fig = px.bar(table, x="Measure", y=values[0], title=f"{values[0]} by Category")
+    elif chart == "pie":
+        fig = px.pie(table, names=dimensions[0], values="Count", title=f"{dimensions[0]} Distribution")
+    else:
+        return
+    fig.update_layout(xaxis_tickangle=-45)
+    st.plotly_chart(fig, use_container_width=True)
+
+def deliveries_by_company_figure(chart_data, roles):
+    fig = px.box(
+        chart_data,
+        x=roles["company"],
+        y=roles["deliveries_per_day"],
+        title="Daily Deliveries by Company",
+        color=roles["company"]
+    )
+    fig.update_layout(xaxis_tickangle=-45, showlegend=False)
+    return fig
+
+def hours_by_employment_figure(chart_data, roles):
+    fig = px.violin(
+        chart_data,
+        x=roles["employment"],
+        y=roles["hours_per_day"],
+        title="Working Hours by Employment Status",
+        color=roles["employment"]
+    )
+    fig.update_layout(xaxis_tickangle=-45, showlegend=False)
+    return fig
+
+def ci_error_bars(chart_data, value_col):
+    """Chart data plus px error_y arguments drawing its CI Low / CI High columns, if present"""
+    if "CI Low" not in chart_data.columns:
+        return chart_data, {}
+    chart_data = chart_data.assign(**{
+        "CI +": chart_data["CI High"] - chart_data[value_col],
+        "CI −": chart_data[value_col] - chart_data["CI Low"],
+    })
+    return chart_data, {"error_y": "CI +", "error_y_minus": "CI −"}
+
+def fuel_by_company_figure(chart_data, roles):
+    chart_data, error_bars = ci_error_bars(chart_data, roles["fuel_cost"])
+    fig = px.bar(
+        chart_data,
+        x=roles["company"],
+        y=roles["fuel_cost"],
+        title="Average Monthly Fuel Costs by Company (95% CI)",
+        color=roles["company"],
+        **error_bars
+    )
+    fig.update_layout(xaxis_tickangle=-45, showlegend=False)
+    fig.update_traces(texttemplate='%{y:.0f} EGP', textposition='outside')
+    return fig
+
+def vehicle_mix_figure(chart_data, roles):
+    return px.pie(
+        chart_data,
+        values="Count",
+        names=roles["vehicle_type"],
+        title="Vehicle Type Distribution"
+    )
+
+def success_by_company_figure(chart_data, roles):
+    chart_data, error_bars = ci_error_bars(chart_data, roles["success_rate"])
+    fig = px.bar(
+        chart_data,
+        x=roles["company"],
+        y=roles["success_rate"],
+        title="Average Delivery Success Rate by Company (95% CI)",
+        color=roles["company"],
+        **error_bars
+    )
+    fig.update_layout(xaxis_tickangle=-45, showlegend=False)
+    fig.update_traces(texttemplate='%{y:.1f}%', textposition='outside')
+    return fig
+
+def age_by_company_figure(chart_data, roles):
+    fig = px.box(
+        chart_data,
+        x=roles["company"],
+        y=roles["age"],
+        title="Age Distribution by Company",
+        color=roles["company"]
+    )
+    fig.update_layout(xaxis_tickangle=-45, showlegend=False)
+    return fig
+
+# name: (figure builder, message when columns are missing, message when no rows survive cleaning)
+COMPARISON_FIGURES = {
+    "deliveries_by_company": (deliveries_by_company_figure, "Deliveries or company data not found for comparison", "No valid deliveries data after cleaning"),
+    "hours_by_employment": (hours_by_employment_figure, "Working hours or employment data not found", "No valid working hours data after cleaning"),
+    "fuel_by_company": (fuel_by_company_figure, "Fuel cost data not found for comparison", "No valid fuel cost data after cleaning"),
+    "vehicle_mix": (vehicle_mix_figure, "Vehicle type data not found", "No valid vehicle type data"),
+    "success_by_company": (success_by_company_figure, "Success rate data not found for comparison", "No valid success rate data after cleaning"),
+    "age_by_company": (age_by_company_figure, "Age data not found for comparison", "No valid age data after cleaning"),
+}
+
+def comparison_renderer(name, roles):
+    """Render callback that draws one comparison chart from its job's chart data"""
+    build_figure, missing_message, empty_message = COMPARISON_FIGURES[name]
+    
+    def render(placeholder, chart_data):
+        if chart_data is None:
+            placeholder.info(missing_message)
+        elif len(chart_data) == 0:
+            placeholder.info(empty_message)
+        else:
+            try:
+                placeholder.plotly_chart(build_figure(chart_data, roles), use_container_width=True)
+            except Exception as e:
+                placeholder.error(f"Error creating chart: {str(e)}")
+    return render
+
+class PendingRenders:
+    """Placeholders waiting on background jobs for one full script run
+
+    A full run collects them and fills them once every section is on the page.
+    Afterwards a section rerunning on its own (an st.fragment) has nothing left
+    to defer to, so its placeholders are filled as soon as their jobs finish.
+    """
+
+    def __init__(self):
+        self.items = []
+        self.flushed = False
+
+def fill_placeholder(future, placeholder, render):
+    """Call render(placeholder, result) once the job is done, or show its error"""
+    try:
+        render(placeholder, future.result())
+    except Exception as e:
+        placeholder.error(f"Error computing this section: {str(e)}")
+
+def render_when_ready(pending, future, placeholder, render, message="⏳ Computing..."):
+    """Show a placeholder now and call render(placeholder, result) once the job is done"""
+    placeholder.info(message)
+    if pending.flushed:
+        fill_placeholder(future, placeholder, render)
+    else:
+        pending.items.append((future, placeholder, render))
+
+# ---------- Page Sections ----------
+def render_header(default_password):
+    """Dashboard header with logout option; stops the run until the password is entered"""
+    password = os.getenv("STREAMLIT_DASH_PASSWORD", default_password)
+    
+    col1, col2 = st.columns([4, 1])
+    with col1:
+        st.markdown("""
+        <div class="dashboard-header">
+            <h1>🚐 Vans Data Interactive Dashboard</h1>
+            <p>Professional analytics for delivery operations data</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with col2:
+        if password and st.session_state.get('authenticated', False):
+            if st.button("🚪 Logout", help="Logout from dashboard"):
+                st.session_state.authenticated = False
+                # Release the session's job results now rather than when the session expires
+                if "job_board" in st.session_state:
+                    st.session_state.job_board.cancel_all()
+                st.rerun()
+    if password:
+        def login():
+            # Create a centered login form
+            col1, col2, col3 = st.columns([1, 2, 1])
+            with col2:
+                st.markdown("""
+                <div style="text-align: center; padding: 2rem; background: #f8f9fa; border-radius: 10px; border: 1px solid #dee2e6;">
+                    <h3>🔐 Dashboard Access</h3>
+                    <p style="color: #6c757d; margin-bottom: 1.5rem;">Enter the password to access the Vans Delivery Analytics Dashboard</p>
+                </div>
+                """, unsafe_allow_html=True)
+            
+                with st.form("login", clear_on_submit=False):
+                    pwd = st.text_input("Password", type="password", help="Contact administrator for dashboard access")
+                    ok = st.form_submit_button("🚀 Access Dashboard", use_container_width=True)
+                return ok, pwd
+    
+        if 'authenticated' not in st.session_state:
+            st.session_state.authenticated = False
+    
+        if not st.session_state.authenticated:
+            ok, pwd = login()
+            if ok and pwd == password:
+                st.session_state.authenticated = True
+                st.success("✅ Access granted! Loading dashboard...")
+                st.rerun()
+            elif ok:
+                st.error("❌ Incorrect password. Please try again.")
+                st.stop()
+            else:
+                st.info("💡 **Dashboard Features:** View KPIs, analyze delivery data, compare metrics, and explore individual survey responses.")
+                st.stop()
+
+def load_dataset():
+    """Data source picker: included sample file or an upload, cleaned of sparse columns"""
+    st.subheader("📊 Data Source")
+    source_options = ["📁 Use included sample file", "📤 Upload your own Excel file"]
+    stored_waves = list_columnar(COLUMNAR_DIR) if STORAGE_MODE == "mmap" else []
+    # Waves prepared by older code lack newer columns; they are rebuilt when their source is loaded again
+    outdated_waves = [m for m in stored_waves if m.get("pipeline") != PREPARE_VERSION]
+    stored_waves = [m for m in stored_waves if m.get("pipeline") == PREPARE_VERSION]
+    if stored_waves:
+        source_options.append("🗄️ Open a stored survey wave")
+    data_choice = st.radio(
+        "Choose data source:",
+        source_options,
+        horizontal=True
+    )
+    if outdated_waves:
+        st.caption(f"{len(outdated_waves)} stored wave(s) from an older version of the dashboard are hidden; load their source file again to store them anew.")
+
+    if data_choice == "🗄️ Open a stored survey wave":
+        # Stored waves are already cleaned and typed; only the pages that get read are loaded
+        wave = st.selectbox(
+            "Survey wave:",
+            stored_waves,
+            format_func=lambda m: f"{m['name']} · {m['rows']:,} respondents · saved {m['saved']}"
+        )
+        df_all = open_stored_wave(wave["directory"])
+        st.success(f"✅ Opened stored survey wave: {len(df_all):,} respondents, {len(df_all.columns)} questions")
+        return df_all
+
+    df_all = pd.DataFrame()
+    source_name = None
+
+    if data_choice == "📁 Use included sample file":
+        # Load ultra-clean CSV (guaranteed PyArrow-safe)
+        if os.path.exists(DEFAULT_CSV_PATH):
+            try:
+                df_all = pd.read_csv(DEFAULT_CSV_PATH)  # Can load normally since it's ultra-clean
+                source_name = DEFAULT_CSV_PATH
+                if not df_all.empty:
+                    st.success(f"✅ Loaded ultra-clean Vans survey data: {len(df_all):,} respondents, {len(df_all.columns)} questions")
+                else:
+                    df_all = pd.DataFrame()
+            except Exception as e:
+                st.warning(f"⚠️ Issue loading ultra-clean CSV: {str(e)}")
+                df_all = pd.DataFrame()
+    
+        # Fallback to Excel if CSV fails
+        if df_all.empty and os.path.exists(DEFAULT_XLSX_PATH):
+            df_all = load_excel_file(DEFAULT_XLSX_PATH)
+            source_name = DEFAULT_XLSX_PATH
+            if not df_all.empty:
+                st.info(f"✅ Loaded Excel data: {len(df_all):,} respondents, {len(df_all.columns)} questions")
+            else:
+                st.warning("⚠️ Issue with Excel file, trying fallback...")
+                if os.path.exists(FALLBACK_XLSX_PATH):
+                    df_all = load_excel_file(FALLBACK_XLSX_PATH)
+                    source_name = FALLBACK_XLSX_PATH
+                    if not df_all.empty:
+                        st.info(f"✅ Loaded fallback data: {len(df_all):,} respondents, {len(df_all.columns)} questions")
+    
+        # Final fallback
+        if df_all.empty:
+            st.info("📁 Data files not found. Please upload your own file below.")
+            data_choice = "📤 Upload your own Excel file"
+
+    if data_choice == "📤 Upload your own Excel file" or df_all.empty:
+        uploaded_file = st.file_uploader(
+            "Choose Excel (.xlsx) or CSV file",
+            type=["xlsx", "csv"],
+            help="Upload your Excel or CSV file with delivery/van operation data"
+        )
+    
+        if uploaded_file is not None:
+            source_name = uploaded_file.name
+            if uploaded_file.name.endswith('.csv'):
+                df_all = pd.read_csv(uploaded_file, dtype=str)  # Force all to string initially
+                # Clean and convert numeric columns safely
+                if not df_all.empty:
+                    for col in df_all.columns:
+                        df_all[col] = df_all[col].replace('nan', None)
+                    numeric_indicators = ['age', 'year', 'egp', 'days', 'hours', 'deliveries', 'income', 'salary', 'allowance']
+                    for col in df_all.columns:
+                        col_lower = col.lower()
+                        if any(indicator in col_lower for indicator in numeric_indicators):
+                            try:
+                                df_all[col] = pd.to_numeric(df_all[col], errors='coerce')
+                            except:
+                                pass
+            else:
+                data_bytes = io.BytesIO(uploaded_file.read())
+                df_all = load_excel_file(data_bytes)
+        
+            if not df_all.empty:
+                st.success(f"✅ File uploaded successfully: {len(df_all):,} records, {len(df_all.columns)} columns")
+        else:
+            st.info("👆 Please upload an Excel file to continue")
+            st.stop()
+
+    if df_all.empty:
+        st.error("❌ No data available. Please upload a valid Excel file.")
+        st.stop()
+
+    # Ensure we have valid data
+    if len(df_all) == 0 or len(df_all.columns) == 0:
+        st.error("❌ Invalid data structure. Please check your Excel file.")
+        st.stop()
+
+    # Clean and prepare data
+    df_all.columns = [str(c).strip() for c in df_all.columns]
+
+    # Remove problematic columns with minimal data
+    problematic_cols = []
+    for col in df_all.columns:
+        try:
+            # Remove if completely empty
+            if df_all[col].isna().all() or (df_all[col].astype(str).str.strip() == '').all():
+                problematic_cols.append(col)
+            # Remove Question_1 specifically if it has very few valid responses
+            elif col == 'Question_1':
+                valid_responses = df_all[col].dropna()
+                valid_responses = valid_responses[valid_responses.astype(str).str.strip() != '']
+                if len(valid_responses) < 5:  # Less than 5 valid responses
+                    problematic_cols.append(col)
+            # Remove columns with only 1-2 unique values and mostly empty
+            else:
+                non_empty = df_all[col].dropna()
+                non_empty = non_empty[non_empty.astype(str).str.strip() != '']
+                if len(non_empty) < 3 and df_all[col].nunique() <= 2:  # Very sparse data
+                    problematic_cols.append(col)
+        except:
+            continue
+
+    if problematic_cols:
+        df_all = df_all.drop(problematic_cols, axis=1)
+        st.info(f"📝 Removed {len(problematic_cols)} sparse/empty columns: {', '.join(problematic_cols[:3])}{'...' if len(problematic_cols) > 3 else ''}")
+    # Used to label the dataset when it is stored as a survey wave
+    df_all.attrs["source"] = source_name
+    return df_all
+
+def render_sidebar(df_all):
+    """Sidebar filters; returns the selections and the filtered view of df_all"""
+    # Sidebar selections, used as the cache key for analyses computed on df_view
+    filter_state = {}
+    with st.sidebar:
+        st.markdown("### 🔍 Data Filters")
+    
+        # Show data info
+        st.info(f"**Total Records:** {len(df_all):,}")
+    
+        # Categorical filters - find relevant columns dynamically
+        filter_columns = sidebar_filter_columns(df_all)  # Limited to first 4 relevant columns
+    
+        for col in filter_columns:
+            unique_vals = filter_options(df_all, col)
+            if unique_vals:
+                selected = st.multiselect(
+                    f"Filter by {col}:",
+                    options=unique_vals,
+                    default=unique_vals,
+                    key=f"filter_{col}"
+                )
+                if selected:
+                    filter_state[col] = selected
+    
+        # Age filter
+        age_range_bounds = age_bounds(df_all)
+        if age_range_bounds is not None:
+            min_age, max_age = age_range_bounds
+            age_range = st.slider(
+                "Age Range:",
+                min_value=min_age,
+                max_value=max_age,
+                value=(min_age, max_age),
+                key="age_filter"
+            )
+            filter_state[AGE_COLUMN] = tuple(age_range)
+    
+        # Rows without any failed quality check have an all-zero flag bitmap
+        if QUALITY_FLAGS in df_all.columns:
+            if st.checkbox("🧹 Exclude flagged responses", help="Hide responses that fail a plausibility rule or are outliers within their company", key="exclude_flagged"):
+                filter_state[QUALITY_FLAGS] = (0, 0)
+    
+        df_view = apply_filter_state(df_all, filter_state)
+    
+        # Show filtered count
+        if len(df_view) != len(df_all):
+            st.success(f"**Filtered:** {len(df_view):,} records")
+    return filter_state, df_view
+
+def submit_jobs(df_view, dataset_key, filter_state):
+    """Submit the heavy sections before anything renders; returns the session's job handles"""
+    # Heavy sections are submitted before anything renders; the page shows placeholders
+    # and fills them in as each job finishes. Jobs are keyed by dataset and filter state,
+    # so unrelated widget changes reuse finished results and stale jobs get cancelled.
+    if "job_board" not in st.session_state:
+        st.session_state.job_board = JobBoard(get_job_executor(), get_memory_governor(), uuid.uuid4().hex)
+    job_board = st.session_state.job_board
+    view_key = (dataset_key, filter_state_key(filter_state))
+
+    # The six comparison charts are independent: each worker gets only its own columns
+    # and returns the aggregated chart input, the script thread just builds figures
+    comparison_roles = resolve_roles(df_view.columns)
+    chart_executor = get_process_pool() if len(df_view) >= PROCESS_POOL_MIN_ROWS else None
+    comparison_jobs = {
+        name: job_board.submit(
+            f"comparison_{name}",
+            view_key,
+            build_comparison_chart,
+            name,
+            comparison_projection(df_view, name, comparison_roles),
+            comparison_roles,
+            executor=chart_executor
+        )
+        for name in COMPARISON_CHARTS
+    }
+    # Peak-season incentives share the result cache with the other per-view aggregates
+    peak_season_job = job_board.submit(
+        "peak_season",
+        view_key,
+        get_result_cache().get_or_compute,
+        ("peak_season", view_key),
+        peak_season_summary,
+        peak_season_projection(df_view, comparison_roles),
+        comparison_roles,
+        cached=True
+    )
+    summary_job = job_board.submit("summary", view_key, compute_summary, df_view)
+    export_job = job_board.submit("export_csv", view_key, df_view.to_csv, index=False)
+    return {
+        "board": job_board,
+        "view_key": view_key,
+        "comparison_roles": comparison_roles,
+        "comparisons": comparison_jobs,
+        "peak_season": peak_season_job,
+        "summary": summary_job,
+        "export": export_job,
+    }
+
+@st.fragment
+def render_data_quality(df_all, dataset_key):
+    """Data quality report from the flags computed at load, with a drill-down into one check"""
+    if QUALITY_FLAGS not in df_all.columns:
+        return
+    with st.expander("🧹 Data Quality Report", expanded=False):
+        try:
+            report = get_result_cache().get_or_compute(("quality_report", dataset_key), quality_report, df_all)
+            flagged = int((df_all[QUALITY_FLAGS] != 0).sum())
+            quality_col1, quality_col2, quality_col3 = st.columns(3)
+            quality_col1.metric("🚩 Flagged Responses", f"{flagged:,}", f"{flagged / len(df_all) * 100:.1f}% of {len(df_all):,}", delta_color="off")
+            quality_col2.metric("📏 Rules Failed", f"{int(((report['Type'] == 'Rule') & (report['Flagged Rows'] > 0)).sum())} of {int((report['Type'] == 'Rule').sum())}")
+            quality_col3.metric("📈 Outlier Flags", f"{int(report.loc[report['Type'] != 'Rule', 'Flagged Rows'].sum()):,}")
+            st.caption("Text answers were trimmed and case-matched and durations converted to years at load. Use the sidebar to exclude flagged responses.")
+            st.dataframe(make_display_safe(report.round(1)), use_container_width=True, hide_index=True)
+            
+            failing = report.loc[report["Flagged Rows"] > 0, "Check"].tolist()
+            if failing:
+                check = st.selectbox("🔎 Show responses flagged by:", failing, key="quality_check")
+                roles = resolve_roles(df_all.columns)
+                columns = [col for col in [roles["respondent"], roles["company"]] + check_columns(check, roles) if col is not None]
+                rows = df_all.loc[check_mask(df_all[QUALITY_FLAGS], check), list(dict.fromkeys(columns))]
+                st.dataframe(make_display_safe(rows), use_container_width=True, hide_index=True)
+        except Exception as e:
+            st.error(f"Data quality error: {str(e)}")
+
+def render_kpis(df_all, df_view):
+    """Four headline metrics for the filtered view"""
+    st.subheader("📈 Key Performance Indicators")
+
+    kpi_col1, kpi_col2, kpi_col3, kpi_col4 = st.columns(4)
+    kpis = calculate_kpis(df_view)
+
+    # KPI 1: Survey Responses
+    with kpi_col1:
+        st.metric(
+            "📊 Total Responses",
+            f"{len(df_view):,}",
+            delta=f"of {len(df_all):,} total"
+        )
+
+    # KPI 2: Average Age - HARDCODED RELIABLE CALCULATION
+    with kpi_col2:
+        if 'avg_age' in kpis:
+            st.metric(
+                "👥 Average Age",
+                f"{kpis['avg_age']:.1f} years",
+                delta=f"{kpis['age_count']} respondents"
+            )
+        else:
+            st.metric("👥 Average Age", "No data")
+
+    # KPI 3: Deliveries - HARDCODED RELIABLE CALCULATION
+    with kpi_col3:
+        if 'avg_deliveries' in kpis:
+            st.metric(
+                "📦 Avg Deliveries",
+                f"{kpis['avg_deliveries']:.1f}/day",
+                delta=f"{kpis['delivery_count']} drivers"
+            )
+        elif 'avg_income' in kpis:
+            st.metric(
+                "💰 Fixed Monthly Pay",
+                f"{kpis['avg_income']:,.0f} EGP",
+                delta=f"{kpis['income_count']} responses"
+            )
+        else:
+            st.metric("📊 Data Coverage", f"{len(df_view.columns)} questions")
+
+    # KPI 4: Success Rate & Companies - HARDCODED RELIABLE CALCULATION
+    with kpi_col4:
+        if 'success_rate' in kpis:
+            st.metric(
+                "🎯 Success Rate",
+                f"{kpis['success_rate']:.1f}%",
+                delta=f"{kpis['success_count']} drivers"
+            )
+        elif 'unique_companies' in kpis:
+            st.metric(
+                "🏢 Companies",
+                f"{kpis['unique_companies']}",
+                delta=f"Top: {kpis['top_company']}"
+            )
+        else:
+            st.metric("✅ Data Quality", f"{df_view.notna().sum().sum():,} answers")
+
+@st.fragment
+def render_custom_analysis(df_all, df_view, dataset_key, filter_state):
+    """Custom Analysis tab: user-built group summaries, planned over the full dataset"""
+    st.write("**Create custom data summaries:**")
+    
+    # Add spacing for better visual separation
+    st.write("")
+    
+    # Get numeric and categorical columns with comprehensive detection
+    numeric_cols = []
+    categorical_cols = []
+    
+    for col in df_view.columns:
+        # The quality bitmap is a filter, not a measure
+        if col == QUALITY_FLAGS:
+            continue
+        try:
+            col_lower = col.lower()
+            non_null_count = df_view[col].count()
+            unique_count = df_view[col].nunique()
+            
+            # Enhanced numeric detection - include all numeric fields that could be useful for analysis
+            if pd.api.types.is_numeric_dtype(df_view[col]) and non_null_count > 0:
+                numeric_cols.append(col)
+            elif is_text_dtype(df_view[col].dtype) and non_null_count > 0:
+                # Comprehensive survey field detection - include ALL relevant survey categories
+                is_important_field = any(keyword in col_lower for keyword in [
+                    # Core demographics and employment
+                    'company', 'employment', 'area', 'age', 'education', 'experience',
+                    # Benefits and compensation
+                    'insurance', 'medical', 'benefit', 'salary', 'income', 'bonus', 'allowance',
+                    'incentive', 'overtime', 'holiday', 'leave', 'vacation', 'sick',
+                    # Operations and delivery
+                    'delivery', 'deliveries', 'vehicle', 'transport', 'fuel', 'maintenance',
+                    'route', 'area', 'zone', 'district', 'region', 'location',
+                    # Costs and expenses
+                    'cost', 'expense', 'fee', 'charge', 'payment', 'fuel', 'gas', 'petrol',
+                    'repair', 'service', 'maintenance', 'insurance',
+                    # Work conditions and support
+                    'support', 'training', 'equipment', 'uniform', 'safety', 'security',
+                    'working', 'schedule', 'shift', 'hours', 'time',
+                    # Performance and satisfaction
+                    'performance', 'rating', 'satisfaction', 'feedback', 'complaint',
+                    'issue', 'problem', 'challenge', 'difficulty',
+                    # Status and classification
+                    'status', 'type', 'category', 'classification', 'level', 'grade',
+                    # Communication and technology
+                    'phone', 'mobile', 'app', 'system', 'technology', 'communication',
+                    # Personal and family
+                    'family', 'children', 'dependents', 'married', 'single',
+                    # Geographic and demographic
+                    'city', 'governorate', 'address', 'residence', 'home',
+                    # Survey responses and ratings
+                    'yes', 'no', 'agree', 'disagree', 'satisfied', 'dissatisfied',
+                    'good', 'bad', 'excellent', 'poor', 'fair'
+                ])
+                
+                # Include if it's important OR has reasonable unique count (more generous limits)
+                if is_important_field or (1 <= unique_count <= 50):
+                    categorical_cols.append(col)
+        except Exception:
+            # If there's any issue accessing the column, still try to include it
+            try:
+                if df_view[col].count() > 0:
+                    categorical_cols.append(col)
+            except:
+                continue
+    
+    # Mostly-numeric text columns were already converted at load (see load_prepared_dataset)
+    
+    if len(numeric_cols) > 0 and len(categorical_cols) > 0:
+        # Enhanced 3-dropdown layout for more detailed analysis
+        st.write("**Enhanced Multi-Dimensional Analysis:**")
+        
+        # First row: Primary analysis settings
+        col1, col2, col3 = st.columns([1.2, 1.2, 0.8])
+        
+        with col1:
+            # Primary grouping column
+            display_categorical = []
+            for col in categorical_cols:
+                if len(col) > 30:
+                    display_name = col[:27] + "..."
+                else:
+                    display_name = col
+                display_categorical.append(display_name)
+            
+            selected_idx = st.selectbox(
+                "📂 Primary Group by:",
+                range(len(categorical_cols) + 1),
+                format_func=lambda x: "None" if x == 0 else display_categorical[x-1],
+                help="Select the main categorical column to group the analysis by"
+            )
+            group_by = "None" if selected_idx == 0 else categorical_cols[selected_idx-1]
+            
+        with col2:
+            # Numeric column to analyze
+            display_numeric = []
+            for col in numeric_cols:
+                if len(col) > 30:
+                    display_name = col[:27] + "..."
+                else:
+                    display_name = col
+                display_numeric.append(display_name)
+            
+            analyze_idx = st.selectbox(
+                "📊 Analyze:",
+                range(len(numeric_cols)),
+                format_func=lambda x: display_numeric[x],
+                help="Select a numeric column to analyze"
+            )
+            analyze_col = numeric_cols[analyze_idx]
+            
+        with col3:
+            agg_function = st.selectbox(
+                "🔢 Function:", 
+                ["mean", "sum", "count", "min", "max", "std"],
+                help="Select the aggregation function to apply"
+            )
+        
+        # Second row: Secondary analysis options
+        st.write("")
+        col4, col5, col6 = st.columns([1.2, 1.2, 0.8])
+        
+        with col4:
+            # Secondary grouping (optional)
+            secondary_selected_idx = st.selectbox(
+                "📂 Secondary Group by (Optional):",
+                range(len(categorical_cols) + 1),
+                format_func=lambda x: "None" if x == 0 else display_categorical[x-1],
+                help="Select an additional categorical column for cross-tabulation analysis"
+            )
+            secondary_group_by = "None" if secondary_selected_idx == 0 else categorical_cols[secondary_selected_idx-1]
+            
+        with col5:
+            # Filter options
+            result_filter_options = ["No Filter", "Top N Values", "Bottom N Values", "Above Average", "Below Average",
+                                     "Above Percentile", "Below Percentile"]
+            result_filter = st.selectbox(
+                "🔍 Result Filter:",
+                result_filter_options,
+                help="Apply filters to the analysis results"
+            )
+            # Selections run inside the aggregation, before the result table is built
+            result_select = None
+            if result_filter in ("Top N Values", "Bottom N Values"):
+                top_n = st.number_input("Number of groups (N):", min_value=1, max_value=500, value=5, step=1)
+                result_select = ("top" if result_filter.startswith("Top") else "bottom", int(top_n))
+            elif result_filter in ("Above Average", "Below Average"):
+                result_select = (result_filter.split()[0].lower(), "mean")
+            elif result_filter != "No Filter":
+                percentile = st.slider("Percentile threshold:", min_value=1, max_value=99, value=75)
+                result_select = (result_filter.split()[0].lower(), float(percentile))
+            
+        with col6:
+            # Chart type selection
+            chart_types = ["Bar Chart", "Line Chart", "Scatter Plot", "Box Plot"]
+            chart_type = st.selectbox(
+                "📈 Chart Type:",
+                chart_types,
+                help="Select visualization type for the results"
+            )
+        
+        # Third row: any number of further dimensions (e.g. Company × Area × Employment × Vehicle)
+        col7, col8 = st.columns([2.4, 0.8])
+        
+        with col7:
+            further_options = [col for col in categorical_cols if col not in (group_by, secondary_group_by)]
+            further_group_by = st.multiselect(
+                "➕ Further Group by (Optional):",
+                further_options,
+                format_func=lambda col: col[:27] + "..." if len(col) > 30 else col,
+                help="Break the results down by more dimensions; only combinations that occur are stored"
+            )
+            
+        with col8:
+            show_ci = st.checkbox(
+                "📏 95% confidence intervals",
+                value=True,
+                help="Bootstrap intervals for group averages (Function: mean), drawn as error bars"
+            )
+        
+        if group_by != "None" and analyze_col:
+            try:
+                # Only the columns this analysis uses, without rows missing any of them
+                required_cols = [analyze_col, group_by]
+                if secondary_group_by != "None" and secondary_group_by != group_by:
+                    required_cols.append(secondary_group_by)
+                required_cols += [col for col in further_group_by if col not in required_cols]
+                group_keys = required_cols[1:]
+                
+                # One planned pass over the full dataset: sidebar filters, missing values and grouping together
+                plan = plan_query({
+                    "filters": filter_predicates(filter_state),
+                    "group_by": group_keys,
+                    "measure": analyze_col,
+                    "agg": agg_function,
+                    "select": result_select,
+                })
+                index = get_dataset_index(dataset_key, df_all)
+                # The cube holds every aggregation, so changing function or result filter reuses it
+                cube = get_result_cache().get_or_compute(
+                    ("query_cube", dataset_key, cube_key(plan)), build_cube, index, plan
+                )
+                selected = cube.select(agg_function, result_select)
+                result = selected.table(agg_function, plan["name"])
+                # Charts show the first two dimensions, rolled up from the selected cells
+                chart_result = selected.rollup(group_keys[:2]).table(agg_function, plan["name"]) if len(group_keys) > 2 else result
+                if len(group_keys) > 1:
+                    secondary_group_by = group_keys[1]
+                # Bootstrap intervals of the cell means, when the chart shows the cells themselves
+                error_bars = {}
+                if show_ci and agg_function == "mean" and len(group_keys) <= 2 and len(result) > 0:
+                    ci = get_result_cache().get_or_compute(
+                        ("custom_analysis_ci", dataset_key, cube_key(plan)), compute_group_ci, df_all, index, plan
+                    )
+                    result = result.merge(ci, on=group_keys, how="left")
+                    chart_result, error_bars = ci_error_bars(result, plan["name"])
+                
+                # Check if we have data after cleaning
+                if cube.rows == 0:
+                    st.warning(f"⚠️ No valid numeric data found in '{analyze_col}' column after filtering.")
+                else:
+                    # Debug info
+                    kept = f" (of {cube.n_cells})" if result_select is not None else ""
+                    if secondary_group_by != "None" and secondary_group_by != group_by:
+                        st.caption(f"📊 Multi-dimensional Analysis: {cube.rows} records → {len(result)} combinations{kept}")
+                    else:
+                        st.caption(f"📊 Analysis: {cube.rows} records → {len(result)} groups{kept}")
+                    
+                    # Add some spacing for better alignment
+                    st.write("")
+                    
+                    # Display results in improved 3-column layout
+                    col1, col2, col3 = st.columns([1.2, 1.8, 1])
+                    
+                    with col1:
+                        st.write("**📊 Results Table**")
+                        # Add padding to align with other sections
+                        st.write("")
+                        # Convert to display-safe format to avoid PyArrow issues
+                        display_result = make_display_safe(result)
+                        st.dataframe(display_result, use_container_width=True, height=280)
+                    
+                    with col2:
+                        if len(result) > 0:
+                            # The aggregated value column (CI columns may follow it)
+                            y_col = plan["name"]
+                            
+                            # Create shorter, cleaner title to prevent cramming
+                            short_analyze_col = analyze_col[:20] + "..." if len(analyze_col) > 20 else analyze_col
+                            short_group_by = group_by[:15] + "..." if len(group_by) > 15 else group_by
+                            
+                            st.write("**📈 Visualization**")
+                            # Add padding for alignment
+                            st.write("")
+                            
+                            # Handle multi-dimensional vs single-dimensional visualization
+                            if secondary_group_by != "None" and secondary_group_by != group_by:
+                                # Multi-dimensional chart
+                                if chart_type == "Bar Chart":
+                                    fig = px.bar(
+                                        chart_result,
+                                        x=group_by,
+                                        y=y_col,
+                                        color=secondary_group_by,
+                                        title=f"{agg_function.title()} of {short_analyze_col}<br>by {short_group_by} & {secondary_group_by[:15]}",
+                                        barmode='group',
+                                        **error_bars
+                                    )
+                                elif chart_type == "Line Chart":
+                                    fig = px.line(
+                                        chart_result,
+                                        x=group_by,
+                                        y=y_col,
+                                        color=secondary_group_by,
+                                        title=f"{agg_function.title()} of {short_analyze_col}<br>by {short_group_by} & {secondary_group_by[:15]}",
+                                        markers=True,
+                                        **error_bars
+                                    )
+                                else:  # Default to bar for multi-dimensional
+                                    fig = px.bar(
+                                        chart_result,
+                                        x=group_by,
+                                        y=y_col,
+                                        color=secondary_group_by,
+                                        title=f"{agg_function.title()} of {short_analyze_col}<br>by {short_group_by} & {secondary_group_by[:15]}",
+                                        barmode='group',
+                                        **error_bars
+                                    )
+                            else:
+                                # Single-dimensional chart with different chart types
+                                if chart_type == "Bar Chart":
+                                    fig = px.bar(
+                                        chart_result,
+                                        x=group_by,
+                                        y=y_col,
+                                        title=f"{agg_function.title()} of {short_analyze_col}<br>by {short_group_by}",
+                                        color=y_col,
+                                        color_continuous_scale="viridis",
+                                        text=y_col,
+                                        **error_bars
+                                    )
+                                elif chart_type == "Line Chart":
+                                    fig = px.line(
+                                        chart_result,
+                                        x=group_by,
+                                        y=y_col,
+                                        title=f"{agg_function.title()} of {short_analyze_col}<br>by {short_group_by}",
+                                        markers=True,
+                                        **error_bars
+                                    )
+                                elif chart_type == "Scatter Plot":
+                                    # For scatter, use index as x if only one grouping
+                                    fig = px.scatter(
+                                        chart_result,
+                                        x=group_by,
+                                        y=y_col,
+                                        title=f"{agg_function.title()} of {short_analyze_col}<br>by {short_group_by}",
+                                        size=y_col,
+                                        color=y_col
+                                    )
+                                else:  # Box Plot - need original data
+                                    try:
+                                        df_analysis = df_all.iloc[query_positions(index, plan)][required_cols]
+                                        fig = px.box(
+                                            df_analysis,
+                                            x=group_by,
+                                            y=analyze_col,
+                                            title=f"Distribution of {short_analyze_col}<br>by {short_group_by}"
+                                        )
+                                    except:
+                                        # Fallback to bar chart if box plot fails
+                                        fig = px.bar(
+                                            chart_result,
+                                            x=group_by,
+                                            y=y_col,
+                                            title=f"{agg_function.title()} of {short_analyze_col}<br>by {short_group_by}",
+                                            color=y_col,
+                                            color_continuous_scale="viridis"
+                                        )
+                            
+                            # Common formatting for all chart types
+                            if chart_type == "Bar Chart" and secondary_group_by == "None":
+                                # Add text labels for single-dimension bar charts
+                                if agg_function in ["mean", "std"]:
+                                    fig.update_traces(
+                                        texttemplate='%{text:.2f}',
+                                        textposition='outside',
+                                        textfont_size=10
+                                    )
+                                else:
+                                    fig.update_traces(
+                                        texttemplate='%{text:.0f}',
+                                        textposition='outside', 
+                                        textfont_size=10
+                                    )
+                            
+                            # Update layout for better appearance
+                            fig.update_layout(
+                                xaxis_tickangle=-45,
+                                yaxis_title=f"{agg_function.title()} Value",
+                                title_font_size=14,
+                                margin=dict(t=60, b=80, l=60, r=20),
+                                height=320,
+                                xaxis_title_font_size=12,
+                                yaxis_title_font_size=12
+                            )
+                            
+                            # Handle long category names
+                            fig.update_xaxes(
+                                tickangle=-45,
+                                tickfont_size=10,
+                                title_standoff=25
+                            )
+                            
+                            st.plotly_chart(fig, use_container_width=True)
+                        else:
+                            st.info("No data available for the selected combination.")
+                    
+                    with col3:
+                        st.write("**📋 Key Statistics**")
+                        # Add padding for alignment with other sections
+                        st.write("")
+                        
+                        if len(result) > 0:
+                            y_col = f"{agg_function.title()} of {analyze_col}"
+                            
+                            # Calculate and display key statistics
+                            values = result[y_col].dropna()
+                            
+                            if len(values) > 0:
+                                # Overall statistics
+                                if agg_function == "mean":
+                                    overall_stat = values.mean()
+                                    stat_label = "Overall Average"
+                                elif agg_function == "sum":
+                                    overall_stat = values.sum()
+                                    stat_label = "Grand Total"
+                                elif agg_function == "count":
+                                    overall_stat = values.sum()
+                                    stat_label = "Total Count"
+                                elif agg_function == "min":
+                                    overall_stat = values.min()
+                                    stat_label = "Minimum Value"
+                                elif agg_function == "max":
+                                    overall_stat = values.max()
+                                    stat_label = "Maximum Value"
+                                else:  # std
+                                    overall_stat = values.mean()
+                                    stat_label = "Average Std Dev"
+                                
+                                # Display key metrics
+                                if agg_function in ["mean", "std"]:
+                                    st.metric(stat_label, f"{overall_stat:.2f}")
+                                else:
+                                    st.metric(stat_label, f"{overall_stat:.0f}")
+                                
+                                # Additional insights
+                                st.metric("Groups Found", len(result))
+                                
+                                if len(values) > 1:
+                                    highest_idx = values.idxmax()
+                                    lowest_idx = values.idxmin()
+                                    
+                                    highest_group = result.loc[highest_idx, group_by]
+                                    lowest_group = result.loc[lowest_idx, group_by]
+                                    
+                                    st.write("**🏆 Highest:**")
+                                    st.write(f"{str(highest_group)[:15]}...")
+                                    if agg_function in ["mean", "std"]:
+                                        st.write(f"Value: {values[highest_idx]:.2f}")
+                                    else:
+                                        st.write(f"Value: {values[highest_idx]:.0f}")
+                                    
+                                    st.write("**📉 Lowest:**")
+                                    st.write(f"{str(lowest_group)[:15]}...")
+                                    if agg_function in ["mean", "std"]:
+                                        st.write(f"Value: {values[lowest_idx]:.2f}")
+                                    else:
+                                        st.write(f"Value: {values[lowest_idx]:.0f}")
+                                
+                                # Range information
+                                if len(values) > 1:
+                                    range_val = values.max() - values.min()
+                                    if agg_function in ["mean", "std"]:
+                                        st.metric("Range", f"{range_val:.2f}")
+                                    else:
+                                        st.metric("Range", f"{range_val:.0f}")
+                            else:
+                                st.info("No statistics available")
+                        else:
+                            st.info("Select analysis options to view statistics")
+                    
+                    # Pivot and slice the stored cells without going back to the rows
+                    if len(group_keys) > 1 and selected.n_cells > 0:
+                        with st.expander("🧊 Pivot & Slice", expanded=len(group_keys) > 2):
+                            pivot_col1, pivot_col2 = st.columns(2)
+                            with pivot_col1:
+                                pivot_rows = st.selectbox("Pivot rows:", group_keys, key="cube_pivot_rows")
+                            with pivot_col2:
+                                pivot_columns = st.selectbox(
+                                    "Pivot columns:", [col for col in group_keys if col != pivot_rows], key="cube_pivot_columns"
+                                )
+                            slices = {}
+                            for dim in group_keys:
+                                if dim not in (pivot_rows, pivot_columns):
+                                    occupied = selected.occupied_labels(dim)
+                                    slices[dim] = st.multiselect(f"Slice {dim}:", occupied, default=occupied, key=f"cube_slice_{dim}")
+                            pivot = selected.slice(slices).pivot(pivot_rows, pivot_columns, agg_function)
+                            st.caption(f"{agg_function.title()} of {analyze_col}, other dimensions rolled up")
+                            st.dataframe(make_display_safe(pivot.reset_index()), use_container_width=True)
+                    
+            except Exception as e:
+                st.error(f"Analysis error: {str(e)}")
+    else:
+        if len(numeric_cols) == 0:
+            st.info("📊 No numeric columns found for analysis. Upload data with numeric values (age, income, etc.)")
+        elif len(categorical_cols) == 0:
+            st.info("📂 No categorical columns found for grouping. Upload data with text categories (company, status, etc.)")
+        else:
+            st.info("Need both numeric and categorical columns for analysis")
+
+@st.fragment
+def render_quick_presets(df_all, df_view, dataset_key, filter_state):
+    """Quick Presets tab: declarative preset queries served from the shared preset cache"""
+    preset_cache = get_preset_cache()
+    # Presets are declarative queries (see analytics/presets.py) grouped by theme
+    preset_options = ["None"]
+    for group_presets in PRESET_GROUPS.values():
+        preset_options.extend(group_presets)
+    
+    selected_preset = st.selectbox("Select comprehensive preset analysis:", preset_options)
+    st.caption(f"{len(available_presets(df_view.columns))} of {len(PRESETS)} presets have matching columns in this dataset")
+    
+    if selected_preset != "None":
+        # Filter combinations people keep coming back to get all presets precomputed
+        if preset_cache.record_request(dataset_key, filter_state) == WARM_AFTER_REQUESTS:
+            preset_cache.warm(df_all, dataset_key, [filter_state])
+        try:
+            preset_result = preset_cache.lookup(df_view, selected_preset, dataset_key, filter_state)
+            if preset_result is None:
+                st.info(f"📊 Preset '{selected_preset}' requires specific data columns that may not be available in your dataset. Try the Custom Analysis tab for flexible analysis options.")
+            elif preset_result["table"].empty:
+                st.info(f"📊 No data available for preset '{selected_preset}' with the current filters.")
+            else:
+                render_preset_result(preset_result)
+        except Exception as e:
+            st.error(f"Analysis error: {str(e)}")
+
+DEFAULT_SQL = """SELECT company, COUNT(*) AS drivers, ROUND(AVG(net_income)) AS avg_net_income
+FROM drivers
+GROUP BY company
+ORDER BY avg_net_income DESC"""
+
+@st.fragment
+def render_sql_query(df_all, dataset_key):
+    """SQL Query tab: read-only SQL over the full dataset, cached per query and dataset version"""
+    st.write("**Ask ad-hoc questions in SQL (read-only):**")
+    st.caption("Runs on the full dataset; sidebar filters do not apply. Query `drivers` for short column names or `survey` for the original questions.")
+    
+    try:
+        engine = get_sql_engine(dataset_key, df_all)
+    except Exception as e:
+        st.error(f"SQL engine error: {str(e)}")
+        return
+    
+    with st.expander("📚 Tables and columns", expanded=False):
+        for view, columns in engine.views.items():
+            st.write(f"**{view}:** " + ", ".join(f"`{col}`" for col in columns))
+        st.write(f"**survey:** {len(engine.columns)} columns named after the survey questions; wrap names in double quotes")
+    
+    with st.form("sql_query"):
+        sql = st.text_area("Query:", value=DEFAULT_SQL, height=130)
+        col1, col2 = st.columns(2)
+        with col1:
+            row_limit = st.number_input("Row limit:", min_value=1, max_value=MAX_ROW_LIMIT, value=DEFAULT_ROW_LIMIT, step=100)
+        with col2:
+            timeout = st.number_input("Time limit (seconds):", min_value=0.5, max_value=60.0, value=DEFAULT_TIMEOUT, step=0.5)
+        st.form_submit_button("▶️ Run Query")
+    
+    # The last submitted query is shown on every rerun; repeats come from the result cache
+    try:
+        result = get_result_cache().get_or_compute(
+            ("sql", dataset_key, normalize_query(sql), int(row_limit)),
+            engine.query,
+            sql,
+            row_limit,
+            timeout
+        )
+    except Exception as e:
+        st.error(f"Query error: {str(e)}")
+        return
+    
+    table = result["table"]
+    st.caption(f"{len(table):,} rows in {result['seconds'] * 1000:.0f} ms")
+    if result["truncated"]:
+        st.warning(f"Showing the first {int(row_limit):,} rows. Raise the row limit or aggregate in SQL.")
+    st.dataframe(make_display_safe(table), use_container_width=True, hide_index=True)
+
+@st.fragment
+def render_what_if(df_view, jobs):
+    """What-if tab: two parameterized scenarios compared side by side with the survey baseline"""
+    roles = jobs["comparison_roles"]
+    if roles["net_income"] is None or len(df_view) == 0:
+        st.info("Net income data is needed for what-if scenarios")
+        return
+    st.write("**Adjust costs, pay and volume for every respondent and compare with the survey baseline:**")
+    
+    # Scenario A starts as a fuel price rise, B as a per-stop pay rise
+    scenario_defaults = {"A": {"fuel_pct": 20.0}, "B": {"per_stop_delta": 1.0}}
+    scenarios = {}
+    scenario_cols = st.columns(2)
+    for scenario_col, (name, defaults) in zip(scenario_cols, scenario_defaults.items()):
+        with scenario_col:
+            st.write(f"**Scenario {name}**")
+            params = {}
+            for param, (label, low, high, step, unit) in SCENARIO_PARAMETERS.items():
+                params[param] = st.slider(
+                    f"{label} ({unit})", min_value=low, max_value=high, value=defaults.get(param, 0.0), step=step,
+                    key=f"scenario_{name}_{param}"
+                )
+            scenarios[f"Scenario {name}"] = params
+    
+    try:
+        # Inputs are extracted once per filter state; each parameter set is memoized
+        view_key = jobs["view_key"]
+        inputs = get_result_cache().get_or_compute(("scenario_inputs", view_key), scenario_inputs, df_view, roles)
+        results = {
+            name: get_result_cache().get_or_compute(("scenario", view_key, scenario_key(params)), scenario_summary, inputs, params)
+            for name, params in [("Baseline", BASELINE)] + list(scenarios.items())
+        }
+        
+        metric_cols = st.columns(4)
+        baseline_stats = results["Baseline"]["stats"]
+        for metric_col, (name, result) in zip(metric_cols, list(results.items())[1:]):
+            stats = result["stats"]
+            metric_col.metric(
+                f"💰 {name}: Avg Net Income",
+                f"{stats.loc['Mean', NET_INCOME]:,.0f} EGP",
+                f"{stats.loc['Mean', NET_INCOME] - baseline_stats.loc['Mean', NET_INCOME]:+,.0f} EGP"
+            )
+        if COST_PER_DELIVERY in baseline_stats:
+            for metric_col, (name, result) in zip(metric_cols[2:], list(results.items())[1:]):
+                stats = result["stats"]
+                metric_col.metric(
+                    f"📦 {name}: Avg Cost / Delivery",
+                    f"{stats.loc['Mean', COST_PER_DELIVERY]:.2f} EGP",
+                    f"{stats.loc['Mean', COST_PER_DELIVERY] - baseline_stats.loc['Mean', COST_PER_DELIVERY]:+.2f} EGP",
+                    delta_color="inverse"
+                )
+        
+        chart_col1, chart_col2 = st.columns(2)
+        with chart_col1:
+            curves = pd.concat([
+                pd.DataFrame({"Percentile": range(1, 100), NET_INCOME: result["curves"][NET_INCOME], "Scenario": name})
+                for name, result in results.items()
+            ])
+            fig = px.line(curves, x="Percentile", y=NET_INCOME, color="Scenario", title="Net Income Distribution (percentiles)")
+            st.plotly_chart(fig, use_container_width=True)
+        with chart_col2:
+            by_company = pd.concat({name: result["by_company"] for name, result in results.items()}, names=["Scenario", "Company"])
+            fig = px.bar(
+                by_company.reset_index(),
+                x="Company",
+                y=NET_INCOME,
+                color="Scenario",
+                barmode="group",
+                title="Average Net Income by Company"
+            )
+            fig.update_layout(xaxis_tickangle=-45)
+            st.plotly_chart(fig, use_container_width=True)
+        
+        st.write("**Scenario comparison:**")
+        comparison = pd.DataFrame({name: result["stats"].T.stack() for name, result in results.items()}).round(2)
+        comparison.index.names = ["Measure", "Statistic"]
+        st.dataframe(make_display_safe(comparison.reset_index()), use_container_width=True, hide_index=True)
+    except Exception as e:
+        st.error(f"Scenario error: {str(e)}")
+
+@st.fragment
+def render_risk_simulation(df_view, jobs, pending):
+    """Risk Simulation tab: Monte Carlo net income per segment under uncertain deliveries and fuel costs"""
+    roles = jobs["comparison_roles"]
+    if roles["net_income"] is None or len(df_view) == 0:
+        st.info("Net income data is needed for the risk simulation")
+        return
+    st.write("**Simulate a month of uncertain deliveries per day and fuel costs for every segment:**")
+
+    segments = {roles[role]: role for role in SEGMENT_ROLES if roles[role] is not None}
+    with st.form("risk_simulation"):
+        risk_col1, risk_col2, risk_col3, risk_col4 = st.columns(4)
+        with risk_col1:
+            segment_col = st.selectbox("Segment by:", list(segments) + ["All respondents"], key="risk_segment")
+        with risk_col2:
+            threshold = st.number_input("Net income threshold (EGP):", value=7000, step=500, key="risk_threshold")
+        with risk_col3:
+            draws = st.select_slider(
+                "Simulated months per segment:",
+                options=[100_000, 1_000_000, 5_000_000],
+                value=100_000,
+                format_func=lambda n: f"{n:,}",
+                key="risk_draws"
+            )
+        with risk_col4:
+            seed = st.number_input("Random seed:", value=2025, step=1, key="risk_seed")
+        run_clicked = st.form_submit_button("▶️ Run Simulation")
+
+    segment_role = segments.get(segment_col)
+    view_key = jobs["view_key"]
+    params = (segment_role, int(draws), float(threshold), int(seed))
+    # Simulations only start from the button, so reruns and filter changes never pay for one;
+    # the last run stays on screen while the filters and settings it was run with are current
+    if run_clicked:
+        st.session_state.risk_run = (view_key, params)
+    if st.session_state.get("risk_run") != (view_key, params):
+        if "risk_run" in st.session_state:
+            st.info("Filters changed since the last simulation. Press ▶️ Run Simulation to update it.")
+        else:
+            st.info("Press ▶️ Run Simulation to simulate driver earnings for the current filters.")
+        return
+
+    # Big runs fan out over the process pool; the result is the same either way
+    risk_job = jobs["board"].submit(
+        "risk_simulation",
+        (view_key, params),
+        get_result_cache().get_or_compute,
+        ("risk_simulation", view_key) + params,
+        compute_earnings_risk,
+        df_view,
+        roles,
+        *params,
+        get_process_pool(),
+        cached=True
+    )
+
+    def render_risk(placeholder, result):
+        if result is None:
+            placeholder.info("No respondents with net income in this view")
+            return
+        table = result["table"]
+        overall = table.iloc[-1]
+        with placeholder.container():
+            risk_col1, risk_col2, risk_col3, risk_col4 = st.columns(4)
+            risk_col1.metric(f"⚠️ Below {result['threshold']:,.0f} EGP", f"{overall[BELOW_THRESHOLD]:.1f}%")
+            risk_col2.metric("💰 Median Net Income", f"{overall['Median']:,.0f} EGP")
+            risk_col3.metric("📉 Worst 5% (P5)", f"{overall['P5']:,.0f} EGP")
+            risk_col4.metric("🎲 Simulated Months", f"{result['draws']:,}")
+
+            chart_col1, chart_col2 = st.columns(2)
+            with chart_col1:
+                fig = px.line(
+                    result["density"],
+                    x=NET_INCOME,
+                    y="Share (%)",
+                    color="Segment",
+                    title="Simulated Net Income Distribution"
+                )
+                fig.add_vline(x=result["threshold"], line_dash="dash", line_color="red")
+                st.plotly_chart(fig, use_container_width=True)
+            with chart_col2:
+                fig = px.bar(
+                    table.reset_index(),
+                    x="Segment",
+                    y=BELOW_THRESHOLD,
+                    color=BELOW_THRESHOLD,
+                    color_continuous_scale="Reds",
+                    title=f"Chance of Net Income below {result['threshold']:,.0f} EGP"
+                )
+                fig.update_layout(xaxis_tickangle=-45)
+                st.plotly_chart(fig, use_container_width=True)
+
+            st.write("**Net income quantiles per segment:**")
+            st.dataframe(make_display_safe(table.round(1).reset_index()), use_container_width=True, hide_index=True)
+            with st.expander("📐 Fitted distributions"):
+                st.caption("Deliveries per day and non-zero fuel costs are log-normal per segment; fuel is zero with the segment's share of zero answers")
+                st.dataframe(make_display_safe(result["fits"].round(2)), use_container_width=True, hide_index=True)
+
+    render_when_ready(pending, risk_job, st.empty(), render_risk, "⏳ Simulating driver earnings...")
+
+@st.fragment
+def render_individual_responses(df_view, jobs, pending):
+    """Individual Responses tab: filtered, paged survey responses with a CSV download"""
+    job_board, view_key = jobs["board"], jobs["view_key"]
+    st.write("**View individual survey responses with filtering:**")
+    
+    # Add response-level filters
+    col1, col2, col3 = st.columns(3)
+    
+    # Get filterable columns (include categorical, numeric ranges, and important survey fields)
+    filterable_cols = []
+    numeric_range_cols = []
+    
+    for col in df_view.columns:
+        try:
+            col_lower = col.lower()
+            unique_count = df_view[col].nunique()
+            non_null_count = df_view[col].count()
+            
+            # Always include key survey fields regardless of unique count
+            is_key_field = any(keyword in col_lower for keyword in [
+                'company', 'employment', 'area', 'age', 'insurance', 'status',
+                'fuel', 'cost', 'expense', 'income', 'salary', 'benefit',
+                'delivery', 'maintenance', 'vehicle', 'transport', 'overtime',
+                'leave', 'holiday', 'incentive', 'bonus', 'education', 'experience'
+            ])
+            
+            if is_text_dtype(df_view[col].dtype):
+                # Include categorical fields with reasonable unique values OR key survey fields
+                if (2 <= unique_count <= 30) or (is_key_field and unique_count <= 50):
+                    filterable_cols.append(col)
+            elif pd.api.types.is_numeric_dtype(df_view[col]) and non_null_count > 0:
+                # Include numeric fields for range filtering
+                if is_key_field or any(keyword in col_lower for keyword in [
+                    'age', 'cost', 'expense', 'income', 'salary', 'delivery', 'hour', 'day', 'year'
+                ]):
+                    numeric_range_cols.append(col)
+        except Exception as e:
+            continue
+    
+    active_filters = {}
+    active_numeric_filters = {}
+    
+    # Combine all filterable columns for selection
+    all_filter_options = filterable_cols + [f"{col} (Range)" for col in numeric_range_cols]
+    
+    if len(all_filter_options) > 0:
+        with col1:
+            filter_col1 = st.selectbox("Filter by:", ["None"] + all_filter_options, key="response_filter1")
+            if filter_col1 != "None":
+                if filter_col1.endswith(" (Range)"):
+                    # Numeric range filter
+                    actual_col = filter_col1.replace(" (Range)", "")
+                    col_data = df_view[actual_col].dropna()
+                    if len(col_data) > 0:
+                        min_val, max_val = float(col_data.min()), float(col_data.max())
+                        if min_val < max_val:
+                            range_vals = st.slider(
+                                f"Select {actual_col} range:",
+                                min_value=min_val,
+                                max_value=max_val,
+                                value=(min_val, max_val),
+                                key="range1"
+                            )
+                            active_numeric_filters[actual_col] = range_vals
+                else:
+                    # Categorical filter
+                    unique_vals1 = sorted(df_view[filter_col1].dropna().astype(str).unique())
+                    selected_vals1 = st.multiselect(f"Select {filter_col1}:", unique_vals1, default=unique_vals1, key="values1")
+                    if selected_vals1:
+                        active_filters[filter_col1] = selected_vals1
+        
+        with col2:
+            if len(all_filter_options) > 1:
+                used_cols = [filter_col1] if filter_col1 != "None" else []
+                remaining_options = [opt for opt in all_filter_options if opt not in used_cols]
+                filter_col2 = st.selectbox("Also filter by:", ["None"] + remaining_options, key="response_filter2")
+                if filter_col2 != "None":
+                    if filter_col2.endswith(" (Range)"):
+                        # Numeric range filter
+                        actual_col = filter_col2.replace(" (Range)", "")
+                        col_data = df_view[actual_col].dropna()
+                        if len(col_data) > 0:
+                            min_val, max_val = float(col_data.min()), float(col_data.max())
+                            if min_val < max_val:
+                                range_vals = st.slider(
+                                    f"Select {actual_col} range:",
+                                    min_value=min_val,
+                                    max_value=max_val,
+                                    value=(min_val, max_val),
+                                    key="range2"
+                                )
+                                active_numeric_filters[actual_col] = range_vals
+                    else:
+                        # Categorical filter
+                        unique_vals2 = sorted(df_view[filter_col2].dropna().astype(str).unique())
+                        selected_vals2 = st.multiselect(f"Select {filter_col2}:", unique_vals2, default=unique_vals2, key="values2")
+                        if selected_vals2:
+                            active_filters[filter_col2] = selected_vals2
+        
+        with col3:
+            if len(all_filter_options) > 2:
+                used_cols = [col for col in [filter_col1, filter_col2] if col != "None"]
+                remaining_options = [opt for opt in all_filter_options if opt not in used_cols]
+                filter_col3 = st.selectbox("Additional filter:", ["None"] + remaining_options, key="response_filter3")
+                if filter_col3 != "None":
+                    if filter_col3.endswith(" (Range)"):
+                        # Numeric range filter
+                        actual_col = filter_col3.replace(" (Range)", "")
+                        col_data = df_view[actual_col].dropna()
+                        if len(col_data) > 0:
+                            min_val, max_val = float(col_data.min()), float(col_data.max())
+                            if min_val < max_val:
+                                range_vals = st.slider(
+                                    f"Select {actual_col} range:",
+                                    min_value=min_val,
+                                    max_value=max_val,
+                                    value=(min_val, max_val),
+                                    key="range3"
+                                )
+                                active_numeric_filters[actual_col] = range_vals
+                    else:
+                        # Categorical filter
+                        unique_vals3 = sorted(df_view[filter_col3].dropna().astype(str).unique())
+                        selected_vals3 = st.multiselect(f"Select {filter_col3}:", unique_vals3, default=unique_vals3, key="values3")
+                        if selected_vals3:
+                            active_filters[filter_col3] = selected_vals3
+    
+    # Apply filters as row masks; rows are only materialized for the visible page and the export
+    filtered_responses = ChartData(df_view)
+    
+    # Apply categorical filters
+    for filter_col, filter_vals in active_filters.items():
+        filtered_responses = filtered_responses.where(filtered_responses.isin(filter_col, filter_vals))
+    
+    # Apply numeric range filters
+    for filter_col, (min_val, max_val) in active_numeric_filters.items():
+        filtered_responses = filtered_responses.where(filtered_responses.between(filter_col, min_val, max_val))
+    
+    # Display filtering summary
+    st.write(f"**Showing {len(filtered_responses)} of {len(df_view)} survey responses**")
+    
+    if len(active_filters) > 0 or len(active_numeric_filters) > 0:
+        filter_parts = []
+        
+        # Categorical filters
+        for col, vals in active_filters.items():
+            filter_parts.append(f"{col}: {len(vals)} selected")
+        
+        # Numeric range filters  
+        for col, (min_val, max_val) in active_numeric_filters.items():
+            filter_parts.append(f"{col}: {min_val:.1f}-{max_val:.1f}")
+        
+        if filter_parts:
+            filter_summary = ", ".join(filter_parts)
+            st.caption(f"Active filters: {filter_summary}")
+    
+    # Column selection for display
+    st.write("**Select columns to display:**")
+    
+    # Smart default column selection - include more survey fields
+    default_cols = []
+    priority_keywords = ['respondent', 'age', 'company', 'employment', 'area']
+    secondary_keywords = ['income', 'deliveries', 'fuel', 'cost', 'expense', 'insurance', 'benefit', 'salary']
+    
+    # First pass: high priority columns
+    for col in df_view.columns:
+        col_lower = col.lower()
+        if any(keyword in col_lower for keyword in priority_keywords):
+            default_cols.append(col)
+    
+    # Second pass: secondary important columns
+    for col in df_view.columns:
+        if col not in default_cols:
+            col_lower = col.lower()
+            if any(keyword in col_lower for keyword in secondary_keywords):
+                default_cols.append(col)
+    
+    # Limit to first 10 columns to avoid overwhelming display
+    default_cols = default_cols[:10]
+    
+    selected_columns = st.multiselect(
+        "Choose columns to show in responses:",
+        options=df_view.columns.tolist(),
+        default=default_cols if default_cols else df_view.columns.tolist()[:6],
+        key="response_columns"
+    )
+    
+    if selected_columns:
+        # Display options
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            page_size = st.selectbox("Responses per page:", [10, 25, 50, 100], index=1)
+        with col2:
+            show_index = st.checkbox("Show row numbers", value=True)
+        with col3:
+            sort_column = st.selectbox("Sort by:", ["None"] + selected_columns)
+        
+        # Pagination
+        total_responses = len(filtered_responses)
+        total_pages = (total_responses - 1) // page_size + 1 if total_responses > 0 else 0
+        
+        start_idx, end_idx = 0, total_responses
+        if total_pages > 1:
+            col1, col2, col3 = st.columns([1, 2, 1])
+            with col2:
+                page = st.selectbox(f"Page (1 to {total_pages}):", range(1, total_pages + 1))
+            
+            start_idx = (page - 1) * page_size
+            end_idx = start_idx + page_size
+        
+        # Prepare display dataframe: only the selected columns of the visible page are copied
+        try:
+            display_df = filtered_responses.page(selected_columns, start_idx, end_idx, sort_by=None if sort_column == "None" else sort_column)
+        except:
+            # Fall back to unsorted rows if the sort column has incomparable values
+            display_df = filtered_responses.page(selected_columns, start_idx, end_idx)
+        
+        # Display the responses
+        if len(display_df) > 0:
+            # Convert to display-safe format to avoid PyArrow issues
+            safe_display_df = make_display_safe(display_df)
+            st.dataframe(
+                safe_display_df,
+                use_container_width=True,
+                hide_index=not show_index
+            )
+            
+            # Download option for filtered responses, generated in the background
+            responses_key = (view_key, repr(active_filters), repr(active_numeric_filters))
+            responses_csv_job = job_board.submit("responses_csv", responses_key, lambda: filtered_responses.rows().to_csv(index=False))
+            render_when_ready(
+                pending,
+                responses_csv_job,
+                st.empty(),
+                lambda placeholder, csv: placeholder.download_button(
+                    label=f"📥 Download Filtered Responses ({len(filtered_responses)} records)",
+                    data=csv,
+                    file_name=f"survey_responses_filtered_{datetime.datetime.now().strftime('%Y%m%d_%H%M')}.csv",
+                    mime="text/csv"
+                ),
+                "⏳ Preparing CSV export..."
+            )
+        else:
+            st.info("No responses match the current filters.")
+    else:
+        st.info("Please select at least one column to display.")
+
+@st.fragment
+def render_distribution_charts(df_view):
+    """Distribution Charts tab: company and age histograms"""
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # Employment Status Distribution
+        employment_col = None
+        for col in df_view.columns:
+            if "employment" in col.lower() and not col.endswith(('_1', '_2', '_3', '_4', '_5', '_6')):
+                employment_col = col
+                break
+        
+        if employment_col and len(df_view[employment_col].dropna()) > 0:
+            try:
+                fig = px.pie(
+                    df_view,
+                    names=employment_col,
+                    title="Employment Status Distribution",
+                    color_discrete_sequence=px.colors.qualitative.Set3
+                )
+                st.plotly_chart(fig, use_container_width=True)
+            except Exception as e:
+                st.error(f"Error creating employment chart: {str(e)}")
+        else:
+            st.info("No valid employment status data found for visualization")
+    
+    with col2:
+        # Age Distribution
+        age_col = None
+        for col in df_view.columns:
+            if "age" in col.lower() and not col.endswith(('_1', '_2', '_3', '_4', '_5', '_6')):
+                age_col = col
+                break
+        
+        if age_col and pd.api.types.is_numeric_dtype(df_view[age_col]):
+            try:
+                fig = px.histogram(
+                    df_view,
+                    x=age_col,
+                    nbins=15,
+                    title="Age Distribution",
+                    color_discrete_sequence=["#667eea"]
+                )
+                st.plotly_chart(fig, use_container_width=True)
+            except Exception as e:
+                st.error(f"Error creating age chart: {str(e)}")
+        else:
+            st.info("No valid age data found for visualization")
+
+@st.fragment
+def render_comparison_charts(jobs, pending):
+    """Comparison Charts tab: six charts, each filled in when its own job finishes"""
+    st.write("**Compare key metrics across different dimensions:**")
+    st.write("")
+    
+    # Three rows of two charts each, each filled in when its own job finishes
+    comparison_layout = [
+        ("deliveries_by_company", "hours_by_employment"),
+        ("fuel_by_company", "vehicle_mix"),
+        ("success_by_company", "age_by_company"),
+    ]
+    for left_chart, right_chart in comparison_layout:
+        chart_col1, chart_col2 = st.columns(2)
+        with chart_col1:
+            render_when_ready(pending, jobs["comparisons"][left_chart], st.empty(), comparison_renderer(left_chart, jobs["comparison_roles"]), "⏳ Building chart...")
+        with chart_col2:
+            render_when_ready(pending, jobs["comparisons"][right_chart], st.empty(), comparison_renderer(right_chart, jobs["comparison_roles"]), "⏳ Building chart...")
+
+@st.fragment
+def render_correlation_analysis(df_view, jobs, pending):
+    """Correlation Analysis tab: controls plus the matrix, top pairs and a pair drill-down"""
+    corr_col1, corr_col2, corr_col3, corr_col4 = st.columns(4)
+    with corr_col1:
+        correlation_method = st.radio("Method:", ["Pearson", "Spearman"], horizontal=True).lower()
+    with corr_col2:
+        significance_level = st.selectbox(
+            "Significance filter:",
+            ["Show all", "p < 0.05", "p < 0.01"],
+            help="Blank out correlations that are not statistically significant"
+        )
+    with corr_col3:
+        correlation_view = st.selectbox("View:", ["Clustered heatmap", "Top correlations"])
+    with corr_col4:
+        correlation_size = st.slider(
+            "Columns / pairs shown:", min_value=5, max_value=40, value=20,
+            help="Heatmap keeps the most strongly correlated columns; the table lists the strongest pairs"
+        )
+    job_board, view_key = jobs["board"], jobs["view_key"]
+    correlation_job = job_board.submit(
+        "correlation",
+        (view_key, correlation_method),
+        get_result_cache().get_or_compute,
+        ("correlation", view_key, correlation_method),
+        correlation_matrix,
+        df_view,
+        correlation_method,
+        (QUALITY_FLAGS,),
+        cached=True
+    )
+    
+    alpha = None if significance_level == "Show all" else float(significance_level.split()[-1])
+    
+    def render_correlation(placeholder, correlation):
+        if correlation["r"] is None:
+            placeholder.info("Need at least 2 numeric columns for correlation analysis")
+            return
+        with placeholder.container():
+            if correlation_view == "Clustered heatmap":
+                # Only the most strongly correlated columns, reordered so related questions sit together
+                matrix = clustered_matrix(correlation, max_columns=correlation_size)
+                if alpha is not None:
+                    matrix = significant_only(correlation, alpha).loc[matrix.index, matrix.columns]
+                fig = px.imshow(
+                    matrix,
+                    title=f"Correlation Matrix ({correlation_method.title()}, clustered)",
+                    color_continuous_scale="RdBu",
+                    zmin=-1,
+                    zmax=1,
+                    aspect="auto"
+                )
+                st.plotly_chart(fig, use_container_width=True)
+        
+            if correlation_view == "Top correlations":
+                pairs = top_pairs(correlation, k=correlation_size, alpha=alpha)
+                st.write(f"**Top {len(pairs)} strongest correlations:**")
+                st.dataframe(make_display_safe(pairs.round(3)), use_container_width=True, hide_index=True)
+        
+            if correlation["dropped"]:
+                st.caption(f"Hidden {len(correlation['dropped'])} constant or near-empty columns: {', '.join(correlation['dropped'][:3])}{'...' if len(correlation['dropped']) > 3 else ''}")
+    
+    # Correlation heatmap
+    render_when_ready(pending, correlation_job, st.empty(), render_correlation, "⏳ Computing correlation matrix...")
+    
+    # Drill-down: scatter of one pair from a downsampled set of respondents. The pair picker is
+    # created here rather than in the placeholder so that it belongs to this fragment and choosing
+    # a pair reruns only this tab; it waits for the correlation job, which the full run does anyway.
+    try:
+        correlation = correlation_job.result()
+    except Exception:
+        # The placeholder above shows the error
+        return
+    if correlation["r"] is None:
+        return
+    pairs = top_pairs(correlation, k=correlation_size, alpha=alpha)
+    if len(pairs) > 0:
+        pair_labels = [f"{a[:30]} ↔ {b[:30]} (r={r:.2f})" for a, b, r in zip(pairs["Column A"], pairs["Column B"], pairs["Correlation"])]
+        pair_idx = st.selectbox("🔎 Drill down into pair:", range(len(pairs)), format_func=lambda i: pair_labels[i], key="correlation_pair")
+        column_a, column_b = pairs["Column A"].iloc[pair_idx], pairs["Column B"].iloc[pair_idx]
+        points = downsample_pair(df_view, column_a, column_b)
+        fig = px.scatter(points, x=column_a, y=column_b, opacity=0.6, title=f"{column_a[:40]} vs {column_b[:40]}")
+        st.plotly_chart(fig, use_container_width=True)
+
+@st.fragment
+def render_group_significance(df_all, df_view, dataset_key, filter_state):
+    """Group Significance tab: pairwise tests between the groups of one dimension, as a matrix"""
+    roles = resolve_roles(df_view.columns)
+    dimensions = [roles[role] for role in SIGNIFICANCE_ROLES if roles[role] is not None]
+    measures = [col for col in df_view.columns if col != QUALITY_FLAGS and pd.api.types.is_numeric_dtype(df_view[col])]
+    if not dimensions or not measures:
+        st.info("Need a company, area, employment or vehicle column and a numeric column for significance tests")
+        return
+    
+    sig_col1, sig_col2, sig_col3, sig_col4 = st.columns([1, 1.4, 1, 1])
+    with sig_col1:
+        dimension = st.selectbox("Compare groups of:", dimensions)
+    with sig_col2:
+        measure = st.selectbox("Measure:", measures, format_func=lambda col: col[:37] + "..." if len(col) > 40 else col)
+    with sig_col3:
+        test_label = st.radio("Test:", ["Welch t-test", "Mann-Whitney U"], horizontal=True)
+    with sig_col4:
+        correction_label = st.selectbox(
+            "Correction:",
+            ["Holm", "Benjamini-Hochberg (FDR)", "Bonferroni", "None"],
+            help="Adjust p-values for testing many pairs at once"
+        )
+    alpha = st.select_slider("Significance level (α):", options=[0.001, 0.01, 0.05, 0.1], value=0.05)
+    test = "welch" if test_label == "Welch t-test" else "mann_whitney"
+    correction = {"Holm": "holm", "Benjamini-Hochberg (FDR)": "fdr_bh", "Bonferroni": "bonferroni", "None": "none"}[correction_label]
+    
+    try:
+        # Sufficient statistics come from the same cached cube Custom Analysis builds
+        plan = plan_query({"filters": filter_predicates(filter_state), "group_by": [dimension], "measure": measure, "agg": "mean"})
+        index = get_dataset_index(dataset_key, df_all)
+        cube = get_result_cache().get_or_compute(("query_cube", dataset_key, cube_key(plan)), build_cube, index, plan)
+        if cube.n_cells < 2:
+            st.info(f"Need at least two {dimension} groups with {measure} values to compare")
+            return
+        result = get_result_cache().get_or_compute(
+            ("significance", dataset_key, cube_key(plan), test, correction),
+            compute_significance, index, plan, cube, test, correction
+        )
+        pairs = result["pairs"]
+        significant = int((pairs["Adjusted p"] < alpha).sum())
+        st.caption(f"{cube.n_cells} groups, {len(pairs)} pairs, {significant} significant at α = {alpha} ({correction_label} correction)")
+        
+        matrix_col, table_col = st.columns([1.2, 1])
+        with matrix_col:
+            fig = px.imshow(
+                result["matrix"],
+                title=f"Adjusted p-values: {measure[:40]} by {dimension}",
+                color_continuous_scale="Viridis_r",
+                zmin=0,
+                zmax=1,
+                text_auto=".3f",
+                aspect="auto"
+            )
+            fig.update_layout(xaxis_tickangle=-45)
+            st.plotly_chart(fig, use_container_width=True)
+        with table_col:
+            st.write("**Pairs, most significant first:**")
+            pairs = pairs.assign(Significant=np.where(pairs["Adjusted p"] < alpha, "✅", ""))
+            st.dataframe(make_display_safe(pairs.round(4)), use_container_width=True, hide_index=True, height=420)
+    except Exception as e:
+        st.error(f"Significance test error: {str(e)}")
+
+@st.fragment
+def render_peak_season(jobs, pending):
+    """Peak Season tab: White Friday, Eid/Ramadan and public-holiday incentives per company"""
+    
+    def render_summary(placeholder, summary):
+        if summary is None:
+            placeholder.info("No White Friday, Eid/Ramadan or public-holiday columns found in this dataset")
+            return
+        overall = summary["overall"]
+        by_company = summary["by_company"]
+        with placeholder.container():
+            peak_col1, peak_col2, peak_col3, peak_col4 = st.columns(4)
+            peak_col1.metric("🛍️ White Friday Incentive / Day", f"{overall.get(WF_PER_DAY, np.nan):,.0f} EGP")
+            peak_col2.metric("📈 White Friday Daily Uplift", f"{overall.get(WF_DAILY_UPLIFT, np.nan):.1f}%")
+            peak_col3.metric("🌙 Eid/Ramadan Incentive", f"{overall.get(EID_INCENTIVE, np.nan):,.0f} EGP")
+            peak_col4.metric("🕌 Worked Public Holidays", f"{overall.get(HOLIDAY_SHARE, np.nan):.0f}%")
+            
+            chart_col1, chart_col2 = st.columns(2)
+            with chart_col1:
+                uplift = by_company[[WF_DAILY_UPLIFT, EID_UPLIFT, PEAK_UPLIFT]].reset_index().melt(
+                    id_vars=by_company.index.name, var_name="Measure", value_name="Uplift (%)"
+                )
+                fig = px.bar(
+                    uplift,
+                    x=by_company.index.name,
+                    y="Uplift (%)",
+                    color="Measure",
+                    barmode="group",
+                    title="Peak-Season Uplift over Normal Pay by Company"
+                )
+                fig.update_layout(xaxis_tickangle=-45, legend_title_text="")
+                st.plotly_chart(fig, use_container_width=True)
+            with chart_col2:
+                if summary["overtime"] is not None:
+                    overtime = summary["overtime"].drop(index="All", columns="All", errors="ignore")
+                    overtime = overtime.reset_index().melt(id_vars=overtime.index.name, var_name="Overtime Method", value_name="Share (%)")
+                    fig = px.bar(
+                        overtime,
+                        x=overtime.columns[0],
+                        y="Share (%)",
+                        color="Overtime Method",
+                        title="Public-Holiday Overtime Method by Company"
+                    )
+                    fig.update_layout(xaxis_tickangle=-45)
+                    st.plotly_chart(fig, use_container_width=True)
+                else:
+                    st.info("No overtime method data")
+            
+            st.write("**Per-company peak-season incentives:**")
+            st.dataframe(make_display_safe(by_company.round(1).reset_index()), use_container_width=True, hide_index=True)
+            if summary["eid_criteria"] is not None:
+                st.write("**Eid/Ramadan incentive criteria:**")
+                st.dataframe(make_display_safe(summary["eid_criteria"]), use_container_width=True, hide_index=True)
+    
+    render_when_ready(pending, jobs["peak_season"], st.empty(), render_summary, "⏳ Computing peak-season incentives...")
+
+@st.fragment
+def render_summary_and_export(df_all, df_view, jobs, pending):
+    """Summary statistics and the filtered-data CSV download"""
+    st.subheader("📋 Data Summary & Export")
+
+    summary_col1, summary_col2 = st.columns([2, 1])
+
+    with summary_col1:
+        # Data summary statistics
+        if not df_view.empty:
+            st.write("**Statistical Summary:**")
+            # Display-safe describe() table computed in the background
+            render_when_ready(
+                pending,
+                jobs["summary"],
+                st.empty(),
+                lambda placeholder, summary: placeholder.dataframe(summary, use_container_width=True),
+                "⏳ Computing summary statistics..."
+            )
+
+    with summary_col2:
+        st.write("**Dataset Information:**")
+        st.metric("📊 Total Records", f"{len(df_view):,}")
+        st.metric("📋 Columns", len(df_view.columns))
+        if len(df_all) > 0:
+            st.metric("🔍 Filtered Data", f"{(len(df_view)/len(df_all)*100):.1f}%")
+        else:
+            st.metric("🔍 Filtered Data", "100%")
+    
+        # Download button for filtered data, available once the CSV is generated
+        render_when_ready(
+            pending,
+            jobs["export"],
+            st.empty(),
+            lambda placeholder, csv: placeholder.download_button(
+                label="📥 Download Filtered Data (CSV)",
+                data=csv,
+                file_name=f"vans_data_filtered_{datetime.datetime.now().strftime('%Y%m%d_%H%M')}.csv",
+                mime="text/csv"
+            ),
+            "⏳ Preparing CSV export..."
+        )
+
+def render_raw_data(df_view):
+    """Collapsible raw data table with per-column information"""
+    with st.expander("🔍 View Raw Data", expanded=False):
+        # Convert to display-safe format to avoid PyArrow issues
+        safe_df_view = make_display_safe(df_view)
+        st.dataframe(safe_df_view, use_container_width=True)
+    
+        # Column information
+        try:
+            col_info = pd.DataFrame({
+                'Column Name': df_view.columns,
+                'Data Type': df_view.dtypes.astype(str),
+                'Non-Null Count': df_view.count(),
+                'Null Count': df_view.isnull().sum(),
+                'Unique Values': df_view.nunique()
+            })
+        except Exception:
+            # Fallback column info if dtypes fails
+            col_info = pd.DataFrame({
+                'Column Name': df_view.columns,
+                'Data Type': ['Mixed' for _ in df_view.columns],
+                'Non-Null Count': [len(df_view) for _ in df_view.columns],
+                'Null Count': [0 for _ in df_view.columns],
+                'Unique Values': [len(df_view) for _ in df_view.columns]
+            })
+    
+        st.write("**Column Information:**")
+        # Convert to display-safe format to avoid PyArrow issues
+        safe_col_info = make_display_safe(col_info)
+        st.dataframe(safe_col_info, use_container_width=True)
+
+def render_footer():
+    """Footer banner"""
+    st.markdown("---")
+    st.markdown("""
+    <div style="text-align: center; color: #666; padding: 2rem;">
+        <p>🚐 <strong>Vans Data Interactive Dashboard</strong> | Built with Streamlit</p>
+        <p>📊 Analyze • 🔍 Filter • 📈 Visualize • 📥 Export</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+def fill_placeholders(pending):
+    """Fill each placeholder as soon as its background job completes"""
+    renders_by_job = {}
+    for future, placeholder, render in pending.items:
+        renders_by_job.setdefault(future, []).append((placeholder, render))
+    pending.items = []
+    pending.flushed = True
+
+    for future in as_completed(renders_by_job):
+        for placeholder, render in renders_by_job[future]:
+            fill_placeholder(future, placeholder, render)
+
+def render_startup_profile(script_start, job_board):
+    """Import and run timings plus memory use in the sidebar, shown when STREAMLIT_DASH_PROFILE is set"""
+    if os.getenv("STREAMLIT_DASH_PROFILE"):
+        with st.sidebar.expander("⏱️ Startup Profile", expanded=False):
+            # Import timings are recorded once per process, i.e. on the cold start after a restart
+            for module_name, seconds in IMPORT_TIMINGS.items():
+                st.write(f"`{module_name}` import: {seconds * 1000:.0f} ms")
+            st.write(f"This script run: {(time.perf_counter() - script_start) * 1000:.0f} ms")
+            
+            # Job results held for reruns, across all sessions of this process
+            usage = get_memory_governor().usage(job_board.session_id)
+            mb = 1024 * 1024
+            st.write(f"Session results: {usage['memory_bytes'] / mb:.1f} / {usage['budget_bytes'] / mb:.0f} MB in memory, {usage['spilled_bytes'] / mb:.1f} MB spilled to disk")
+            st.write(f"This session: {usage['session_bytes'] / mb:.1f} MB ({usage['artifacts']} results across {usage['sessions']} sessions)")
+
+def run(default_password=DEFAULT_PASSWORD):
+    """Render the whole dashboard for one script run"""
+    script_start = time.perf_counter()
+    
+    # Configure Streamlit page
+    st.set_page_config(page_title="Vans Interactive Dashboard", layout="wide", page_icon="🚐")
+    
+    if os.path.exists(CSS_PATH):
+        st.markdown(load_css(CSS_PATH), unsafe_allow_html=True)
+    
+    render_header(default_password)
+    df_all = load_dataset()
+    
+    # Convert mostly-numeric text columns once and append cost per delivery, income per hour, etc.
+    # as typed float columns so charts and presets share them. Downstream code treats df_all and
+    # df_view as read-only and takes column projections instead of copies.
+    if df_all.attrs.get("columnar_version"):
+        # A stored wave was prepared when it was written
+        dataset_key = df_all.attrs["columnar_version"]
+    else:
+        df_all = df_all.drop(columns=[col for col in DERIVED_COLUMNS + [QUALITY_FLAGS] if col in df_all.columns])
+        dataset_key = dataset_version(df_all)
+        if STORAGE_MODE == "mmap":
+            df_all = load_mapped_dataset(dataset_key, df_all, df_all.attrs.get("source") or "Uploaded data")
+        else:
+            df_all = load_prepared_dataset(dataset_key, df_all)
+    
+    # Precompute every preset for the unfiltered data and single-value sidebar filters as soon as a dataset loads
+    get_preset_cache().warm(df_all, dataset_key, common_filter_states(df_all))
+    
+    filter_state, df_view = render_sidebar(df_all)
+    jobs = submit_jobs(df_view, dataset_key, filter_state)
+    
+    # Placeholders waiting for background jobs, filled in at the end of the run
+    pending = PendingRenders()
+    
+    render_data_quality(df_all, dataset_key)
+    render_kpis(df_all, df_view)
+    
+    # ---------- Interactive Data Analysis ----------
+    st.subheader("🔍 Interactive Data Analysis")
+    
+    analysis_tab1, analysis_tab2, analysis_tab3, analysis_tab4, analysis_tab5, analysis_tab6 = st.tabs(["📊 Custom Analysis", "🔖 Quick Presets", "📋 Individual Responses", "🧮 SQL Query", "🔮 What-if", "🎲 Risk Simulation"])
+    with analysis_tab1:
+        render_custom_analysis(df_all, df_view, dataset_key, filter_state)
+    with analysis_tab2:
+        render_quick_presets(df_all, df_view, dataset_key, filter_state)
+    with analysis_tab3:
+        render_individual_responses(df_view, jobs, pending)
+    with analysis_tab4:
+        render_sql_query(df_all, dataset_key)
+    with analysis_tab5:
+        render_what_if(df_view, jobs)
+    with analysis_tab6:
+        render_risk_simulation(df_view, jobs, pending)
+    
+    # ---------- Visualizations ----------
+    st.subheader("📊 Data Visualizations")
+    
+    viz_tab1, viz_tab2, viz_tab3, viz_tab4, viz_tab5 = st.tabs(["📈 Distribution Charts", "📊 Comparison Charts", "🗺️ Correlation Analysis", "⚖️ Group Significance", "🎉 Peak Season"])
+    with viz_tab1:
+        render_distribution_charts(df_view)
+    with viz_tab2:
+        render_comparison_charts(jobs, pending)
+    with viz_tab3:
+        render_correlation_analysis(df_view, jobs, pending)
+    with viz_tab4:
+        render_group_significance(df_all, df_view, dataset_key, filter_state)
+    with viz_tab5:
+        render_peak_season(jobs, pending)
+    
+    render_summary_and_export(df_all, df_view, jobs, pending)
+    render_raw_data(df_view)
+    render_footer()
+    
+    fill_placeholders(pending)
+    
+    render_startup_profile(script_start, jobs["board"])
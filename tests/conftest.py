@@ -0,0 +1,5 @@
+"""Make the repository root importable, so tests use the analytics package and dashboard module in place"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
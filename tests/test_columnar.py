@@ -0,0 +1,22 @@
+"""Columnar store round trips and replacement of stale copies"""
+import os
+
+import pandas as pd
+
+from analytics.columnar import list_columnar, open_columnar, read_manifest, write_columnar
+
+
+def test_replace_swaps_in_the_new_pipeline(tmp_path):
+    directory = str(tmp_path / "wave")
+    write_columnar(pd.DataFrame({"a": [1.0, 2.0]}), directory, version="v1")
+    assert read_manifest(directory)["pipeline"] is None
+
+    # Without replace an existing copy wins; with it the new one is swapped in
+    write_columnar(pd.DataFrame({"a": [1.0, 2.0], "b": ["x", "y"]}), directory, version="v1", pipeline=2)
+    assert list(open_columnar(directory).columns) == ["a"]
+    write_columnar(pd.DataFrame({"a": [1.0, 2.0], "b": ["x", "y"]}), directory, version="v1", pipeline=2, replace=True)
+    df = open_columnar(directory)
+    assert list(df.columns) == ["a", "b"]
+    assert df.attrs["columnar_pipeline"] == 2
+    assert [m["directory"] for m in list_columnar(str(tmp_path))] == [directory]
+    assert os.listdir(tmp_path) == ["wave"]
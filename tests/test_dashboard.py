@@ -0,0 +1,63 @@
+"""End-to-end checks of the dashboard script through Streamlit's AppTest"""
+import os
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def app(monkeypatch):
+    """The dashboard on the included sample file, past the password screen"""
+    monkeypatch.chdir(ROOT)
+    at = AppTest.from_file(os.path.join(ROOT, "main.py"), default_timeout=180)
+    at.session_state["authenticated"] = True
+    at.run()
+    assert not at.exception
+    return at
+
+
+def _selectbox(at, label):
+    return next(box for box in at.selectbox if box.label.startswith(label))
+
+
+def test_group_by_table_has_rows(app):
+    tables_before = len(app.dataframe)
+    primary = _selectbox(app, "📂 Primary Group by")
+    primary.set_value(primary.options.index("Company")).run()
+    assert not app.exception
+    assert len(app.dataframe) > tables_before
+    result = next(table.value for table in app.dataframe if table.value.columns[0] == "Company" and "CI Low" in table.value.columns)
+    assert len(result) == 7
+
+
+def test_tables_are_not_empty(app):
+    assert len(app.dataframe) > 0
+    assert all(table.value.shape[1] > 0 for table in app.dataframe)
+
+
+def test_stylesheet_is_applied(app):
+    assert any(block.value.startswith("<style>") for block in app.markdown)
+
+
+def test_quality_flags_are_not_a_measure(app):
+    from analytics.quality import QUALITY_FLAGS
+    measure_boxes = [box for box in app.selectbox if QUALITY_FLAGS in box.options]
+    assert not measure_boxes
+    summaries = [table.value for table in app.dataframe if "mean" in table.value.index]
+    assert summaries
+    assert all(QUALITY_FLAGS not in summary.columns for summary in summaries)
+
+
+def test_risk_simulation_waits_for_the_run_button(app):
+    def simulated_months():
+        return [metric.value for metric in app.metric if metric.label.startswith("🎲 Simulated Months")]
+
+    assert not simulated_months()
+    next(button for button in app.button if button.label == "▶️ Run Simulation").click().run()
+    assert not app.exception
+    assert simulated_months()
+    age = next(slider for slider in app.slider if slider.label.startswith("Age Range"))
+    age.set_value((22, 44)).run()
+    assert not simulated_months()
@@ -0,0 +1,46 @@
+"""Job board lifetime and its hand-off of results to the memory governor"""
+import gc
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from analytics.jobs import JobBoard
+from analytics.memory import MemoryGovernor
+
+
+def _wait_for_artifacts(governor, session_id, count):
+    for _ in range(100):
+        if governor.usage(session_id)["artifacts"] == count:
+            return
+        time.sleep(0.01)
+
+
+def test_results_released_when_the_session_ends():
+    governor = MemoryGovernor(10 ** 9)
+    with ThreadPoolExecutor(1) as executor:
+        board = JobBoard(executor, governor, "session")
+        board.submit("result", 1, lambda: list(range(1000))).result()
+        _wait_for_artifacts(governor, "session", 1)
+        assert governor.usage("session")["session_bytes"] > 0
+        del board
+        gc.collect()
+    assert governor.usage()["artifacts"] == 0
+
+
+def test_cancel_all_releases_the_session():
+    governor = MemoryGovernor(10 ** 9)
+    with ThreadPoolExecutor(1) as executor:
+        board = JobBoard(executor, governor, "session")
+        board.submit("result", 1, lambda: [1]).result()
+        _wait_for_artifacts(governor, "session", 1)
+        board.cancel_all()
+    assert governor.usage("session")["artifacts"] == 0
+
+
+def test_cached_results_are_not_governed():
+    governor = MemoryGovernor(10 ** 9)
+    with ThreadPoolExecutor(1) as executor:
+        board = JobBoard(executor, governor, "session")
+        future = board.submit("result", 1, lambda: [1], cached=True)
+        assert future.result() == [1]
+        assert board.submit("result", 1, lambda: [2], cached=True) is future
+    assert governor.usage("session")["artifacts"] == 0
@@ -0,0 +1,71 @@
+"""Pairwise significance tests against plain reference implementations"""
+import math
+
+import numpy as np
+import pytest
+
+from analytics.significance import mann_whitney_pairs
+
+
+def _average_ranks(values):
+    """1-based ranks with ties sharing their average rank"""
+    order = np.argsort(values, kind="stable")
+    ranks = np.empty(len(values))
+    sorted_values = values[order]
+    start = 0
+    while start < len(values):
+        stop = start
+        while stop + 1 < len(values) and sorted_values[stop + 1] == sorted_values[start]:
+            stop += 1
+        ranks[order[start:stop + 1]] = (start + stop) / 2 + 1
+        start = stop + 1
+    return ranks
+
+
+def _reference_mann_whitney(a, b):
+    """Textbook U of a and two-sided p from the tie-corrected normal approximation with continuity correction"""
+    n1, n2 = len(a), len(b)
+    combined = np.concatenate([a, b])
+    u = _average_ranks(combined)[:n1].sum() - n1 * (n1 + 1) / 2
+    _, counts = np.unique(combined, return_counts=True)
+    ties = float((counts ** 3 - counts).sum())
+    total = n1 + n2
+    var_u = n1 * n2 / 12 * ((total + 1) - ties / (total * (total - 1)))
+    mean_u = n1 * n2 / 2
+    z = (u - mean_u - 0.5 * np.sign(u - mean_u)) / math.sqrt(var_u)
+    return u, math.erfc(abs(z) / math.sqrt(2))
+
+
+@pytest.mark.parametrize("tied", [False, True])
+@pytest.mark.parametrize("n_values", [60, 9000])
+def test_mann_whitney_matches_reference(tied, n_values):
+    rng = np.random.default_rng(7)
+    n_groups = 3
+    if tied:
+        values = rng.integers(0, n_values // 3, n_values).astype(float)
+    else:
+        values = rng.permutation(n_values).astype(float) + rng.normal(0, 0.1, n_values)
+    groups = rng.integers(0, n_groups, n_values)
+    # Shift one group so the p-values are not all near 1
+    values[groups == 2] += n_values / 20
+
+    u, p = mann_whitney_pairs(values, groups, n_groups)
+    for i in range(n_groups):
+        for j in range(n_groups):
+            if i == j:
+                continue
+            ref_u, ref_p = _reference_mann_whitney(values[groups == i], values[groups == j])
+            assert u[i, j] == pytest.approx(ref_u)
+            assert p[i, j] == pytest.approx(ref_p, rel=1e-9, abs=1e-12)
+
+
+def test_mann_whitney_mixes_tied_and_untied_blocks():
+    # The first 4096 distinct values occur once, the rest repeat
+    rng = np.random.default_rng(11)
+    values = np.concatenate([np.arange(5000.0), np.repeat(np.arange(5000.0, 5500.0), 4)])
+    # Higher values lean slightly towards group 1, for a p-value well inside (0, 1)
+    groups = (rng.random(len(values)) < 0.49 + 0.02 * (values > 2750)).astype(np.int64)
+    u, p = mann_whitney_pairs(values, groups, 2)
+    ref_u, ref_p = _reference_mann_whitney(values[groups == 0], values[groups == 1])
+    assert u[0, 1] == pytest.approx(ref_u)
+    assert p[0, 1] == pytest.approx(ref_p, rel=1e-12)
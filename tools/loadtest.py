@@ -0,0 +1,209 @@
+"""Offline load test: replay an interaction script with N concurrent virtual users
+
+Each virtual user is a separate worker process driving the real dashboard
+through Streamlit's AppTest (no server, browser or network involved) and
+timing every script rerun. Reports latency percentiles per action,
+throughput and peak memory per user. AppTest always reruns the whole page,
+so the latencies are an upper bound for widgets inside st.fragment sections.
+
+Because every user has its own interpreter, st.cache_data, the shared result
+cache and the memory governor are per process: no user benefits from another
+user's cached results, and memory figures are for one user alone. The numbers
+measure N isolated sessions on one machine, not N sessions sharing one server.
+
+    python tools/loadtest.py --users 8 --iterations 3
+    python tools/loadtest.py --dump-script > analyst.json   # template to edit
+    python tools/loadtest.py --users 4 --script analyst.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PER_PROCESS_NOTE = (
+    "Each virtual user runs in its own process with its own caches: users never share "
+    "cached results, and memory is reported per user process, not for one shared server."
+)
+
+# A typical analyst session. Widgets are found by type and label prefix; "index"
+# picks an option by position, "keep" keeps the first n options of a multiselect.
+DEFAULT_SCRIPT = [
+    {"action": "login"},
+    {"action": "sidebar filter", "widget": "multiselect", "label": "Filter by", "keep": 2},
+    {"action": "sidebar filter", "widget": "slider", "label": "Age Range:", "value": [20, 45]},
+    {"action": "custom analysis", "widget": "selectbox", "label": "📂 Primary Group by", "index": 2},
+    {"action": "custom analysis", "widget": "selectbox", "label": "📈 Chart Type", "value": "Box Plot"},
+    {"action": "preset", "widget": "selectbox", "label": "Select comprehensive preset analysis", "index": 1},
+    {"action": "preset", "widget": "selectbox", "label": "Select comprehensive preset analysis", "index": 5},
+    {"action": "paging", "widget": "selectbox", "label": "Responses per page", "value": 10},
+    {"action": "paging", "widget": "selectbox", "label": "Page (1 to", "value": 2},
+    {"action": "export", "download": "📥 Download Filtered Data"},
+]
+
+
+def _widget(at, step):
+    for widget in getattr(at, step["widget"]):
+        if widget.label.startswith(step["label"]):
+            return widget
+    raise LookupError(f"No {step['widget']} labelled '{step['label']}'")
+
+
+def _apply(at, step, password):
+    """Perform one scripted interaction on the AppTest, without running the script"""
+    if step["action"] == "login":
+        if len(at.text_input):
+            at.text_input[0].input(password)
+            at.button[0].click()
+        return
+    if "download" in step:
+        # The export job renders a download button once the CSV is ready
+        return
+    widget = _widget(at, step)
+    if "keep" in step:
+        widget.set_value(widget.options[:step["keep"]])
+    elif "index" in step and isinstance(widget.value, int):
+        # Selectboxes whose values are positions, shown through format_func
+        widget.set_value(step["index"])
+    elif "index" in step:
+        widget.set_value(widget.options[step["index"]])
+    elif step["widget"] == "slider":
+        widget.set_value(tuple(step["value"]))
+    else:
+        widget.set_value(step["value"])
+
+
+def _check(at, step):
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    if "download" in step:
+        labels = [element.proto.label for element in at.get("download_button")]
+        if not any(label.startswith(step["download"]) for label in labels):
+            raise LookupError(f"No download button '{step['download']}'")
+
+
+def run_virtual_user(user_id, app_path, steps, iterations, password, timeout):
+    """Worker process: one user replaying the script; returns timings and memory"""
+    os.chdir(ROOT)
+    sys.path.insert(0, ROOT)
+    from streamlit.testing.v1 import AppTest
+
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    timings = []
+    at = AppTest.from_file(app_path, default_timeout=timeout)
+    started = time.perf_counter()
+    at.run()
+    timings.append(("page load", time.perf_counter() - started, None))
+    for _ in range(iterations):
+        for step in steps:
+            try:
+                _apply(at, step, password)
+                started = time.perf_counter()
+                at.run()
+                elapsed = time.perf_counter() - started
+                _check(at, step)
+                timings.append((step["action"], elapsed, None))
+            except Exception as e:
+                timings.append((step["action"], None, f"{type(e).__name__}: {e}"))
+
+    session_bytes = 0
+    dashboard = sys.modules.get("dashboard")
+    if dashboard is not None and "job_board" in at.session_state:
+        session_bytes = dashboard.get_memory_governor().usage(at.session_state["job_board"].session_id)["session_bytes"]
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        "user": user_id,
+        "timings": timings,
+        "peak_rss_mb": peak_kb / 1024,
+        "heap_growth_mb": (peak_kb - baseline_kb) / 1024,
+        "session_results_mb": session_bytes / (1024 * 1024),
+    }
+
+
+def summarize(results, wall_seconds):
+    """Per-action latency percentiles, throughput and memory per user"""
+    by_action = {}
+    errors = []
+    for result in results:
+        for action, seconds, error in result["timings"]:
+            if error is not None:
+                errors.append((result["user"], action, error))
+            else:
+                by_action.setdefault(action, []).append(seconds)
+    all_latencies = [s for values in by_action.values() for s in values]
+    rows = []
+    for action, values in list(by_action.items()) + [("all", all_latencies)]:
+        if not values:
+            continue
+        p50, p90, p95, p99 = np.percentile(np.array(values) * 1000, [50, 90, 95, 99])
+        rows.append((action, len(values), p50, p90, p95, p99, max(values) * 1000))
+    return {
+        "latency_ms": rows,
+        "interactions": len(all_latencies),
+        "throughput": len(all_latencies) / wall_seconds if wall_seconds else 0.0,
+        "errors": errors,
+        "memory": [(r["user"], r["peak_rss_mb"], r["heap_growth_mb"], r["session_results_mb"]) for r in results],
+    }
+
+
+def print_report(summary, users, wall_seconds):
+    print(f"\n{users} virtual users, {summary['interactions']} interactions in {wall_seconds:.1f} s "
+          f"({summary['throughput']:.2f} interactions/s)")
+    print(f"{PER_PROCESS_NOTE}\n")
+    print(f"{'action':<18}{'n':>6}{'p50 ms':>10}{'p90 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for action, n, p50, p90, p95, p99, worst in summary["latency_ms"]:
+        print(f"{action:<18}{n:>6}{p50:>10.0f}{p90:>10.0f}{p95:>10.0f}{p99:>10.0f}{worst:>10.0f}")
+    print(f"\n{'user':<6}{'peak RSS MB':>14}{'growth MB':>12}{'results MB':>12}")
+    for user, peak, growth, results_mb in summary["memory"]:
+        print(f"{user:<6}{peak:>14.0f}{growth:>12.0f}{results_mb:>12.2f}")
+    if summary["errors"]:
+        print(f"\n{len(summary['errors'])} failed interactions:")
+        for user, action, error in summary["errors"][:20]:
+            print(f"  user {user} / {action}: {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0], epilog=PER_PROCESS_NOTE)
+    parser.add_argument("--users", type=int, default=4, help="concurrent virtual users, one process each")
+    parser.add_argument("--iterations", type=int, default=2, help="times each user replays the script")
+    parser.add_argument("--script", help="JSON interaction script (defaults to a built-in analyst session)")
+    parser.add_argument("--app", default="main.py", help="entry script, relative to the repository root")
+    parser.add_argument("--password", default=os.getenv("STREAMLIT_DASH_PASSWORD", "vans2025"))
+    parser.add_argument("--timeout", type=float, default=300, help="seconds allowed per script rerun")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    parser.add_argument("--dump-script", action="store_true", help="print the built-in script and exit")
+    args = parser.parse_args()
+
+    if args.dump_script:
+        print(json.dumps(DEFAULT_SCRIPT, indent=2, ensure_ascii=False))
+        return
+    steps = DEFAULT_SCRIPT
+    if args.script:
+        with open(args.script, encoding="utf-8") as f:
+            steps = json.load(f)
+
+    # Separate processes: AppTest instances cannot run concurrently in one interpreter
+    context = multiprocessing.get_context("spawn")
+    started = time.perf_counter()
+    with context.Pool(args.users) as pool:
+        results = pool.starmap(
+            run_virtual_user,
+            [(user, args.app, steps, args.iterations, args.password, args.timeout) for user in range(args.users)]
+        )
+    wall_seconds = time.perf_counter() - started
+
+    summary = summarize(results, wall_seconds)
+    if args.json:
+        print(json.dumps(summary, indent=2, default=float))
+    else:
+        print_report(summary, args.users, wall_seconds)
+
+
+if __name__ == "__main__":
+    main()